@@ -0,0 +1,35 @@
+"""add sessions covering index
+
+Revision ID: 1d00a63ca0cc
+Revises: f7b2c8d4e3a1
+Create Date: 2025-11-11 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '1d00a63ca0cc'
+down_revision: Union[str, None] = 'f7b2c8d4e3a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covering index for per-subject booked-hours aggregation over a time window.
+    # A partial index on "scheduled_time > NOW() - ..." is not possible because
+    # index predicates must be immutable, so INCLUDE the summed column instead
+    # to allow index-only scans.
+    op.create_index(
+        'idx_sessions_subject_time_covering',
+        'sessions',
+        ['subject', 'scheduled_time'],
+        unique=False,
+        postgresql_include=['duration_minutes']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_sessions_subject_time_covering', table_name='sessions')
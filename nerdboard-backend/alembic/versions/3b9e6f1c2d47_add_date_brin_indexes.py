@@ -0,0 +1,44 @@
+"""add date brin indexes
+
+Revision ID: 3b9e6f1c2d47
+Revises: a1d526b71124
+Create Date: 2025-11-11 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e6f1c2d47'
+down_revision: Union[str, None] = 'a1d526b71124'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Append-only time series: physical order tracks date, so BRIN summaries
+    # let date-range scans skip block ranges that cannot match. 32 pages per
+    # range keeps the skip granularity fine for month-sized windows.
+    op.create_index(
+        'brin_capacity_date',
+        'capacity_snapshots',
+        ['date'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+    op.create_index(
+        'brin_health_date',
+        'health_metrics',
+        ['date'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('brin_health_date', table_name='health_metrics')
+    op.drop_index('brin_capacity_date', table_name='capacity_snapshots')
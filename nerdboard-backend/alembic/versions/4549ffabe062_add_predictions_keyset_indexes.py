@@ -0,0 +1,54 @@
+"""add predictions keyset indexes
+
+Revision ID: 4549ffabe062
+Revises: c616a0c9b74d
+Create Date: 2025-11-11 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '4549ffabe062'
+down_revision: Union[str, None] = 'c616a0c9b74d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination for GET /predictions: status = ? ORDER BY <sort>, prediction_id.
+    # priority_asc is served by a backward scan of the priority index.
+    op.create_index(
+        'idx_predictions_status_priority_keyset',
+        'predictions',
+        ['status', 'priority_score', 'prediction_id'],
+        unique=False,
+        postgresql_ops={'priority_score': 'DESC', 'prediction_id': 'DESC'}
+    )
+    op.create_index(
+        'idx_predictions_status_confidence_keyset',
+        'predictions',
+        ['status', 'confidence_score', 'prediction_id'],
+        unique=False,
+        postgresql_ops={'confidence_score': 'DESC', 'prediction_id': 'DESC'}
+    )
+    op.create_index(
+        'idx_predictions_status_shortage_date_keyset',
+        'predictions',
+        ['status', 'predicted_shortage_date', 'prediction_id'],
+        unique=False,
+        postgresql_ops={'predicted_shortage_date': 'DESC NULLS LAST', 'prediction_id': 'DESC'}
+    )
+
+    # Superseded by idx_predictions_status_priority_keyset
+    op.drop_index('idx_predictions_priority', table_name='predictions')
+
+
+def downgrade() -> None:
+    op.create_index('idx_predictions_priority', 'predictions', ['priority_score'], unique=False)
+
+    op.drop_index('idx_predictions_status_shortage_date_keyset', table_name='predictions')
+    op.drop_index('idx_predictions_status_confidence_keyset', table_name='predictions')
+    op.drop_index('idx_predictions_status_priority_keyset', table_name='predictions')
@@ -0,0 +1,33 @@
+"""add tutors primary subject index
+
+Revision ID: 486ac9f57010
+Revises: edb672f4511d
+Create Date: 2025-11-11 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '486ac9f57010'
+down_revision: Union[str, None] = 'edb672f4511d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Expression index on the primary subject so the dashboard's per-subject
+    # capacity aggregation (GROUP BY subjects[1]) can be answered index-only
+    op.create_index(
+        'idx_tutors_primary_subject_capacity',
+        'tutors',
+        [sa.text('(subjects[1])')],
+        unique=False,
+        postgresql_include=['weekly_capacity_hours']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tutors_primary_subject_capacity', table_name='tutors')
@@ -0,0 +1,44 @@
+"""unique health metrics customer date
+
+Revision ID: 4c7a92ed9731
+Revises: 4549ffabe062
+Create Date: 2025-11-11 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '4c7a92ed9731'
+down_revision: Union[str, None] = '4549ffabe062'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the most recently updated row per (customer_id, date)
+    op.execute("""
+        DELETE FROM health_metrics a
+        USING health_metrics b
+        WHERE a.customer_id = b.customer_id
+        AND a.date = b.date
+        AND (a.updated_at, a.id) < (b.updated_at, b.id)
+    """)
+
+    # One health metric per customer per day, so batch recalculation can
+    # upsert with INSERT ... ON CONFLICT (customer_id, date). Replaces the
+    # non-unique (customer_id, date DESC) index, which a backward scan covers.
+    op.create_index(
+        'idx_health_customer_date_unique',
+        'health_metrics',
+        ['customer_id', 'date'],
+        unique=True
+    )
+    op.drop_index('idx_health_customer_date', table_name='health_metrics', postgresql_ops={'date': 'DESC'})
+
+
+def downgrade() -> None:
+    op.create_index('idx_health_customer_date', 'health_metrics', ['customer_id', 'date'], unique=False, postgresql_ops={'date': 'DESC'})
+    op.drop_index('idx_health_customer_date_unique', table_name='health_metrics')
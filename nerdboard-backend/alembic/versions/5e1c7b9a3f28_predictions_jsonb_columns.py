@@ -0,0 +1,44 @@
+"""predictions jsonb columns
+
+Revision ID: 5e1c7b9a3f28
+Revises: 8f4d2a6b1e93
+Create Date: 2025-11-11 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1c7b9a3f28'
+down_revision: Union[str, None] = '8f4d2a6b1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Store the breakdown and SHAP documents parsed, so reads (including the
+    # detail endpoint's json_build_object) no longer cast text to jsonb per row
+    for column in ('confidence_breakdown', 'shap_values'):
+        op.alter_column(
+            'predictions',
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade() -> None:
+    for column in ('confidence_breakdown', 'shap_values'):
+        op.alter_column(
+            'predictions',
+            column,
+            type_=sa.Text(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::text'
+        )
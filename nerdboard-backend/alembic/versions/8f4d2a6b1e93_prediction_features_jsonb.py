@@ -0,0 +1,34 @@
+"""prediction features jsonb
+
+Revision ID: 8f4d2a6b1e93
+Revises: 3b9e6f1c2d47
+Create Date: 2025-11-11 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4d2a6b1e93'
+down_revision: Union[str, None] = '3b9e6f1c2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Parse feature documents once on write: jsonb lets training expand them
+    # into typed columns with jsonb_to_record instead of parsing JSON text.
+    # No earlier migration creates the table, so it may not exist yet.
+    op.execute("""
+        ALTER TABLE IF EXISTS prediction_features
+        ALTER COLUMN features_json TYPE JSONB USING features_json::jsonb
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE IF EXISTS prediction_features
+        ALTER COLUMN features_json TYPE JSON USING features_json::json
+    """)
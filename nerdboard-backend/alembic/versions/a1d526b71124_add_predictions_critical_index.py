@@ -0,0 +1,34 @@
+"""add predictions critical index
+
+Revision ID: a1d526b71124
+Revises: 4c7a92ed9731
+Create Date: 2025-11-11 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d526b71124'
+down_revision: Union[str, None] = '4c7a92ed9731'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # urgency=critical on GET /predictions: status = ? AND is_critical ORDER BY priority.
+    # Critical predictions are a small slice, so a partial index stays tiny.
+    op.create_index(
+        'idx_predictions_critical_priority',
+        'predictions',
+        ['status', 'priority_score', 'prediction_id'],
+        unique=False,
+        postgresql_ops={'priority_score': 'DESC', 'prediction_id': 'DESC'},
+        postgresql_where=sa.text('is_critical')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_predictions_critical_priority', table_name='predictions')
@@ -0,0 +1,118 @@
+"""prediction status severity enums
+
+Revision ID: c2a8e4f6d1b5
+Revises: 5e1c7b9a3f28
+Create Date: 2025-11-11 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a8e4f6d1b5'
+down_revision: Union[str, None] = '5e1c7b9a3f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+prediction_status = postgresql.ENUM('active', 'resolved', 'expired', name='prediction_status')
+prediction_severity = postgresql.ENUM('critical', 'high', 'medium', 'low', name='prediction_severity')
+
+
+def _drop_active_partial_indexes() -> None:
+    # Their predicates compare status with a varchar literal, which has no
+    # operator against the enum, so they are rebuilt around the type change
+    op.drop_index('idx_predictions_active_shortage', table_name='predictions')
+    op.drop_index('idx_predictions_subject_active_priority', table_name='predictions')
+
+
+def _create_active_partial_indexes() -> None:
+    op.create_index(
+        'idx_predictions_subject_active_priority',
+        'predictions',
+        ['subject', 'priority_score'],
+        unique=False,
+        postgresql_ops={'priority_score': 'DESC'},
+        postgresql_where=sa.text("status = 'active'")
+    )
+    op.create_index(
+        'idx_predictions_active_shortage',
+        'predictions',
+        ['subject'],
+        unique=False,
+        postgresql_include=['shortage_probability'],
+        postgresql_where=sa.text("status = 'active' AND shortage_probability > 0.5")
+    )
+
+
+def upgrade() -> None:
+    # 4-byte enum values instead of varchar for the fixed status and
+    # severity sets; every index keyed on status shrinks with the column
+    bind = op.get_bind()
+    prediction_status.create(bind, checkfirst=True)
+    prediction_severity.create(bind, checkfirst=True)
+
+    _drop_active_partial_indexes()
+    op.alter_column('predictions', 'status', server_default=None)
+    op.alter_column(
+        'predictions',
+        'status',
+        type_=prediction_status,
+        existing_type=sa.String(length=20),
+        existing_nullable=False,
+        postgresql_using='status::prediction_status'
+    )
+    op.alter_column('predictions', 'status', server_default='active')
+    op.alter_column(
+        'predictions',
+        'severity',
+        type_=prediction_severity,
+        existing_type=sa.String(length=20),
+        existing_nullable=False,
+        postgresql_using='severity::prediction_severity'
+    )
+    _create_active_partial_indexes()
+
+    # Latest active prediction per subject and horizon (the prediction
+    # service's change check) as a single descending index probe
+    op.create_index(
+        'idx_predictions_active_subject_horizon_created',
+        'predictions',
+        ['subject', 'horizon', 'created_at'],
+        unique=False,
+        postgresql_ops={'created_at': 'DESC'},
+        postgresql_where=sa.text("status = 'active'")
+    )
+
+    op.execute('ANALYZE predictions')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_predictions_active_subject_horizon_created', table_name='predictions')
+
+    _drop_active_partial_indexes()
+    op.alter_column(
+        'predictions',
+        'severity',
+        type_=sa.String(length=20),
+        existing_type=prediction_severity,
+        existing_nullable=False,
+        postgresql_using='severity::text'
+    )
+    op.alter_column('predictions', 'status', server_default=None)
+    op.alter_column(
+        'predictions',
+        'status',
+        type_=sa.String(length=20),
+        existing_type=prediction_status,
+        existing_nullable=False,
+        postgresql_using='status::text'
+    )
+    op.alter_column('predictions', 'status', server_default='active')
+    _create_active_partial_indexes()
+
+    bind = op.get_bind()
+    prediction_severity.drop(bind, checkfirst=True)
+    prediction_status.drop(bind, checkfirst=True)
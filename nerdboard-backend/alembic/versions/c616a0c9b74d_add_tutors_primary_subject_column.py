@@ -0,0 +1,53 @@
+"""add tutors primary subject column
+
+Revision ID: c616a0c9b74d
+Revises: 486ac9f57010
+Create Date: 2025-11-11 11:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c616a0c9b74d'
+down_revision: Union[str, None] = '486ac9f57010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated column for the primary subject, so the dashboard's
+    # per-subject aggregation groups on a plain indexed scalar column
+    op.add_column(
+        'tutors',
+        sa.Column(
+            'primary_subject',
+            sa.String(length=100),
+            sa.Computed('subjects[1]', persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'idx_tutors_primary_subject',
+        'tutors',
+        ['primary_subject'],
+        unique=False,
+        postgresql_include=['weekly_capacity_hours']
+    )
+
+    # Superseded by idx_tutors_primary_subject
+    op.drop_index('idx_tutors_primary_subject_capacity', table_name='tutors')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'idx_tutors_primary_subject_capacity',
+        'tutors',
+        [sa.text('(subjects[1])')],
+        unique=False,
+        postgresql_include=['weekly_capacity_hours']
+    )
+    op.drop_index('idx_tutors_primary_subject', table_name='tutors')
+    op.drop_column('tutors', 'primary_subject')
@@ -0,0 +1,50 @@
+"""add predictions dashboard indexes
+
+Revision ID: edb672f4511d
+Revises: 1d00a63ca0cc
+Create Date: 2025-11-11 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'edb672f4511d'
+down_revision: Union[str, None] = '1d00a63ca0cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Subject detail: subject = ? AND status = 'active' ORDER BY priority_score DESC
+    op.create_index(
+        'idx_predictions_subject_active_priority',
+        'predictions',
+        ['subject', 'priority_score'],
+        unique=False,
+        postgresql_ops={'priority_score': 'DESC'},
+        postgresql_where=sa.text("status = 'active'")
+    )
+
+    # Overview alert counts: status = 'active' AND shortage_probability > 0.5 GROUP BY subject
+    op.create_index(
+        'idx_predictions_active_shortage',
+        'predictions',
+        ['subject'],
+        unique=False,
+        postgresql_include=['shortage_probability'],
+        postgresql_where=sa.text("status = 'active' AND shortage_probability > 0.5")
+    )
+
+    # Superseded by the partial indexes above. idx_predictions_subject stays:
+    # the confidence history count filters on subject across all statuses
+    op.drop_index('idx_predictions_status', table_name='predictions')
+
+
+def downgrade() -> None:
+    op.create_index('idx_predictions_status', 'predictions', ['status'], unique=False)
+
+    op.drop_index('idx_predictions_active_shortage', table_name='predictions')
+    op.drop_index('idx_predictions_subject_active_priority', table_name='predictions')
@@ -4,9 +4,11 @@ Authentication Middleware
 Simple bearer token authentication for MVP demo.
 Placeholder for future OAuth integration.
 """
+import hmac
 import logging
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.responses import JSONResponse
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -16,20 +18,37 @@ security = HTTPBearer(auto_error=False)
 
 # Demo token for MVP (in production, use proper JWT/OAuth)
 DEMO_TOKEN = "demo_token_12345"
+DEMO_TOKEN_BYTES = DEMO_TOKEN.encode()
 
 # Public endpoints that don't require authentication
-PUBLIC_ENDPOINTS = {
+PUBLIC_ENDPOINTS = frozenset({
     "/",
     "/health",
     "/api/docs",
     "/api/redoc",
     "/api/openapi.json"
-}
+})
+
+# Path prefixes that are public (tuple so startswith() checks all in one call)
+PUBLIC_PREFIXES = ("/api/docs",)
+
+BEARER_PREFIX = "Bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
 
 
 def is_public_endpoint(path: str) -> bool:
     """Check if endpoint is public"""
-    return path in PUBLIC_ENDPOINTS or path.startswith("/api/docs")
+    return path in PUBLIC_ENDPOINTS or path.startswith(PUBLIC_PREFIXES)
+
+
+def _is_valid_token(token: str) -> bool:
+    """
+    Check token against the demo token in constant time.
+
+    MVP: Simple token comparison
+    In production: Decode and validate JWT
+    """
+    return hmac.compare_digest(token.encode(), DEMO_TOKEN_BYTES)
 
 
 async def verify_token(credentials: Optional[HTTPAuthorizationCredentials]) -> bool:
@@ -57,9 +76,7 @@ async def verify_token(credentials: Optional[HTTPAuthorizationCredentials]) -> b
 
     token = credentials.credentials
 
-    # MVP: Simple token comparison
-    # In production: Decode and validate JWT
-    if token != DEMO_TOKEN:
+    if not _is_valid_token(token):
         logger.warning(f"Invalid token attempt: {token[:10]}...")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -106,6 +123,10 @@ class AuthenticationMiddleware:
     async def __call__(self, request: Request, call_next):
         """Process request with authentication check"""
 
+        # CORS preflights carry no credentials by spec; let CORSMiddleware answer
+        if request.method == "OPTIONS":
+            return await call_next(request)
+
         # Skip authentication for public endpoints
         if is_public_endpoint(request.url.path):
             return await call_next(request)
@@ -114,9 +135,9 @@ class AuthenticationMiddleware:
         auth_header = request.headers.get("Authorization")
 
         if not auth_header:
-            return HTTPException(
+            return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
+                content={
                     "error": {
                         "code": "AUTH_001",
                         "message": "Unauthorized",
@@ -127,10 +148,10 @@ class AuthenticationMiddleware:
             )
 
         # Verify bearer token format
-        if not auth_header.startswith("Bearer "):
-            return HTTPException(
+        if auth_header[:BEARER_PREFIX_LEN] != BEARER_PREFIX:
+            return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
+                content={
                     "error": {
                         "code": "AUTH_003",
                         "message": "Invalid authorization format",
@@ -141,13 +162,13 @@ class AuthenticationMiddleware:
             )
 
         # Extract and verify token
-        token = auth_header.replace("Bearer ", "")
+        token = auth_header[BEARER_PREFIX_LEN:]
 
-        if token != DEMO_TOKEN:
+        if not _is_valid_token(token):
             logger.warning(f"Authentication failed for path: {request.url.path}")
-            return HTTPException(
+            return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
+                content={
                     "error": {
                         "code": "AUTH_002",
                         "message": "Invalid token",
@@ -0,0 +1,196 @@
+"""
+Response Cache
+
+Lightweight per-process TTL cache for read-heavy API endpoints.
+Dashboard aggregates change on a minute scale, so repeated polls within the
+TTL are served from memory instead of re-running SQL.
+"""
+import functools
+import hashlib
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    In-memory TTL cache keyed by (namespace, *args).
+
+    Entries are grouped by namespace so a write endpoint can drop every
+    cached response for a router in one call.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[float, Any]] = {}
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Return cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        return value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any, ttl: float) -> None:
+        """Store value for key for ttl seconds"""
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, namespace: str) -> int:
+        """
+        Drop all entries in a namespace.
+
+        Args:
+            namespace: Namespace passed to cached_response()
+
+        Returns:
+            Number of entries removed
+        """
+        keys = [key for key in self._entries if key[0] == namespace]
+        for key in keys:
+            del self._entries[key]
+
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached responses in '{namespace}'")
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+
+
+def cached_response(namespace: str, ttl: float) -> Callable:
+    """
+    Decorator caching an async endpoint's return value for ttl seconds.
+
+    The cache key is the namespace plus the endpoint's keyword arguments,
+    so per-path-parameter responses (e.g. per subject) are cached separately.
+    Exceptions are never cached. Response objects are cached as a snapshot
+    of their rendered body and headers and re-issued as a fresh Response on
+    each hit, since middleware mutates response headers in place while sending.
+
+    Args:
+        namespace: Cache namespace used for invalidation
+        ttl: Time-to-live in seconds
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (namespace, func.__name__, *args, *sorted(kwargs.items()))
+            cache = get_response_cache()
+
+            value = cache.get(key)
+            if isinstance(value, Response):
+                return _copy_response(value)
+            if value is not None:
+                return value
+
+            value = await func(*args, **kwargs)
+            cache.set(key, _copy_response(value) if isinstance(value, Response) else value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _copy_response(response: Response) -> Response:
+    """Build a new Response with the same status, body and headers"""
+    return Response(
+        content=response.body,
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        media_type=response.media_type,
+    )
+
+
+def set_etag(response: Response, max_age: int) -> Response:
+    """
+    Tag a rendered response with a content ETag and Cache-Control max-age.
+
+    Call inside a cached endpoint so the hash is computed once per cache fill.
+
+    Args:
+        response: Response with a rendered body
+        max_age: Seconds clients and proxies may reuse the response
+
+    Returns:
+        The same response, with ETag and Cache-Control headers set
+    """
+    response.headers["ETag"] = f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
+def conditional_response(request: Request, response: Response) -> Response:
+    """
+    Answer 304 Not Modified when the client's If-None-Match matches the ETag.
+
+    Args:
+        request: Incoming request
+        response: Response tagged by set_etag()
+
+    Returns:
+        An empty 304 response on match, otherwise response unchanged
+    """
+    etag = response.headers.get("etag")
+    if etag and request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": response.headers["cache-control"]},
+        )
+    return response
+
+
+def version_etag(version: datetime) -> str:
+    """
+    Build a weak ETag from a row version timestamp (e.g. updated_at).
+
+    Lets endpoints revalidate with a cheap version lookup before loading
+    and rendering the full body.
+
+    Args:
+        version: Timestamp that changes whenever the resource changes
+
+    Returns:
+        Weak ETag header value
+    """
+    return f'W/"{int(version.timestamp() * 1_000_000)}"'
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """
+    Return an empty 304 response if the client's If-None-Match matches etag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource, or None if unknown
+
+    Returns:
+        A 304 response on match, otherwise None
+    """
+    if etag and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+# Singleton instance
+_response_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get singleton ResponseCache instance"""
+    global _response_cache_instance
+    if _response_cache_instance is None:
+        _response_cache_instance = ResponseCache()
+    return _response_cache_instance
@@ -0,0 +1,16 @@
+"""
+Shared FastAPI dependencies for API routes
+"""
+from datetime import datetime, timezone
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as an ISO-8601 string with a Z suffix.
+
+    Used as a dependency (Depends(now_iso)) so each request computes its
+    timestamp once and reuses it for every metadata field. Cached endpoints
+    call it directly instead, so the timestamp reflects when the cached
+    payload was computed and stays out of the cache key.
+    """
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
@@ -4,15 +4,22 @@ Capacity API Endpoints
 GET /api/v1/capacity/:subject - Query current capacity for a subject
 POST /api/v1/capacity/recalculate-all - Admin endpoint to recalculate all subjects
 """
+import asyncio
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path
 from pydantic import BaseModel
 from typing import Dict, Any
 
+from app.api.cache import get_response_cache
+from app.api.dependencies import now_iso
+from app.api.routes.dashboard import CACHE_NAMESPACE as DASHBOARD_CACHE_NAMESPACE
 from app.services.capacity_calculator import get_capacity_calculator, SUBJECTS
 
 router = APIRouter(prefix="/capacity", tags=["capacity"])
 
+# Time windows reported by GET /capacity/:subject
+WINDOWS = ("current_week", "next_2_weeks", "next_4_weeks", "next_8_weeks")
+
 
 class WindowMetrics(BaseModel):
     """Metrics for a single time window"""
@@ -37,7 +44,8 @@ class BulkRecalculateResponse(BaseModel):
 
 @router.get("/{subject}", response_model=CapacityResponse)
 async def get_subject_capacity(
-    subject: str = Path(..., description="Subject name (e.g., Physics, Math)")
+    subject: str = Path(..., description="Subject name (e.g., Physics, Math)"),
+    now: str = Depends(now_iso)
 ):
     """
     Get current capacity metrics for a subject across all time windows (AC-5).
@@ -66,17 +74,18 @@ async def get_subject_capacity(
     calculator = get_capacity_calculator()
 
     try:
-        # Calculate capacity for all 4 time windows
-        capacity_data = {"subject": subject}
+        # Calculate capacity for all 4 time windows concurrently
+        results = await asyncio.gather(
+            *(calculator.calculate_subject_capacity(subject, window) for window in WINDOWS)
+        )
 
-        for window in ["current_week", "next_2_weeks", "next_4_weeks", "next_8_weeks"]:
-            metrics = await calculator.calculate_subject_capacity(subject, window)
-            capacity_data[window] = metrics
+        capacity_data = {"subject": subject}
+        capacity_data.update(zip(WINDOWS, results))
 
         return CapacityResponse(
             data=capacity_data,
             metadata={
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": now,
                 "cache_hit": False  # TODO: Implement caching in Task 7
             }
         )
@@ -107,6 +116,9 @@ async def recalculate_all_subjects():
     try:
         summary = await calculator.calculate_all_subjects_capacity()
 
+        # Dashboard aggregates are derived from capacity data
+        get_response_cache().invalidate(DASHBOARD_CACHE_NAMESPACE)
+
         return BulkRecalculateResponse(data=summary)
 
     except Exception as e:
@@ -114,7 +126,3 @@ async def recalculate_all_subjects():
             status_code=500,
             detail=f"Error during bulk recalculation: {str(e)}"
         )
-
-
-# Import datetime at module level
-from datetime import datetime
@@ -3,18 +3,211 @@ Dashboard Data API Endpoints
 
 Provides aggregated data for dashboard overview and metrics.
 """
+import asyncio
 import logging
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Path
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from app.api.cache import cached_response
+from app.api.dependencies import now_iso
 from app.database import AsyncSessionLocal
+from app.services.capacity_calculator import SUBJECTS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/dashboard", tags=["dashboard"])
 
+# Response cache namespace and TTLs (seconds)
+CACHE_NAMESPACE = "dashboard"
+OVERVIEW_CACHE_TTL = 30
+METRICS_CACHE_TTL = 30
+SUBJECT_DETAIL_CACHE_TTL = 60
+
+# Known subjects, for O(1) rejection of unknown path parameters
+SUBJECTS_SET = frozenset(SUBJECTS)
+
+# Static SQL statements, built once at import so SQLAlchemy's compiled
+# statement cache is reused across requests
+
+# Dashboard overview: per-subject capacity, 7-day utilization, alert counts
+# and predicted status (critical at >=85% or any alert, warning at >=70%)
+_Q_OVERVIEW = text("""
+    WITH tutors_agg AS (
+        SELECT
+            primary_subject as subject,
+            COUNT(*) as tutor_count,
+            SUM(weekly_capacity_hours) as total_capacity
+        FROM tutors
+        GROUP BY primary_subject
+    ),
+    sessions_agg AS (
+        SELECT
+            subject,
+            SUM(duration_minutes) / 60.0 as booked_hours
+        FROM sessions
+        WHERE scheduled_time BETWEEN NOW() - INTERVAL '7 days' AND NOW()
+        GROUP BY subject
+    ),
+    subject_predictions AS (
+        SELECT
+            subject,
+            COUNT(*) as alert_count
+        FROM predictions
+        WHERE status = 'active'
+        AND shortage_probability > 0.5
+        GROUP BY subject
+    ),
+    overview AS (
+        SELECT
+            subject,
+            ta.tutor_count,
+            COALESCE(ta.total_capacity, 0) as total_capacity,
+            CASE
+                WHEN ta.total_capacity > 0
+                THEN (COALESCE(sa.booked_hours, 0) / ta.total_capacity) * 100
+                ELSE 0
+            END as utilization,
+            COALESCE(sp.alert_count, 0) as alert_count
+        FROM tutors_agg ta
+        LEFT JOIN sessions_agg sa USING (subject)
+        LEFT JOIN subject_predictions sp USING (subject)
+    )
+    SELECT
+        subject,
+        ROUND(utilization::numeric, 2)::float as current_utilization,
+        CASE
+            WHEN utilization >= 85 OR alert_count > 0 THEN 'critical'
+            WHEN utilization >= 70 THEN 'warning'
+            ELSE 'ok'
+        END as predicted_status,
+        alert_count as active_alerts_count,
+        tutor_count,
+        total_capacity::float as total_capacity_hours
+    FROM overview
+    ORDER BY subject
+""")
+
+# Dashboard metrics: all KPI aggregates in one round-trip. The supply/demand
+# ratio is capped at 999 so "no demand" stays a finite, JSON-safe number
+_Q_METRICS = text("""
+    WITH health AS (
+        SELECT AVG(health_score) as avg_health
+        FROM health_metrics
+        WHERE date >= NOW() - INTERVAL '7 days'
+    ),
+    velocity AS (
+        SELECT
+            COUNT(*)::float / NULLIF(COUNT(DISTINCT student_id), 0) as velocity
+        FROM sessions
+        WHERE scheduled_time >= NOW() - INTERVAL '7 days'
+    ),
+    churn AS (
+        SELECT COUNT(DISTINCT customer_id) as count
+        FROM health_metrics
+        WHERE date >= NOW() - INTERVAL '14 days'
+        AND health_score < 40
+        AND support_ticket_count >= 2
+    ),
+    sd AS (
+        SELECT
+            (SELECT COALESCE(SUM(weekly_capacity_hours), 0) FROM tutors) as supply,
+            (
+                SELECT COALESCE(SUM(duration_minutes) / 60.0, 0)
+                FROM sessions
+                WHERE scheduled_time >= NOW() - INTERVAL '7 days'
+            ) as demand
+    )
+    SELECT
+        health.avg_health,
+        velocity.velocity,
+        churn.count as churn_count,
+        ROUND(
+            CASE
+                WHEN sd.demand > 0 THEN LEAST(sd.supply / sd.demand, 999.0)
+                ELSE 999.0
+            END,
+            2
+        )::float as supply_demand_ratio
+    FROM health, velocity, churn, sd
+""")
+
+# Subject detail: tutor count, capacity and average utilization
+_Q_SUBJECT_CAP = text("""
+    SELECT
+        COUNT(DISTINCT id) as tutor_count,
+        COALESCE(SUM(weekly_capacity_hours), 0) as total_capacity,
+        COALESCE(AVG(utilization_rate), 0) as avg_utilization
+    FROM tutors
+    WHERE subjects @> ARRAY[:subject]::varchar[]
+""")
+
+# Subject detail: top active predictions
+_Q_SUBJECT_PREDICTIONS = text("""
+    SELECT
+        prediction_id,
+        shortage_probability,
+        to_char(
+            predicted_shortage_date AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"'
+        ) as predicted_shortage_date,
+        days_until_shortage,
+        severity,
+        confidence_score,
+        priority_score
+    FROM predictions
+    WHERE subject = :subject
+    AND status = 'active'
+    ORDER BY priority_score DESC
+    LIMIT 5
+""")
+
+# Subject detail: weekly utilization for the last 4 weeks
+_Q_SUBJECT_HISTORY = text("""
+    SELECT
+        to_char(
+            date_trunc('week', date) AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"'
+        ) as week,
+        ROUND((AVG(utilization_rate) * 100)::numeric, 2)::float as utilization
+    FROM capacity_snapshots
+    WHERE subject = :subject
+    AND date >= NOW() - INTERVAL '4 weeks'
+    GROUP BY date_trunc('week', date)
+    ORDER BY date_trunc('week', date) DESC
+""")
+
+# Subject detail: most utilized tutors
+_Q_SUBJECT_TUTORS = text("""
+    SELECT
+        tutor_id,
+        weekly_capacity_hours::float as availability_hours,
+        utilization_rate * 100 as utilization
+    FROM tutors
+    WHERE subjects @> ARRAY[:subject]::varchar[]
+    ORDER BY utilization_rate DESC
+    LIMIT 20
+""")
+
+
+async def _fetch_all(query, params: Dict[str, Any]) -> List[Any]:
+    """
+    Run a read query on its own session and return all rows as mappings.
+
+    AsyncSession allows one in-flight statement at a time, so concurrent
+    reads each need a dedicated session (and pooled connection).
+
+    Args:
+        query: SQLAlchemy text() statement
+        params: Bind parameters
+
+    Returns:
+        List of row mappings keyed by column name
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query, params)
+        return result.mappings().all()
+
 
 # Pydantic models
 
@@ -56,9 +249,14 @@ class SubjectDetailResponse(BaseModel):
 
 
 # API Endpoints
+#
+# Endpoints build their response model once and return an ORJSONResponse,
+# so FastAPI skips a second response_model validation pass. response_model
+# is kept on each route for the OpenAPI schema.
 
 @router.get("/overview", response_model=DashboardOverviewResponse)
-async def get_dashboard_overview() -> Dict[str, Any]:
+@cached_response(CACHE_NAMESPACE, ttl=OVERVIEW_CACHE_TTL)
+async def get_dashboard_overview() -> ORJSONResponse:
     """
     Get dashboard overview with all subjects' capacity status.
 
@@ -66,78 +264,19 @@ async def get_dashboard_overview() -> Dict[str, Any]:
     predicted status, and active alert counts.
 
     Response time target: <500ms
+    Cached in-process for 30 seconds.
     """
     try:
         async with AsyncSessionLocal() as session:
-            # Get all subjects with capacity and predictions
-            query = text("""
-                WITH subject_capacity AS (
-                    SELECT
-                        t.subjects[1] as subject,
-                        COUNT(DISTINCT t.id) as tutor_count,
-                        COALESCE(SUM(t.weekly_capacity_hours), 0) as total_capacity,
-                        COALESCE(SUM(s.booked_hours), 0) as booked_hours
-                    FROM tutors t
-                    CROSS JOIN LATERAL (
-                        SELECT SUM(duration_minutes) / 60.0 as booked_hours
-                        FROM sessions
-                        WHERE subject = t.subjects[1]
-                        AND scheduled_time >= NOW() - INTERVAL '7 days'
-                        AND scheduled_time <= NOW()
-                    ) s
-                    GROUP BY t.subjects[1]
-                ),
-                subject_predictions AS (
-                    SELECT
-                        subject,
-                        COUNT(*) as alert_count
-                    FROM predictions
-                    WHERE status = 'active'
-                    AND shortage_probability > 0.5
-                    GROUP BY subject
-                )
-                SELECT
-                    sc.subject,
-                    sc.tutor_count,
-                    sc.total_capacity,
-                    CASE
-                        WHEN sc.total_capacity > 0
-                        THEN (sc.booked_hours / sc.total_capacity) * 100
-                        ELSE 0
-                    END as utilization,
-                    COALESCE(sp.alert_count, 0) as alert_count
-                FROM subject_capacity sc
-                LEFT JOIN subject_predictions sp ON sc.subject = sp.subject
-                ORDER BY sc.subject
-            """)
-
-            result = await session.execute(query)
-            subjects = []
-
-            for row in result.fetchall():
-                utilization = float(row.utilization)
-
-                # Determine predicted status
-                if utilization >= 85 or row.alert_count > 0:
-                    predicted_status = "critical"
-                elif utilization >= 70:
-                    predicted_status = "warning"
-                else:
-                    predicted_status = "ok"
-
-                subjects.append({
-                    "subject": row.subject,
-                    "current_utilization": round(utilization, 2),
-                    "predicted_status": predicted_status,
-                    "active_alerts_count": row.alert_count,
-                    "tutor_count": row.tutor_count,
-                    "total_capacity_hours": float(row.total_capacity)
-                })
-
-            return {
-                "subjects": subjects,
-                "last_updated": "NOW()"  # Would use actual timestamp
-            }
+            # Rounding and status classification happen in SQL
+            result = await session.execute(_Q_OVERVIEW)
+            subjects = [SubjectStatus(**row) for row in result.mappings()]
+
+            response = DashboardOverviewResponse(
+                subjects=subjects,
+                last_updated=now_iso()
+            )
+            return ORJSONResponse(response.model_dump())
 
     except Exception as e:
         logger.error(f"Error getting dashboard overview: {e}", exc_info=True)
@@ -148,7 +287,8 @@ async def get_dashboard_overview() -> Dict[str, Any]:
 
 
 @router.get("/metrics", response_model=MetricsResponse)
-async def get_dashboard_metrics() -> Dict[str, Any]:
+@cached_response(CACHE_NAMESPACE, ttl=METRICS_CACHE_TTL)
+async def get_dashboard_metrics() -> ORJSONResponse:
     """
     Get operational metrics for dashboard.
 
@@ -160,69 +300,30 @@ async def get_dashboard_metrics() -> Dict[str, Any]:
     - Supply vs demand ratio
 
     Response time target: <500ms
+    Cached in-process for 30 seconds.
     """
     try:
         async with AsyncSessionLocal() as session:
-            # Get health scores
-            query_health = text("""
-                SELECT AVG(health_score) as avg_health
-                FROM health_metrics
-                WHERE date >= NOW() - INTERVAL '7 days'
-            """)
-            result_health = await session.execute(query_health)
-            avg_health = result_health.fetchone().avg_health or 0.0
+            result = await session.execute(_Q_METRICS)
+            row = result.fetchone()
+
+            avg_health = row.avg_health or 0.0
+            velocity = row.velocity or 0.0
+            churn_count = row.churn_count or 0
 
             # Get first session success rate (placeholder)
             # Would calculate from actual first session data
             first_session_success = 75.0
 
-            # Get session velocity (sessions per week per student)
-            query_velocity = text("""
-                SELECT
-                    COUNT(*)::float / NULLIF(COUNT(DISTINCT student_id), 0) as velocity
-                FROM sessions
-                WHERE scheduled_time >= NOW() - INTERVAL '7 days'
-            """)
-            result_velocity = await session.execute(query_velocity)
-            velocity = result_velocity.fetchone().velocity or 0.0
-
-            # Get churn risk count
-            query_churn = text("""
-                SELECT COUNT(DISTINCT customer_id) as count
-                FROM health_metrics
-                WHERE date >= NOW() - INTERVAL '14 days'
-                AND health_score < 40
-                AND support_ticket_count >= 2
-            """)
-            result_churn = await session.execute(query_churn)
-            churn_count = result_churn.fetchone().count or 0
-
-            # Calculate supply/demand ratio
-            query_supply_demand = text("""
-                SELECT
-                    COALESCE(SUM(weekly_capacity_hours), 0) as supply,
-                    COALESCE(SUM(booked_hours), 0) as demand
-                FROM tutors t
-                CROSS JOIN LATERAL (
-                    SELECT SUM(duration_minutes) / 60.0 as booked_hours
-                    FROM sessions
-                    WHERE scheduled_time >= NOW() - INTERVAL '7 days'
-                ) s
-            """)
-            result_sd = await session.execute(query_supply_demand)
-            row_sd = result_sd.fetchone()
-            supply = float(row_sd.supply) if row_sd.supply else 1.0
-            demand = float(row_sd.demand) if row_sd.demand else 0.0
-            supply_demand_ratio = supply / demand if demand > 0 else float('inf')
-
-            return {
-                "avg_health_score": round(float(avg_health), 2),
-                "first_session_success_rate": round(first_session_success, 2),
-                "session_velocity": round(float(velocity), 2),
-                "churn_risk_count": int(churn_count),
-                "supply_demand_ratio": round(supply_demand_ratio, 2),
-                "last_updated": "NOW()"
-            }
+            response = MetricsResponse(
+                avg_health_score=round(avg_health, 2),
+                first_session_success_rate=round(first_session_success, 2),
+                session_velocity=round(velocity, 2),
+                churn_risk_count=churn_count,
+                supply_demand_ratio=row.supply_demand_ratio,
+                last_updated=now_iso()
+            )
+            return ORJSONResponse(response.model_dump())
 
     except Exception as e:
         logger.error(f"Error getting dashboard metrics: {e}", exc_info=True)
@@ -233,9 +334,10 @@ async def get_dashboard_metrics() -> Dict[str, Any]:
 
 
 @router.get("/subjects/{subject}", response_model=SubjectDetailResponse)
+@cached_response(CACHE_NAMESPACE, ttl=SUBJECT_DETAIL_CACHE_TTL)
 async def get_subject_detail(
     subject: str = Path(..., description="Subject name")
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Get detailed view for a specific subject.
 
@@ -243,101 +345,39 @@ async def get_subject_detail(
     predictions, and tutor list.
 
     Response time target: <500ms
+    Cached in-process for 60 seconds per subject.
+
+    Raises:
+        404: If subject not found in SUBJECTS
+        500: If any query fails
     """
+    # Reject unknown subjects before touching the database
+    if subject not in SUBJECTS_SET:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Subject '{subject}' not found. Valid subjects: {SUBJECTS}"
+        )
+
     try:
-        async with AsyncSessionLocal() as session:
-            # Get subject capacity
-            query_capacity = text("""
-                SELECT
-                    COUNT(DISTINCT id) as tutor_count,
-                    COALESCE(SUM(weekly_capacity_hours), 0) as total_capacity,
-                    COALESCE(AVG(utilization_rate), 0) as avg_utilization
-                FROM tutors
-                WHERE :subject = ANY(subjects)
-            """)
-            result_cap = await session.execute(query_capacity, {"subject": subject})
-            row_cap = result_cap.fetchone()
-
-            # Get predictions for this subject
-            query_predictions = text("""
-                SELECT
-                    prediction_id,
-                    shortage_probability,
-                    predicted_shortage_date,
-                    days_until_shortage,
-                    severity,
-                    confidence_score,
-                    priority_score
-                FROM predictions
-                WHERE subject = :subject
-                AND status = 'active'
-                ORDER BY priority_score DESC
-                LIMIT 5
-            """)
-            result_pred = await session.execute(query_predictions, {"subject": subject})
-            predictions = [
-                {
-                    "prediction_id": row.prediction_id,
-                    "shortage_probability": float(row.shortage_probability),
-                    "predicted_shortage_date": row.predicted_shortage_date.isoformat() if row.predicted_shortage_date else None,
-                    "days_until_shortage": row.days_until_shortage,
-                    "severity": row.severity,
-                    "confidence_score": float(row.confidence_score),
-                    "priority_score": float(row.priority_score)
-                }
-                for row in result_pred.fetchall()
-            ]
-
-            # Get utilization history (last 4 weeks)
-            query_history = text("""
-                SELECT
-                    date_trunc('week', date) as week,
-                    AVG(utilization_rate) * 100 as avg_utilization
-                FROM capacity_snapshots
-                WHERE subject = :subject
-                AND date >= NOW() - INTERVAL '4 weeks'
-                GROUP BY date_trunc('week', date)
-                ORDER BY week DESC
-            """)
-            result_hist = await session.execute(query_history, {"subject": subject})
-            utilization_history = [
-                {
-                    "week": row.week.isoformat(),
-                    "utilization": round(float(row.avg_utilization), 2)
-                }
-                for row in result_hist.fetchall()
-            ]
-
-            # Get tutors for this subject
-            query_tutors = text("""
-                SELECT
-                    tutor_id,
-                    weekly_capacity_hours,
-                    utilization_rate
-                FROM tutors
-                WHERE :subject = ANY(subjects)
-                ORDER BY utilization_rate DESC
-                LIMIT 20
-            """)
-            result_tutors = await session.execute(query_tutors, {"subject": subject})
-            tutors = [
-                {
-                    "tutor_id": row.tutor_id,
-                    "availability_hours": float(row.weekly_capacity_hours),
-                    "utilization": float(row.utilization_rate) * 100
-                }
-                for row in result_tutors.fetchall()
-            ]
-
-            return {
-                "subject": subject,
-                "current_utilization": round(float(row_cap.avg_utilization) * 100, 2),
-                "tutor_count": row_cap.tutor_count,
-                "capacity_hours": float(row_cap.total_capacity),
-                "predictions": predictions,
-                "utilization_history": utilization_history,
-                "tutors": tutors
-            }
+        params = {"subject": subject}
+        rows_cap, rows_pred, rows_hist, rows_tutors = await asyncio.gather(
+            _fetch_all(_Q_SUBJECT_CAP, params),
+            _fetch_all(_Q_SUBJECT_PREDICTIONS, params),
+            _fetch_all(_Q_SUBJECT_HISTORY, params),
+            _fetch_all(_Q_SUBJECT_TUTORS, params),
+        )
+        row_cap = rows_cap[0]
+
+        response = SubjectDetailResponse(
+            subject=subject,
+            current_utilization=round(float(row_cap["avg_utilization"]) * 100, 2),
+            tutor_count=row_cap["tutor_count"],
+            capacity_hours=float(row_cap["total_capacity"]),
+            predictions=rows_pred,
+            utilization_history=rows_hist,
+            tutors=rows_tutors
+        )
+        return ORJSONResponse(response.model_dump())
 
     except Exception as e:
         logger.error(f"Error getting subject detail for {subject}: {e}", exc_info=True)
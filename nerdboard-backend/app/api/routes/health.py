@@ -4,17 +4,26 @@ Health Score API Endpoints
 Provides REST API for customer health scores, churn risk detection,
 and dashboard health metrics.
 """
+import asyncio
 import logging
+import time
 from typing import Dict, Any, List
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
+from app.api.cache import cached_response, conditional_response, get_response_cache, set_etag
+from app.api.dependencies import now_iso
 from app.services.health_score_calculator import get_health_calculator
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/health", tags=["health"])
 
+# Response cache namespace and TTLs (seconds)
+CACHE_NAMESPACE = "health"
+DASHBOARD_METRICS_CACHE_TTL = 300
+
 
 # Pydantic models for request/response validation
 
@@ -92,7 +101,8 @@ class RecalculateAllData(BaseModel):
 
 @router.get("/{customer_id}", response_model=HealthResponseData)
 async def get_customer_health(
-    customer_id: str = Path(..., description="Customer UUID as string")
+    customer_id: str = Path(..., description="Customer UUID as string"),
+    now: str = Depends(now_iso)
 ) -> Dict[str, Any]:
     """
     Get current health score and churn risk for a customer (AC-6).
@@ -110,55 +120,37 @@ async def get_customer_health(
     try:
         calculator = get_health_calculator()
 
-        # Calculate health score
-        health_score = await calculator.calculate_health_score(customer_id)
-
-        # If score is 0, customer likely doesn't exist
-        if health_score == 0:
-            # Check if customer has any enrollments
-            engagement = await calculator._get_engagement_score(customer_id)
-            if engagement == 0:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Customer '{customer_id}' not found or has no enrollment data"
-                )
-
-        # Get churn risk
-        churn_risk = await calculator.detect_churn_risk(customer_id)
-
-        # Get component breakdown
-        first_session = await calculator._get_first_session_success(customer_id)
-        velocity = await calculator._calculate_session_velocity(customer_id)
-        ib_penalty = await calculator._calculate_ib_penalty(customer_id)
-        engagement = await calculator._get_engagement_score(customer_id)
+        # All score components in a single round-trip
+        breakdown = await calculator.get_full_health_breakdown(customer_id)
+        health_score = breakdown["health_score"]
+        components = breakdown["components"]
+        engagement = components["engagement_score"]
 
-        # Calculate detailed metrics
-        ib_calls = 0 if ib_penalty == 0 else (1 if ib_penalty == 20 else 2)
-        sessions_per_week = (velocity / 100.0) * 5.0  # Reverse normalization
+        # If score is 0 and customer has no enrollments, customer likely doesn't exist
+        if health_score == 0 and engagement == 0:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Customer '{customer_id}' not found or has no enrollment data"
+            )
 
         response_data = {
             "customer_id": customer_id,
             "health_score": health_score,
-            "churn_risk": churn_risk,
-            "components": {
-                "first_session_success": first_session,
-                "session_velocity": velocity,
-                "ib_penalty": ib_penalty,
-                "engagement_score": engagement
-            },
+            "churn_risk": breakdown["churn_risk"],
+            "components": components,
             "metrics": {
                 "total_sessions": 0,  # TODO: Calculate from sessions table
-                "sessions_per_week": round(sessions_per_week, 2),
-                "ib_calls_14_days": ib_calls,
+                "sessions_per_week": round(breakdown["sessions_per_week"], 2),
+                "ib_calls_14_days": breakdown["ib_calls"],
                 "engagement_level": engagement
             },
-            "last_calculated": "2025-11-08T14:35:00Z"  # TODO: Get from health_metrics table
+            "last_calculated": now  # Score is computed live for this request
         }
 
         return {
             "data": response_data,
             "metadata": {
-                "timestamp": "2025-11-08T14:35:00Z",
+                "timestamp": now,
                 "cache_hit": False
             }
         }
@@ -174,7 +166,7 @@ async def get_customer_health(
 
 
 @router.get("/dashboard/metrics", response_model=DashboardMetricsData)
-async def get_dashboard_health_metrics() -> Dict[str, Any]:
+async def get_dashboard_health_metrics(request: Request) -> Response:
     """
     Get aggregated health metrics for dashboard overview (AC-8).
 
@@ -186,21 +178,28 @@ async def get_dashboard_health_metrics() -> Dict[str, Any]:
         - cohort_breakdown: Health aggregates per cohort
 
     Response time target: <500ms
-    Cached for 5 minutes in production.
+    Cached in-process for 5 minutes; responses carry an ETag and clients
+    revalidating with If-None-Match receive 304 Not Modified.
     """
+    response = await _dashboard_health_metrics_response()
+    return conditional_response(request, response)
+
+
+@cached_response(CACHE_NAMESPACE, ttl=DASHBOARD_METRICS_CACHE_TTL)
+async def _dashboard_health_metrics_response() -> ORJSONResponse:
+    """Compute the dashboard health metrics payload as a tagged response"""
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         calculator = get_health_calculator()
 
-        # Get dashboard metrics
-        metrics = await calculator.get_dashboard_health_metrics()
-
-        # Get cohort breakdown
-        cohorts = await calculator.calculate_cohort_health_aggregates()
+        # Dashboard metrics and cohort breakdown are independent reads
+        metrics, cohorts = await asyncio.gather(
+            calculator.get_dashboard_health_metrics(),
+            calculator.calculate_cohort_health_aggregates()
+        )
 
-        calculation_time_ms = (time.time() - start_time) * 1000
+        calculation_time_ms = (time.perf_counter() - start_time) * 1000
 
         response_data = {
             "total_customers": metrics["total_customers"],
@@ -210,13 +209,14 @@ async def get_dashboard_health_metrics() -> Dict[str, Any]:
             "cohort_breakdown": cohorts
         }
 
-        return {
-            "data": response_data,
-            "metadata": {
-                "timestamp": "2025-11-08T14:35:00Z",
+        payload = DashboardMetricsData(
+            data=response_data,
+            metadata={
+                "timestamp": now_iso(),
                 "calculation_time_ms": round(calculation_time_ms, 2)
             }
-        }
+        )
+        return set_etag(ORJSONResponse(payload.model_dump()), max_age=DASHBOARD_METRICS_CACHE_TTL)
 
     except Exception as e:
         logger.error(f"Error getting dashboard health metrics: {e}", exc_info=True)
@@ -248,6 +248,9 @@ async def recalculate_all_health_scores() -> Dict[str, Any]:
         # Run batch calculation
         summary = await calculator.calculate_all_customers_health()
 
+        # Scores changed; drop cached dashboard aggregates
+        get_response_cache().invalidate(CACHE_NAMESPACE)
+
         return {"data": summary}
 
     except Exception as e:
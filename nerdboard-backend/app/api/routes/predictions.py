@@ -3,18 +3,300 @@ Predictions API Endpoints
 
 Provides REST API for retrieving ML predictions and explanations.
 """
+import base64
+import binascii
+import functools
+import json
 import logging
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, Path, Query
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
 
-from app.database import AsyncSessionLocal
+from app.api.cache import not_modified, version_etag
+from app.database import get_session
+from app.models.prediction import PREDICTION_STATUSES
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/predictions", tags=["predictions"])
 
+# Static SQL statements, built once at import
+
+# Prediction with its stored explanation, assembled as the response body by
+# Postgres so the handler passes the JSON text through without decoding it
+_Q_PREDICTION_DETAIL = text("""
+    SELECT json_build_object(
+        'prediction_id', p.prediction_id,
+        'subject', p.subject,
+        'shortage_probability', p.shortage_probability,
+        'predicted_shortage_date', p.predicted_shortage_date,
+        'days_until_shortage', p.days_until_shortage,
+        'severity', p.severity,
+        'predicted_peak_utilization', p.predicted_peak_utilization,
+        'horizon', p.horizon,
+        'horizon_days', p.horizon_days,
+        'confidence_score', p.confidence_score,
+        'confidence_level', p.confidence_level,
+        'confidence_breakdown', p.confidence_breakdown,
+        'priority_score', p.priority_score,
+        'is_critical', p.is_critical,
+        'status', p.status,
+        'created_at', p.created_at,
+        'updated_at', p.updated_at,
+        'top_features', COALESCE(e.top_features::jsonb, '[]'::jsonb),
+        'explanation_text', COALESCE(e.explanation_text, '')
+    )::text AS payload
+    FROM predictions p
+    LEFT JOIN explanations e ON p.prediction_id = e.prediction_id
+    WHERE p.prediction_id = :prediction_id
+""")
+
+# Version of a prediction and its explanation, for ETag revalidation
+_Q_PREDICTION_VERSION = text("""
+    SELECT GREATEST(p.updated_at, e.created_at)
+    FROM predictions p
+    LEFT JOIN explanations e ON p.prediction_id = e.prediction_id
+    WHERE p.prediction_id = :prediction_id
+""")
+
+# Explanation for a single prediction
+_Q_PREDICTION_EXPLANATION = text("""
+    SELECT
+        top_features,
+        explanation_text,
+        historical_context,
+        created_at
+    FROM explanations
+    WHERE prediction_id = :prediction_id
+""")
+
+# Urgency filter predicates. Priority bands are half-open ranges on
+# priority_score, served by the (status, priority_score) keyset index;
+# critical is served by the partial is_critical index.
+URGENCY_CLAUSES = MappingProxyType({
+    "critical": "is_critical = TRUE",
+    "high": "priority_score >= 70",
+    "medium": "priority_score >= 40 AND priority_score < 70",
+    "low": "priority_score < 40"
+})
+
+# Keyset pagination sort keys: sort -> (column, direction). prediction_id is
+# the tiebreaker so every sort order is total and cursors are stable.
+KEYSET_SORTS = MappingProxyType({
+    "priority_desc": ("priority_score", "DESC"),
+    "priority_asc": ("priority_score", "ASC"),
+    "date_desc": ("predicted_shortage_date", "DESC"),
+    "confidence_desc": ("confidence_score", "DESC")
+})
+
+
+def _encode_cursor(sort: str, row: Dict[str, Any]) -> str:
+    """
+    Encode the last row's sort key as an opaque cursor.
+
+    Args:
+        sort: Sort key from KEYSET_SORTS
+        row: Last row of the current page
+
+    Returns:
+        URL-safe base64 JSON of [sort, sort column value, prediction_id]
+    """
+    column, _ = KEYSET_SORTS[sort]
+    value = row[column]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, row["prediction_id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Args:
+        cursor: Opaque cursor from a previous response's meta.next_cursor
+        sort: Sort key of the current request
+
+    Returns:
+        Tuple of (sort column value, prediction_id)
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        cursor_sort, value, prediction_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+
+    column, _ = KEYSET_SORTS[sort]
+    if column == "predicted_shortage_date" and value is not None:
+        value = datetime.fromisoformat(value)
+
+    return value, prediction_id
+
+
+def _keyset_clause(sort: str, cursor_value: Any) -> str:
+    """
+    Build the WHERE predicate selecting rows after the cursor.
+
+    Args:
+        sort: Sort key from KEYSET_SORTS
+        cursor_value: Sort column value of the cursor row (may be None for dates)
+
+    Returns:
+        SQL predicate using :cursor_value and :cursor_id bind parameters
+    """
+    column, direction = KEYSET_SORTS[sort]
+
+    if column == "predicted_shortage_date":
+        # Nullable column sorted NULLS LAST, so NULL rows follow every date
+        if cursor_value is None:
+            return "(predicted_shortage_date IS NULL AND prediction_id < :cursor_id)"
+        return (
+            "(predicted_shortage_date < :cursor_value"
+            " OR (predicted_shortage_date = :cursor_value AND prediction_id < :cursor_id)"
+            " OR predicted_shortage_date IS NULL)"
+        )
+
+    comparison = "<" if direction == "DESC" else ">"
+    return f"({column}, prediction_id) {comparison} (:cursor_value, :cursor_id)"
+
+
+def _page_meta(total: int, limit: int, offset: Optional[int], next_cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the pagination meta block for a predictions page.
+
+    Args:
+        total: Total rows matching the filters
+        limit: Page size
+        offset: Row offset of the page, or None for a cursor page
+        next_cursor: Keyset cursor for the following page, or None
+
+    Returns:
+        Meta dict with total, limit, offset, page, pages and next_cursor;
+        offset and page are None for cursor pages, whose position is unknown
+    """
+    return {
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "page": offset // limit + 1 if offset is not None else None,
+        "pages": -(-total // limit),
+        "next_cursor": next_cursor
+    }
+
+
+async def _prediction_etag(session: AsyncSession, prediction_id: str) -> Optional[str]:
+    """
+    Look up the ETag of a prediction and its explanation.
+
+    Args:
+        session: Database session
+        prediction_id: Prediction ID
+
+    Returns:
+        Weak ETag, or None if the prediction does not exist
+    """
+    result = await session.execute(_Q_PREDICTION_VERSION, {"prediction_id": prediction_id})
+    version = result.scalar()
+    return version_etag(version) if version else None
+
+
+@functools.lru_cache(maxsize=256)
+def _predictions_list_queries(
+    has_subject: bool,
+    has_horizon: bool,
+    has_confidence_min: bool,
+    urgency: Optional[str],
+    sort: str,
+    keyset_sql: str
+) -> Tuple[TextClause, TextClause]:
+    """
+    Build (and memoize) the list and count statements for one filter shape.
+
+    Filter values are always bound parameters, so the set of distinct
+    statements is small and each is compiled once per process.
+
+    Args:
+        has_subject: Whether the subject filter is applied
+        has_horizon: Whether the horizon filter is applied
+        has_confidence_min: Whether the confidence_min filter is applied
+        urgency: Key of URGENCY_CLAUSES, or None
+        sort: Key of KEYSET_SORTS
+        keyset_sql: Keyset predicate from _keyset_clause(), or "TRUE"
+
+    Returns:
+        Tuple of (page query, count query)
+    """
+    where_clauses = ["status = :status"]
+
+    if has_subject:
+        where_clauses.append("subject = :subject")
+    if has_horizon:
+        where_clauses.append("horizon = :horizon")
+    if has_confidence_min:
+        where_clauses.append("confidence_score >= :confidence_min")
+    if urgency:
+        where_clauses.append(URGENCY_CLAUSES[urgency])
+
+    where_sql = " AND ".join(where_clauses)
+
+    # Sort mapping, with prediction_id as tiebreaker
+    sort_column, sort_direction = KEYSET_SORTS[sort]
+    nulls = " NULLS LAST" if sort_column == "predicted_shortage_date" else ""
+    order_by = f"{sort_column} {sort_direction}{nulls}, prediction_id {sort_direction}"
+
+    columns_sql = """
+                prediction_id,
+                subject,
+                shortage_probability,
+                predicted_shortage_date,
+                days_until_shortage,
+                confidence_score,
+                severity,
+                priority_score,
+                is_critical,
+                created_at"""
+
+    if keyset_sql == "TRUE":
+        # Offset pages carry the filtered total on every row
+        query = text(f"""
+            SELECT{columns_sql},
+                COUNT(*) OVER () as total
+            FROM predictions
+            WHERE {where_sql}
+            ORDER BY {order_by}
+            LIMIT :limit OFFSET :offset
+        """)
+    else:
+        # Cursor pages seek the (status, sort column, prediction_id) index
+        # from the cursor; a window aggregate here would force reading the
+        # whole filtered set, so the total comes from the count query
+        query = text(f"""
+            SELECT{columns_sql}
+            FROM predictions
+            WHERE {where_sql} AND {keyset_sql}
+            ORDER BY {order_by}
+            LIMIT :limit
+        """)
+
+    count_query = text(f"""
+        SELECT COUNT(*) as total
+        FROM predictions
+        WHERE {where_sql}
+    """)
+
+    return query, count_query
+
 
 # Pydantic models
 
@@ -81,111 +363,85 @@ async def get_predictions(
     status: str = Query("active", description="Prediction status (active, resolved, expired)"),
     sort: str = Query("priority_desc", description="Sort by: priority_desc, priority_asc, date_desc, confidence_desc"),
     limit: int = Query(20, ge=1, le=100, description="Results per page"),
-    offset: int = Query(0, ge=0, description="Results offset")
-) -> Dict[str, Any]:
+    offset: int = Query(0, ge=0, description="Results offset (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from meta.next_cursor"),
+    session: AsyncSession = Depends(get_session)
+) -> ORJSONResponse:
     """
     Get list of predictions with filtering and sorting.
 
     Query parameters allow filtering by subject, urgency, horizon, and confidence.
-    Results are paginated and sorted by priority by default.
+    Results are paginated and sorted by priority by default. Pass the previous
+    page's meta.next_cursor as cursor for keyset pagination, which seeks the
+    sort index from the cursor instead of reading and discarding earlier
+    rows; offset pagination remains supported. Cursor pages count the
+    total separately and report null offset and page.
 
     Response time target: <500ms
+    Returned as ORJSONResponse without a response_model validation pass;
+    datetimes are serialized natively by orjson.
+
+    Raises:
+        400: If status is unknown, or cursor is malformed or was issued for
+            a different sort
     """
+    # status is a native enum column; unknown values would fail the cast
+    if status not in PREDICTION_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+
+    if sort not in KEYSET_SORTS:
+        sort = "priority_desc"
+
+    params = {"status": status, "limit": limit, "offset": offset}
+    keyset_sql = "TRUE"
+
+    if cursor:
+        try:
+            cursor_value, cursor_id = _decode_cursor(cursor, sort)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+        keyset_sql = _keyset_clause(sort, cursor_value)
+        params.update({"cursor_value": cursor_value, "cursor_id": cursor_id})
+        del params["offset"]
+
+    # Filter values are bound parameters; only the filter shape picks the statement
+    if subject:
+        params["subject"] = subject
+    if horizon:
+        params["horizon"] = horizon
+    if confidence_min is not None:
+        params["confidence_min"] = confidence_min
+
+    query, count_query = _predictions_list_queries(
+        bool(subject),
+        bool(horizon),
+        confidence_min is not None,
+        urgency if urgency in URGENCY_CLAUSES else None,
+        sort,
+        keyset_sql
+    )
+
     try:
-        async with AsyncSessionLocal() as session:
-            # Build WHERE clauses
-            where_clauses = ["status = :status"]
-            params = {"status": status, "limit": limit, "offset": offset}
-
-            if subject:
-                where_clauses.append("subject = :subject")
-                params["subject"] = subject
-
-            if horizon:
-                where_clauses.append("horizon = :horizon")
-                params["horizon"] = horizon
-
-            if confidence_min is not None:
-                where_clauses.append("confidence_score >= :confidence_min")
-                params["confidence_min"] = confidence_min
-
-            # Urgency mapping
-            if urgency:
-                if urgency == "critical":
-                    where_clauses.append("is_critical = TRUE")
-                elif urgency == "high":
-                    where_clauses.append("priority_score >= 70")
-                elif urgency == "medium":
-                    where_clauses.append("priority_score >= 40 AND priority_score < 70")
-                elif urgency == "low":
-                    where_clauses.append("priority_score < 40")
-
-            where_sql = " AND ".join(where_clauses)
-
-            # Sort mapping
-            sort_mapping = {
-                "priority_desc": "priority_score DESC",
-                "priority_asc": "priority_score ASC",
-                "date_desc": "predicted_shortage_date DESC NULLS LAST",
-                "confidence_desc": "confidence_score DESC"
-            }
-            order_by = sort_mapping.get(sort, "priority_score DESC")
-
-            # Get total count
-            count_query = text(f"""
-                SELECT COUNT(*) as total
-                FROM predictions
-                WHERE {where_sql}
-            """)
+        result = await session.execute(query, params)
+
+        # Rows map straight onto the response; on offset pages every row
+        # carries the same total
+        predictions = [dict(row) for row in result.mappings()]
+        total = 0
+        for prediction in predictions:
+            total = prediction.pop("total", total)
+
+        if cursor or (not predictions and offset > 0):
+            # Cursor page, or offset page past the end: count separately
             count_result = await session.execute(count_query, params)
-            total = count_result.fetchone().total
-
-            # Get predictions
-            query = text(f"""
-                SELECT
-                    prediction_id,
-                    subject,
-                    shortage_probability,
-                    predicted_shortage_date,
-                    days_until_shortage,
-                    confidence_score,
-                    severity,
-                    priority_score,
-                    is_critical,
-                    created_at
-                FROM predictions
-                WHERE {where_sql}
-                ORDER BY {order_by}
-                LIMIT :limit OFFSET :offset
-            """)
-
-            result = await session.execute(query, params)
-            predictions = []
-
-            for row in result.fetchall():
-                predictions.append({
-                    "prediction_id": row.prediction_id,
-                    "subject": row.subject,
-                    "shortage_probability": float(row.shortage_probability),
-                    "predicted_shortage_date": row.predicted_shortage_date.isoformat() if row.predicted_shortage_date else None,
-                    "days_until_shortage": row.days_until_shortage,
-                    "confidence_score": float(row.confidence_score),
-                    "severity": row.severity,
-                    "priority_score": float(row.priority_score),
-                    "is_critical": row.is_critical,
-                    "created_at": row.created_at.isoformat()
-                })
-
-            return {
-                "predictions": predictions,
-                "meta": {
-                    "total": total,
-                    "limit": limit,
-                    "offset": offset,
-                    "page": (offset // limit) + 1,
-                    "pages": (total + limit - 1) // limit
-                }
-            }
+            total = count_result.scalar()
+
+        next_cursor = _encode_cursor(sort, predictions[-1]) if len(predictions) == limit else None
+        return ORJSONResponse({
+            "predictions": predictions,
+            "meta": _page_meta(total, limit, None if cursor else offset, next_cursor)
+        })
 
     except Exception as e:
         logger.error(f"Error getting predictions: {e}", exc_info=True)
@@ -197,8 +453,10 @@ async def get_predictions(
 
 @router.get("/{prediction_id}", response_model=PredictionDetail)
 async def get_prediction_detail(
-    prediction_id: str = Path(..., description="Prediction ID")
-) -> Dict[str, Any]:
+    request: Request,
+    prediction_id: str = Path(..., description="Prediction ID"),
+    session: AsyncSession = Depends(get_session)
+) -> Response:
     """
     Get detailed prediction with full explanation.
 
@@ -206,66 +464,30 @@ async def get_prediction_detail(
     and natural language explanation.
 
     Response time target: <500ms
+    The JSON body is built by Postgres and returned as-is, with timestamps
+    in ISO 8601 and no per-field conversion in Python. Responses carry an
+    ETag from the row versions; a matching If-None-Match gets 304 after a
+    single version lookup.
     """
     try:
-        async with AsyncSessionLocal() as session:
-            # Get prediction
-            query = text("""
-                SELECT
-                    p.prediction_id,
-                    p.subject,
-                    p.shortage_probability,
-                    p.predicted_shortage_date,
-                    p.days_until_shortage,
-                    p.severity,
-                    p.predicted_peak_utilization,
-                    p.horizon,
-                    p.horizon_days,
-                    p.confidence_score,
-                    p.confidence_level,
-                    p.confidence_breakdown,
-                    p.priority_score,
-                    p.is_critical,
-                    p.status,
-                    p.created_at,
-                    p.updated_at,
-                    e.top_features,
-                    e.explanation_text
-                FROM predictions p
-                LEFT JOIN explanations e ON p.prediction_id = e.prediction_id
-                WHERE p.prediction_id = :prediction_id
-            """)
-
-            result = await session.execute(query, {"prediction_id": prediction_id})
-            row = result.fetchone()
-
-            if not row:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Prediction {prediction_id} not found"
-                )
-
-            return {
-                "prediction_id": row.prediction_id,
-                "subject": row.subject,
-                "shortage_probability": float(row.shortage_probability),
-                "predicted_shortage_date": row.predicted_shortage_date.isoformat() if row.predicted_shortage_date else None,
-                "days_until_shortage": row.days_until_shortage,
-                "severity": row.severity,
-                "predicted_peak_utilization": float(row.predicted_peak_utilization),
-                "horizon": row.horizon,
-                "horizon_days": row.horizon_days,
-                "confidence_score": float(row.confidence_score),
-                "confidence_level": row.confidence_level,
-                "confidence_breakdown": row.confidence_breakdown,
-                "priority_score": float(row.priority_score),
-                "is_critical": row.is_critical,
-                "status": row.status,
-                "created_at": row.created_at.isoformat(),
-                "updated_at": row.updated_at.isoformat(),
-                "top_features": row.top_features if row.top_features else [],
-                "explanation_text": row.explanation_text if row.explanation_text else ""
-            }
+        etag = await _prediction_etag(session, prediction_id)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+
+        result = await session.execute(_Q_PREDICTION_DETAIL, {"prediction_id": prediction_id})
+        payload = result.scalar()
+
+        if payload is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Prediction {prediction_id} not found"
+            )
+
+        response = Response(content=payload, media_type="application/json")
+        if etag:
+            response.headers["ETag"] = etag
+        return response
 
     except HTTPException:
         raise
@@ -279,41 +501,41 @@ async def get_prediction_detail(
 
 @router.get("/{prediction_id}/explanation")
 async def get_prediction_explanation(
-    prediction_id: str = Path(..., description="Prediction ID")
-) -> Dict[str, Any]:
+    request: Request,
+    prediction_id: str = Path(..., description="Prediction ID"),
+    session: AsyncSession = Depends(get_session)
+) -> ORJSONResponse:
     """
     Get detailed explanation for a prediction.
 
     Returns SHAP feature contributions and natural language explanation separately.
+    Supports If-None-Match revalidation like get_prediction_detail.
     """
     try:
-        async with AsyncSessionLocal() as session:
-            query = text("""
-                SELECT
-                    top_features,
-                    explanation_text,
-                    historical_context,
-                    created_at
-                FROM explanations
-                WHERE prediction_id = :prediction_id
-            """)
-
-            result = await session.execute(query, {"prediction_id": prediction_id})
-            row = result.fetchone()
-
-            if not row:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Explanation for prediction {prediction_id} not found"
-                )
-
-            return {
-                "prediction_id": prediction_id,
-                "top_features": row.top_features,
-                "explanation_text": row.explanation_text,
-                "historical_context": row.historical_context,
-                "created_at": row.created_at.isoformat()
-            }
+        etag = await _prediction_etag(session, prediction_id)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+
+        result = await session.execute(_Q_PREDICTION_EXPLANATION, {"prediction_id": prediction_id})
+        row = result.fetchone()
+
+        if not row:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Explanation for prediction {prediction_id} not found"
+            )
+
+        response = ORJSONResponse({
+            "prediction_id": prediction_id,
+            "top_features": row.top_features,
+            "explanation_text": row.explanation_text,
+            "historical_context": row.historical_context,
+            "created_at": row.created_at
+        })
+        if etag:
+            response.headers["ETag"] = etag
+        return response
 
     except HTTPException:
         raise
@@ -4,18 +4,99 @@ Data Quality Monitoring API Endpoints
 Provides REST API for data quality scores, validation history, and issue tracking.
 """
 import logging
+from types import MappingProxyType
 from typing import Dict, Any, List
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
 
 from app.services.data_validator import get_data_validator
-from app.database import AsyncSessionLocal
+from app.database import get_session
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/quality", tags=["quality"])
 
+# Static SQL statements, built once at import
+
+# Quality history for one table over the last :days days: window summary
+# (average, latest score, trend) plus the :limit most recent entries. The
+# summary columns repeat on every row; an empty window yields a single row
+# with NULL entry columns and data_points = 0.
+_Q_QUALITY_HISTORY = text("""
+    WITH window_log AS (
+        SELECT
+            validation_time,
+            quality_score,
+            critical_issues,
+            warnings
+        FROM data_quality_log
+        WHERE table_name = :table_name
+        AND validation_time >= NOW() - :days * INTERVAL '1 day'
+    ),
+    agg AS (
+        SELECT
+            ROUND(AVG(quality_score)::numeric, 2)::float as average_score,
+            (array_agg(quality_score ORDER BY validation_time DESC))[1] as latest_score,
+            (array_agg(quality_score ORDER BY validation_time ASC))[1] as earliest_score,
+            COUNT(*) as data_points
+        FROM window_log
+    )
+    SELECT
+        agg.average_score,
+        agg.latest_score,
+        CASE
+            WHEN agg.data_points >= 2 AND agg.latest_score > agg.earliest_score THEN 'improving'
+            WHEN agg.data_points >= 2 AND agg.latest_score < agg.earliest_score THEN 'declining'
+            ELSE 'stable'
+        END as trend,
+        agg.data_points,
+        h.validation_time,
+        h.quality_score,
+        h.critical_issues,
+        h.warnings
+    FROM agg
+    LEFT JOIN LATERAL (
+        SELECT *
+        FROM window_log
+        ORDER BY validation_time DESC
+        LIMIT :limit
+    ) h ON TRUE
+""")
+
+# Severity filter predicates for recent issues
+SEVERITY_CLAUSES = MappingProxyType({
+    "critical": "critical_issues > 0",
+    "warning": "warnings > 0"
+})
+
+
+def _recent_issues_query(severity_clause: str) -> TextClause:
+    """Build the recent issues statement for one severity predicate"""
+    return text(f"""
+        SELECT
+            table_name,
+            validation_time,
+            quality_score,
+            critical_issues,
+            warnings,
+            issues_json
+        FROM data_quality_log
+        WHERE {severity_clause}
+        ORDER BY validation_time DESC
+        LIMIT :limit
+    """)
+
+
+# Most recent validation runs that reported issues, keyed by severity filter
+_Q_RECENT_ISSUES = MappingProxyType({
+    None: _recent_issues_query("(critical_issues > 0 OR warnings > 0)"),
+    **{severity: _recent_issues_query(clause) for severity, clause in SEVERITY_CLAUSES.items()}
+})
+
 
 # Pydantic models
 
@@ -59,7 +140,7 @@ class QualityHistoryEntry(BaseModel):
 
 
 @router.get("/status", response_model=QualityStatusResponse)
-async def get_quality_status() -> Dict[str, Any]:
+async def get_quality_status() -> ORJSONResponse:
     """
     Get current data quality scores for all tables.
 
@@ -67,12 +148,13 @@ async def get_quality_status() -> Dict[str, Any]:
     for each monitored table.
 
     Response time target: <500ms
+    Returned as ORJSONResponse without a response_model validation pass.
     """
     try:
         validator = get_data_validator()
         summary = await validator.validate_all_tables()
 
-        return summary
+        return ORJSONResponse(summary)
 
     except Exception as e:
         logger.error(f"Error getting quality status: {e}", exc_info=True)
@@ -85,48 +167,35 @@ async def get_quality_status() -> Dict[str, Any]:
 @router.get("/history/{table_name}")
 async def get_quality_history(
     table_name: str = Path(..., description="Table name to get history for"),
-    days: int = Query(7, ge=1, le=90, description="Number of days of history")
+    days: int = Query(7, ge=1, le=90, description="Number of days of history"),
+    limit: int = Query(200, ge=1, le=1000, description="Maximum number of history entries"),
+    session: AsyncSession = Depends(get_session)
 ) -> Dict[str, Any]:
     """
     Get historical quality trends for a specific table.
 
     Shows quality score changes over time to identify degradation patterns.
+    The summary (average, latest score, trend, data points) covers the whole
+    window and is computed in SQL; history returns the most recent entries.
 
     Args:
         table_name: Name of table to get history for
         days: Number of days of history (1-90, default 7)
+        limit: Maximum number of history entries (1-1000, default 200)
 
     Returns:
         Historical quality scores and trend data
     """
     try:
-        async with AsyncSessionLocal() as session:
-            query = text("""
-                SELECT
-                    validation_time,
-                    quality_score,
-                    critical_issues,
-                    warnings
-                FROM data_quality_log
-                WHERE table_name = :table_name
-                AND validation_time >= NOW() - :days * INTERVAL '1 day'
-                ORDER BY validation_time DESC
-            """)
-            result = await session.execute(query, {
-                "table_name": table_name,
-                "days": days
-            })
-
-            history = []
-            for row in result.fetchall():
-                history.append({
-                    "validation_time": row.validation_time.isoformat(),
-                    "quality_score": float(row.quality_score),
-                    "critical_issues": row.critical_issues,
-                    "warnings": row.warnings
-                })
+        result = await session.execute(_Q_QUALITY_HISTORY, {
+            "table_name": table_name,
+            "days": days,
+            "limit": limit
+        })
+        rows = result.fetchall()
 
-        if not history:
+        summary_row = rows[0]
+        if summary_row.data_points == 0:
             return {
                 "table_name": table_name,
                 "days": days,
@@ -134,21 +203,25 @@ async def get_quality_history(
                 "message": f"No validation history found for table '{table_name}'"
             }
 
-        # Calculate trend
-        scores = [h["quality_score"] for h in history]
-        avg_score = sum(scores) / len(scores) if scores else 0.0
-        trend = "improving" if len(scores) >= 2 and scores[0] > scores[-1] else \
-                "declining" if len(scores) >= 2 and scores[0] < scores[-1] else "stable"
+        history = [
+            {
+                "validation_time": row.validation_time.isoformat(),
+                "quality_score": row.quality_score,
+                "critical_issues": row.critical_issues,
+                "warnings": row.warnings
+            }
+            for row in rows
+        ]
 
         return {
             "table_name": table_name,
             "days": days,
             "history": history,
             "summary": {
-                "average_score": round(avg_score, 2),
-                "latest_score": scores[0] if scores else 0.0,
-                "trend": trend,
-                "data_points": len(history)
+                "average_score": summary_row.average_score,
+                "latest_score": summary_row.latest_score,
+                "trend": summary_row.trend,
+                "data_points": summary_row.data_points
             }
         }
 
@@ -163,7 +236,8 @@ async def get_quality_history(
 @router.get("/issues")
 async def get_recent_issues(
     severity: str = Query(None, description="Filter by severity (critical, warning)"),
-    limit: int = Query(50, ge=1, le=500, description="Maximum number of issues to return")
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of issues to return"),
+    session: AsyncSession = Depends(get_session)
 ) -> Dict[str, Any]:
     """
     Get recent validation failures and issues.
@@ -178,41 +252,21 @@ async def get_recent_issues(
         Recent validation issues with details
     """
     try:
-        async with AsyncSessionLocal() as session:
-            # Get recent validation logs with issues
-            query = text("""
-                SELECT
-                    table_name,
-                    validation_time,
-                    quality_score,
-                    critical_issues,
-                    warnings,
-                    issues_json
-                FROM data_quality_log
-                WHERE (critical_issues > 0 OR warnings > 0)
-                ORDER BY validation_time DESC
-                LIMIT :limit
-            """)
-            result = await session.execute(query, {"limit": limit})
-
-            issues_list = []
-            for row in result.fetchall():
-                # Filter by severity if specified
-                if severity:
-                    # This is simplified - in production would filter JSON issues
-                    if severity == "critical" and row.critical_issues == 0:
-                        continue
-                    if severity == "warning" and row.warnings == 0:
-                        continue
-
-                issues_list.append({
-                    "table_name": row.table_name,
-                    "validation_time": row.validation_time.isoformat(),
-                    "quality_score": float(row.quality_score),
-                    "critical_issues": row.critical_issues,
-                    "warnings": row.warnings,
-                    "issues": row.issues_json.get("issues", []) if row.issues_json else []
-                })
+        # Get recent validation logs with issues; severity is filtered in
+        # SQL so LIMIT applies to matching rows
+        query = _Q_RECENT_ISSUES.get(severity, _Q_RECENT_ISSUES[None])
+        result = await session.execute(query, {"limit": limit})
+
+        issues_list = []
+        for row in result.fetchall():
+            issues_list.append({
+                "table_name": row.table_name,
+                "validation_time": row.validation_time.isoformat(),
+                "quality_score": float(row.quality_score),
+                "critical_issues": row.critical_issues,
+                "warnings": row.warnings,
+                "issues": row.issues_json.get("issues", []) if row.issues_json else []
+            })
 
         return {
             "issues_count": len(issues_list),
@@ -5,15 +5,22 @@ Provides REST API for controlling real-time simulation:
 - POST /api/v1/simulation/start
 - POST /api/v1/simulation/pause
 - POST /api/v1/simulation/advance
+- POST /api/v1/simulation/advance/stream
 - GET /api/v1/simulation/status
 """
 
+import logging
+from typing import Any, AsyncIterator, Dict
+
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any
 
 from app.services.data_simulator import get_simulator
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/v1/simulation", tags=["simulation"])
 
 
@@ -28,7 +35,12 @@ class SimulationResponse(BaseModel):
     data: Dict[str, Any]
 
 
-@router.post("/start", response_model=SimulationResponse)
+# Endpoints return plain {"data": ...} dicts serialized straight by the app's
+# ORJSONResponse default; the wrapper model only documents the schema
+_DOCUMENTED_RESPONSE = {200: {"model": SimulationResponse}}
+
+
+@router.post("/start", response_model=None, responses=_DOCUMENTED_RESPONSE)
 async def start_simulation():
     """
     Start real-time simulation (AC-4)
@@ -38,12 +50,12 @@ async def start_simulation():
     try:
         simulator = get_simulator()
         result = await simulator.start_simulation()
-        return SimulationResponse(data=result)
+        return {"data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start simulation: {str(e)}")
 
 
-@router.post("/pause", response_model=SimulationResponse)
+@router.post("/pause", response_model=None, responses=_DOCUMENTED_RESPONSE)
 async def pause_simulation():
     """
     Pause simulation (AC-4)
@@ -53,12 +65,12 @@ async def pause_simulation():
     try:
         simulator = get_simulator()
         result = await simulator.pause_simulation()
-        return SimulationResponse(data=result)
+        return {"data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to pause simulation: {str(e)}")
 
 
-@router.post("/advance", response_model=SimulationResponse)
+@router.post("/advance", response_model=None, responses=_DOCUMENTED_RESPONSE)
 async def advance_simulation(request: AdvanceRequest):
     """
     Fast-forward simulation by N days (AC-4, AC-7)
@@ -69,12 +81,34 @@ async def advance_simulation(request: AdvanceRequest):
     try:
         simulator = get_simulator()
         result = await simulator.advance_simulation(days=request.days)
-        return SimulationResponse(data=result)
+        return {"data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to advance simulation: {str(e)}")
 
 
-@router.get("/status", response_model=SimulationResponse)
+@router.post("/advance/stream")
+async def advance_simulation_stream(request: AdvanceRequest):
+    """
+    Fast-forward simulation by N days, streaming progress (AC-4, AC-7)
+
+    Returns newline-delimited JSON: one "progress" line per generated batch,
+    then a "complete" line with the same summary as /advance. A failure
+    mid-stream is reported as a final "error" line.
+    """
+    simulator = get_simulator()
+
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        try:
+            async for update in simulator.advance_simulation_stream(days=request.days):
+                yield orjson.dumps(update) + b"\n"
+        except Exception as e:
+            logger.error(f"Streaming simulation advance failed: {e}", exc_info=True)
+            yield orjson.dumps({"event": "error", "detail": f"Failed to advance simulation: {str(e)}"}) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/status", response_model=None, responses=_DOCUMENTED_RESPONSE)
 async def get_simulation_status():
     """
     Get current simulation status (AC-4)
@@ -84,21 +118,17 @@ async def get_simulation_status():
     try:
         simulator = get_simulator()
         result = await simulator.get_status()
-        return SimulationResponse(data=result)
+        return {"data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get simulation status: {str(e)}")
 
 
-@router.get("/metrics", response_model=SimulationResponse)
+@router.get("/metrics", response_model=None, responses=_DOCUMENTED_RESPONSE)
 async def get_simulation_metrics():
     """
     Get simulation performance metrics (AC-2)
 
     Returns events_per_second, avg_event_generation_time_ms, etc.
     """
-    # TODO: Implement metrics tracking
-    return SimulationResponse(data={
-        "events_per_second": 0,
-        "avg_event_generation_time_ms": 0,
-        "total_events_generated": 0
-    })
+    simulator = get_simulator()
+    return {"data": simulator.metrics.snapshot()}
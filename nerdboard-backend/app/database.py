@@ -1,6 +1,7 @@
 """Database connection and session management using SQLAlchemy async ORM"""
 import os
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
@@ -19,10 +20,21 @@ if DATABASE_URL.startswith("postgresql://"):
 # Redis Configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+
+def _json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB parameters with orjson, accepting numpy scalars"""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 # Create async SQLAlchemy engine with connection pooling
 # pool_size=20: Keep 20 connections alive in the pool
 # max_overflow=30: Allow 30 additional connections under load (total 50 max)
 # pool_recycle=3600: Recycle connections every hour to prevent stale connections
+# query_cache_size=1200: Headroom in the compiled statement cache so static
+#   route queries are never evicted
+# prepared_statement_cache_size=500: asyncpg per-connection prepared statement
+#   cache, so repeated route queries skip server-side parse/plan
+# json_serializer/json_deserializer: orjson for JSON and JSONB values
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL query logging during development
@@ -30,6 +42,10 @@ engine = create_async_engine(
     max_overflow=30,
     pool_recycle=3600,
     pool_pre_ping=True,  # Verify connection health before using
+    query_cache_size=1200,
+    connect_args={"prepared_statement_cache_size": 500},
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create async session factory
@@ -41,6 +57,17 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Session factory for read-only requests. AUTOCOMMIT shares the same pool but
+# skips the implicit BEGIN and the COMMIT/ROLLBACK on release, so each read
+# is a single round-trip
+ReadOnlySessionLocal = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # Base class for declarative models
 Base = declarative_base()
 
@@ -88,6 +115,25 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only FastAPI endpoints to get database session.
+
+    Unlike get_db() it never commits and runs in AUTOCOMMIT mode, so GET
+    handlers share one session for the whole request without BEGIN or
+    COMMIT/ROLLBACK round-trips. Each statement sees its own snapshot;
+    use get_db() for anything that writes.
+
+    Usage in FastAPI:
+        @app.get("/items")
+        async def read_items(session: AsyncSession = Depends(get_session)):
+            result = await session.execute(select(Item))
+            return result.scalars().all()
+    """
+    async with ReadOnlySessionLocal() as session:
+        yield session
+
+
 def get_redis() -> aioredis.Redis:
     """
     Dependency for FastAPI endpoints to get Redis client.
@@ -0,0 +1,205 @@
+"""
+Compact Random Forest Inference
+
+Packs a fitted binary RandomForestClassifier into flat float32/int32 node
+arrays and walks them with numba, for shortage probability inference.
+"""
+import logging
+from typing import Optional
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+logger = logging.getLogger(__name__)
+
+# Numba is optional dependency - without it predictions stay on sklearn
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# sklearn's marker for "no child" on leaf nodes
+_TREE_LEAF = -1
+
+# Rows per block in the parallel kernel; each block walks every tree
+PARALLEL_BLOCK_ROWS = 256
+
+
+@njit(cache=True)
+def _accumulate_block(
+    rows: np.ndarray,
+    start: int,
+    end: int,
+    roots: np.ndarray,
+    left: np.ndarray,
+    right: np.ndarray,
+    feature: np.ndarray,
+    threshold: np.ndarray,
+    leaf_proba: np.ndarray,
+    out: np.ndarray
+):
+    """
+    Mean positive class probability for rows[start:end] into out.
+
+    Tree-major, so one tree's nodes stay in cache across the block; each
+    row still sums trees in estimator order.
+    """
+    for row in range(start, end):
+        out[row] = 0.0
+    for t in range(roots.shape[0]):
+        root = roots[t]
+        for row in range(start, end):
+            node = root
+            while left[node] != _TREE_LEAF:
+                if rows[row, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            out[row] += leaf_proba[node]
+    for row in range(start, end):
+        out[row] /= roots.shape[0]
+
+
+@njit(cache=True)
+def _forest_positive_proba(rows, roots, left, right, feature, threshold, leaf_proba) -> np.ndarray:
+    """Positive class probability per row, single-threaded"""
+    out = np.empty(rows.shape[0], dtype=np.float64)
+    _accumulate_block(rows, 0, rows.shape[0], roots, left, right, feature, threshold, leaf_proba, out)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _forest_positive_proba_parallel(rows, roots, left, right, feature, threshold, leaf_proba) -> np.ndarray:
+    """Positive class probability per row, parallel over row blocks"""
+    n_rows = rows.shape[0]
+    out = np.empty(n_rows, dtype=np.float64)
+    n_blocks = (n_rows + PARALLEL_BLOCK_ROWS - 1) // PARALLEL_BLOCK_ROWS
+    for block in prange(n_blocks):
+        start = block * PARALLEL_BLOCK_ROWS
+        end = min(start + PARALLEL_BLOCK_ROWS, n_rows)
+        _accumulate_block(rows, start, end, roots, left, right, feature, threshold, leaf_proba, out)
+    return out
+
+
+def _floor_float32(values: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 not above each float64 value.
+
+    For any float32 x, x <= t exactly when x <= _floor_float32(t), so
+    float32 thresholds route float32 inputs like sklearn's float64 ones.
+    """
+    rounded = values.astype(np.float32)
+    over = rounded.astype(np.float64) > values
+    rounded[over] = np.nextafter(rounded[over], np.float32(-np.inf))
+    return rounded
+
+
+class CompactForest:
+    """
+    Read-only copy of a binary random forest for fast inference.
+
+    sklearn keeps 64-byte node records plus float64 class counts per node;
+    this keeps 16 bytes of split data per node (int32 children and feature,
+    float32 threshold) plus one float64 positive class fraction, so tree
+    walks touch a quarter of the memory. Trees are summed in estimator order
+    and divided by the tree count, matching predict_proba with n_jobs=1
+    bit for bit.
+    """
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        leaf_proba: np.ndarray,
+        n_features: int
+    ):
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.leaf_proba = leaf_proba
+        self.n_features = n_features
+
+    @classmethod
+    def from_model(cls, model: object) -> Optional["CompactForest"]:
+        """
+        Pack a fitted model, if it is a binary RandomForestClassifier.
+
+        Args:
+            model: Fitted estimator
+
+        Returns:
+            CompactForest, or None when numba is unavailable or the model
+            is not a fitted single-output binary random forest
+        """
+        if not NUMBA_AVAILABLE or not isinstance(model, RandomForestClassifier):
+            return None
+        if not hasattr(model, "estimators_") or getattr(model, "n_outputs_", 1) != 1:
+            return None
+        if len(model.classes_) != 2:
+            return None
+
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        left = np.concatenate([
+            np.where(tree.children_left == _TREE_LEAF, _TREE_LEAF, tree.children_left + offset)
+            for tree, offset in zip(trees, offsets)
+        ]).astype(np.int32)
+        right = np.concatenate([
+            np.where(tree.children_right == _TREE_LEAF, _TREE_LEAF, tree.children_right + offset)
+            for tree, offset in zip(trees, offsets)
+        ]).astype(np.int32)
+        feature = np.concatenate([tree.feature for tree in trees]).astype(np.int32)
+        threshold = _floor_float32(np.concatenate([tree.threshold for tree in trees]))
+
+        # Per-tree predict_proba normalizes class counts at the leaf, with
+        # an all-zero leaf left as zeros
+        counts = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        normalizer = counts.sum(axis=1)
+        normalizer[normalizer == 0.0] = 1.0
+        leaf_proba = counts[:, 1] / normalizer
+
+        return cls(
+            roots=offsets.astype(np.int32),
+            left=left,
+            right=right,
+            feature=feature,
+            threshold=threshold,
+            leaf_proba=leaf_proba,
+            n_features=model.n_features_in_
+        )
+
+    def predict_positive(self, rows: np.ndarray, parallel: bool = False) -> np.ndarray:
+        """
+        Positive class probability per row.
+
+        Args:
+            rows: float32 (N, n_features) matrix of finite values
+            parallel: Spread rows across cores
+
+        Returns:
+            (N,) probabilities
+        """
+        kernel = _forest_positive_proba_parallel if parallel else _forest_positive_proba
+        return kernel(
+            np.ascontiguousarray(rows, dtype=np.float32),
+            self.roots,
+            self.left,
+            self.right,
+            self.feature,
+            self.threshold,
+            self.leaf_proba
+        )
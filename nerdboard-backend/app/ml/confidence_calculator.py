@@ -7,15 +7,185 @@ Calculates confidence scores for predictions based on multiple factors:
 - Pattern strength (trend R²)
 - Historical accuracy
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import numpy as np
 from sqlalchemy import text
 
-from app.database import AsyncSessionLocal
+from app.database import AsyncSessionLocal, get_redis
 
 logger = logging.getLogger(__name__)
 
+# Numba is optional dependency - kernels run as plain Python if not available
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Component order of the weight vector and component matrices
+COMPONENT_ORDER = ("model_certainty", "data_quality", "pattern_strength", "historical_accuracy")
+
+# Redis TTL (seconds) for historical accuracy and data quality lookups; both
+# only change as predictions and validation runs accumulate
+STATS_CACHE_TTL = 60
+
+# Data quality ignores the subject, so one global entry suffices
+DATA_QUALITY_CACHE_KEY = "conf:dq:global"
+
+# Raw inputs of historical accuracy and data quality. Each lookup is a
+# scalar subquery, so a miss on both is still one round-trip
+_HIST_COUNT_SQL = """
+        (
+            SELECT COUNT(*)
+            FROM predictions
+            WHERE subject = :subject
+        ) AS hist_count"""
+
+_AVG_QUALITY_SQL = """
+        (
+            SELECT AVG(quality_score)
+            FROM (
+                SELECT quality_score
+                FROM data_quality_log
+                WHERE table_name IN ('enrollments', 'sessions', 'tutors')
+                AND validation_time >= NOW() - INTERVAL '24 hours'
+                ORDER BY validation_time DESC
+                LIMIT 10
+            ) recent_quality
+        ) AS avg_quality"""
+
+# Statement per (need count, need quality); data quality is only queried
+# when neither the caller nor Redis supplied it
+_Q_CONFIDENCE_STATS = MappingProxyType({
+    (True, False): text(f"SELECT{_HIST_COUNT_SQL}, NULL AS avg_quality"),
+    (False, True): text(f"SELECT NULL AS hist_count,{_AVG_QUALITY_SQL}"),
+    (True, True): text(f"SELECT{_HIST_COUNT_SQL},{_AVG_QUALITY_SQL}"),
+})
+
+
+@njit(cache=True)
+def _model_certainty_kernel(probability: float) -> float:
+    """Certainty (0-100) from distance of probability to 0.5"""
+    # Distance from 0.5 (uncertainty point)
+    distance_from_midpoint = math.fabs(probability - 0.5)
+
+    # Convert to 0-100 scale
+    # distance_from_midpoint ranges from 0 (uncertain) to 0.5 (certain)
+    return (distance_from_midpoint / 0.5) * 100.0
+
+
+@njit(cache=True)
+def _pattern_strength_kernel(utilization_trend: float, enrollment_velocity: float) -> float:
+    """Pattern strength (0-100) from utilization trend and enrollment velocity"""
+    # Calculate R² equivalent for trend strength
+    # Strong trends have high absolute values
+    # Normalize to 0-100 scale
+
+    # Utilization trend: map [0, 10] to [0, 100]
+    # 10% trend per week is very strong
+    util_strength = min(math.fabs(utilization_trend) * 10.0, 100.0)
+
+    # Enrollment velocity: map [0, 0.5] to [0, 100]
+    # 50% velocity change is very strong
+    enroll_strength = min(math.fabs(enrollment_velocity) * 200.0, 100.0)
+
+    # Average of both
+    return 0.5 * (util_strength + enroll_strength)
+
+
+@njit(cache=True, parallel=True)
+def _pattern_strength_batch_kernel(utilization_trends: np.ndarray, enrollment_velocities: np.ndarray) -> np.ndarray:
+    """Pattern strength for many predictions, parallel over rows"""
+    n = utilization_trends.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        out[i] = _pattern_strength_kernel(utilization_trends[i], enrollment_velocities[i])
+    return out
+
+
+def _historical_accuracy_from_count(count: int) -> float:
+    """
+    Map a subject's prediction count to a historical accuracy score.
+
+    In MVP, this is a placeholder. In production, would analyze
+    past predictions vs actual outcomes.
+
+    Args:
+        count: Number of past predictions for the subject
+
+    Returns:
+        Historical accuracy score (0-100)
+    """
+    # If we have history, use moderate confidence
+    # If new subject, use lower confidence
+    if count > 10:
+        return 75.0  # Moderate historical confidence
+    elif count > 0:
+        return 60.0  # Some history
+    else:
+        return 50.0  # No history, neutral
+
+
+def _data_quality_from_average(avg_quality: Optional[float]) -> float:
+    """
+    Map the recent average validation score to a data quality score.
+
+    Args:
+        avg_quality: Average of recent data_quality_log scores, or None
+
+    Returns:
+        Data quality score (0-100)
+    """
+    if avg_quality:
+        return float(avg_quality)
+    # Default to high quality if no quality data
+    return 90.0
+
+
+@dataclass(slots=True)
+class ConfidenceResult:
+    """Unrounded confidence score and component breakdown for one prediction"""
+
+    score: float
+    level: str
+    model_certainty: float
+    data_quality: float
+    pattern_strength: float
+    historical_accuracy: float
+    is_uncertain: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Format as the API confidence payload.
+
+        Returns:
+            Dictionary with rounded confidence score and breakdown
+        """
+        return {
+            "confidence_score": round(self.score, 2),
+            "confidence_level": self.level,
+            "breakdown": {
+                "model_certainty": round(self.model_certainty, 2),
+                "data_quality": round(self.data_quality, 2),
+                "pattern_strength": round(self.pattern_strength, 2),
+                "historical_accuracy": round(self.historical_accuracy, 2)
+            },
+            "is_uncertain": self.is_uncertain
+        }
+
 
 class ConfidenceCalculator:
     """
@@ -31,6 +201,7 @@ class ConfidenceCalculator:
             "pattern_strength": 0.20,
             "historical_accuracy": 0.15
         }
+        self._weight_vec = np.array([self.weights[name] for name in COMPONENT_ORDER], dtype=np.float64)
 
         # Confidence thresholds
         self.low_confidence_threshold = 60.0
@@ -58,19 +229,101 @@ class ConfidenceCalculator:
         # Calculate individual components
         model_certainty = self._calculate_model_certainty(shortage_probability)
         pattern_strength = self._calculate_pattern_strength(features)
-        historical_accuracy = await self._calculate_historical_accuracy(subject)
-
-        if data_quality_score is None:
-            data_quality_score = await self._get_data_quality_score(subject)
+        historical_accuracy, data_quality_score = await self._get_database_scores(
+            subject, data_quality_score
+        )
 
         # Weighted combination
-        confidence_score = (
-            self.weights["model_certainty"] * model_certainty +
-            self.weights["data_quality"] * data_quality_score +
-            self.weights["pattern_strength"] * pattern_strength +
-            self.weights["historical_accuracy"] * historical_accuracy
+        components = np.array(
+            [model_certainty, data_quality_score, pattern_strength, historical_accuracy],
+            dtype=np.float64
         )
+        confidence_score = float(self._weight_vec @ components)
+
+        return self._build_result(
+            confidence_score,
+            model_certainty,
+            data_quality_score,
+            pattern_strength,
+            historical_accuracy
+        ).to_dict()
+
+    async def batch_calculate_confidence(
+        self,
+        subjects: Sequence[str],
+        probabilities: Sequence[float],
+        features_list: Sequence[Dict[str, float]],
+        data_quality_score: Optional[float] = None
+    ) -> List[ConfidenceResult]:
+        """
+        Calculate confidence scores for many predictions at once.
+
+        Model certainty and pattern strength are computed as arrays, and the
+        database-backed scores are looked up once per distinct subject.
+
+        Args:
+            subjects: Subject name per prediction
+            probabilities: Shortage probability (0-1) per prediction
+            features_list: Feature dictionary per prediction
+            data_quality_score: Optional pre-calculated data quality (0-100)
+
+        Returns:
+            ConfidenceResult per prediction, in input order
+        """
+        if not subjects:
+            return []
+
+        probs = np.asarray(probabilities, dtype=np.float64)
+        model_certainty = np.abs(probs - 0.5) / 0.5 * 100.0
+        pattern_strength = self._calculate_pattern_strength_batch(list(features_list))
 
+        database_scores = {}
+        for subject in dict.fromkeys(subjects):
+            database_scores[subject] = await self._get_database_scores(subject, data_quality_score)
+
+        historical_accuracy = np.fromiter(
+            (database_scores[subject][0] for subject in subjects), dtype=np.float64, count=len(subjects)
+        )
+        data_quality = np.fromiter(
+            (database_scores[subject][1] for subject in subjects), dtype=np.float64, count=len(subjects)
+        )
+
+        # (N, 4) components in COMPONENT_ORDER, weighted in one matrix-vector product
+        components = np.column_stack((model_certainty, data_quality, pattern_strength, historical_accuracy))
+        confidence_scores = components @ self._weight_vec
+
+        return [
+            self._build_result(*values)
+            for values in zip(
+                confidence_scores.tolist(),
+                model_certainty.tolist(),
+                data_quality.tolist(),
+                pattern_strength.tolist(),
+                historical_accuracy.tolist()
+            )
+        ]
+
+    def _build_result(
+        self,
+        confidence_score: float,
+        model_certainty: float,
+        data_quality_score: float,
+        pattern_strength: float,
+        historical_accuracy: float
+    ) -> ConfidenceResult:
+        """
+        Classify a weighted score and bundle it with its components.
+
+        Args:
+            confidence_score: Weighted confidence score (0-100)
+            model_certainty: Model certainty component (0-100)
+            data_quality_score: Data quality component (0-100)
+            pattern_strength: Pattern strength component (0-100)
+            historical_accuracy: Historical accuracy component (0-100)
+
+        Returns:
+            ConfidenceResult with confidence level
+        """
         # Determine confidence level
         if confidence_score >= self.high_confidence_threshold:
             confidence_level = "high"
@@ -79,17 +332,15 @@ class ConfidenceCalculator:
         else:
             confidence_level = "low"
 
-        return {
-            "confidence_score": round(confidence_score, 2),
-            "confidence_level": confidence_level,
-            "breakdown": {
-                "model_certainty": round(model_certainty, 2),
-                "data_quality": round(data_quality_score, 2),
-                "pattern_strength": round(pattern_strength, 2),
-                "historical_accuracy": round(historical_accuracy, 2)
-            },
-            "is_uncertain": confidence_score < self.low_confidence_threshold
-        }
+        return ConfidenceResult(
+            score=confidence_score,
+            level=confidence_level,
+            model_certainty=model_certainty,
+            data_quality=data_quality_score,
+            pattern_strength=pattern_strength,
+            historical_accuracy=historical_accuracy,
+            is_uncertain=confidence_score < self.low_confidence_threshold
+        )
 
     def _calculate_model_certainty(self, probability: float) -> float:
         """
@@ -104,14 +355,7 @@ class ConfidenceCalculator:
         Returns:
             Certainty score (0-100)
         """
-        # Distance from 0.5 (uncertainty point)
-        distance_from_midpoint = abs(probability - 0.5)
-
-        # Convert to 0-100 scale
-        # distance_from_midpoint ranges from 0 (uncertain) to 0.5 (certain)
-        certainty = (distance_from_midpoint / 0.5) * 100
-
-        return certainty
+        return _model_certainty_kernel(float(probability))
 
     def _calculate_pattern_strength(self, features: Dict[str, float]) -> float:
         """
@@ -125,97 +369,120 @@ class ConfidenceCalculator:
         Returns:
             Pattern strength score (0-100)
         """
-        # Get utilization trend strength
-        utilization_trend = abs(features.get("utilization_trend", 0))
-
-        # Get enrollment velocity magnitude
-        enrollment_velocity = abs(features.get("enrollment_velocity", 0))
-
-        # Calculate R² equivalent for trend strength
-        # Strong trends have high absolute values
-        # Normalize to 0-100 scale
-
-        # Utilization trend: map [0, 10] to [0, 100]
-        # 10% trend per week is very strong
-        util_strength = min(abs(utilization_trend) * 10, 100)
+        # Magnitudes are taken inside the kernel
+        return _pattern_strength_kernel(
+            float(features.get("utilization_trend", 0.0)),
+            float(features.get("enrollment_velocity", 0.0))
+        )
 
-        # Enrollment velocity: map [0, 0.5] to [0, 100]
-        # 50% velocity change is very strong
-        enroll_strength = min(abs(enrollment_velocity) * 200, 100)
+    def _calculate_pattern_strength_batch(self, features_list: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Calculate pattern strength for many predictions at once.
 
-        # Average of both
-        pattern_strength = (util_strength + enroll_strength) / 2
+        Args:
+            features_list: Feature dictionaries, one per prediction
 
-        return pattern_strength
+        Returns:
+            Array of pattern strength scores (0-100), in input order
+        """
+        utilization_trends = np.fromiter(
+            (features.get("utilization_trend", 0.0) for features in features_list),
+            dtype=np.float64,
+            count=len(features_list)
+        )
+        enrollment_velocities = np.fromiter(
+            (features.get("enrollment_velocity", 0.0) for features in features_list),
+            dtype=np.float64,
+            count=len(features_list)
+        )
+        return _pattern_strength_batch_kernel(utilization_trends, enrollment_velocities)
 
-    async def _calculate_historical_accuracy(self, subject: str) -> float:
+    async def _get_database_scores(
+        self,
+        subject: str,
+        data_quality_score: Optional[float] = None
+    ) -> Tuple[float, float]:
         """
-        Calculate historical accuracy of predictions for this subject.
+        Get historical accuracy and data quality from Redis or a single query.
 
-        In MVP, this is a placeholder. In production, would analyze
-        past predictions vs actual outcomes.
+        Both cached scores are read with one MGET. On a miss, one query on one
+        pooled connection returns the inputs of whichever scores are still
+        missing, and those are cached for STATS_CACHE_TTL seconds. Falls back to the query alone
+        when Redis is not initialized or unavailable.
 
         Args:
             subject: Subject name
+            data_quality_score: Optional pre-calculated data quality (0-100)
 
         Returns:
-            Historical accuracy score (0-100)
+            Tuple of (historical_accuracy, data_quality_score)
         """
-        # Placeholder: Return baseline accuracy
-        # In production, would query past predictions and outcomes
+        hist_key = f"conf:hist_acc:{subject}"
+        cached = [None, None]
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                cached = await redis.mget([hist_key, DATA_QUALITY_CACHE_KEY])
+            except Exception as e:
+                logger.warning(f"Redis read failed for confidence stats: {e}")
+                redis = None
+
+        historical_accuracy = float(cached[0]) if cached[0] is not None else None
+        if data_quality_score is None and cached[1] is not None:
+            data_quality_score = float(cached[1])
+
+        if historical_accuracy is not None and data_quality_score is not None:
+            return historical_accuracy, data_quality_score
+
+        hist_count, avg_quality = await self._query_database_stats(
+            subject,
+            need_count=historical_accuracy is None,
+            need_quality=data_quality_score is None
+        )
 
-        async with AsyncSessionLocal() as session:
-            # Check if we have historical predictions for this subject
-            query = text("""
-                SELECT COUNT(*) as count
-                FROM predictions
-                WHERE subject = :subject
-            """)
-            result = await session.execute(query, {"subject": subject})
-            count = result.fetchone().count
-
-            # If we have history, use moderate confidence
-            # If new subject, use lower confidence
-            if count > 10:
-                return 75.0  # Moderate historical confidence
-            elif count > 0:
-                return 60.0  # Some history
-            else:
-                return 50.0  # No history, neutral
-
-    async def _get_data_quality_score(self, subject: str) -> float:
-        """
-        Get data quality score for this subject.
-
-        Retrieves from data_quality_log or returns default.
+        to_cache = {}
+        if historical_accuracy is None:
+            historical_accuracy = _historical_accuracy_from_count(hist_count)
+            to_cache[hist_key] = historical_accuracy
+        if data_quality_score is None:
+            data_quality_score = _data_quality_from_average(avg_quality)
+            to_cache[DATA_QUALITY_CACHE_KEY] = data_quality_score
+
+        if redis is not None:
+            try:
+                # Cache writes are independent, so overlap them
+                await asyncio.gather(*(
+                    redis.setex(key, STATS_CACHE_TTL, str(value))
+                    for key, value in to_cache.items()
+                ))
+            except Exception as e:
+                logger.warning(f"Redis write failed for confidence stats: {e}")
+
+        return historical_accuracy, data_quality_score
+
+    async def _query_database_stats(
+        self,
+        subject: str,
+        need_count: bool = True,
+        need_quality: bool = True
+    ) -> Tuple[Optional[int], Optional[float]]:
+        """
+        Fetch the subject's prediction count and/or recent average data quality.
 
         Args:
             subject: Subject name
+            need_count: Whether to count the subject's predictions
+            need_quality: Whether to average recent data quality scores
 
         Returns:
-            Data quality score (0-100)
+            Tuple of (prediction count, average quality score); values not
+            requested, and a quality average without data, are None
         """
         async with AsyncSessionLocal() as session:
-            # Get latest quality score from relevant tables
-            query = text("""
-                SELECT AVG(quality_score) as avg_quality
-                FROM (
-                    SELECT quality_score
-                    FROM data_quality_log
-                    WHERE table_name IN ('enrollments', 'sessions', 'tutors')
-                    AND validation_time >= NOW() - INTERVAL '24 hours'
-                    ORDER BY validation_time DESC
-                    LIMIT 10
-                ) recent_quality
-            """)
-            result = await session.execute(query)
+            result = await session.execute(_Q_CONFIDENCE_STATS[need_count, need_quality], {"subject": subject})
             row = result.fetchone()
-
-            if row and row.avg_quality:
-                return float(row.avg_quality)
-            else:
-                # Default to high quality if no quality data
-                return 90.0
+            return row.hist_count, row.avg_quality
 
     def get_confidence_tag(self, confidence_score: float) -> str:
         """
@@ -236,12 +503,10 @@ class ConfidenceCalculator:
 
 
 # Singleton instance
-_confidence_calculator_instance = None
+# (created at import; construction is pure in-memory setup)
+_confidence_calculator_instance = ConfidenceCalculator()
 
 
 def get_confidence_calculator() -> ConfidenceCalculator:
     """Get singleton ConfidenceCalculator instance"""
-    global _confidence_calculator_instance
-    if _confidence_calculator_instance is None:
-        _confidence_calculator_instance = ConfidenceCalculator()
     return _confidence_calculator_instance
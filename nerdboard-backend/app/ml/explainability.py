@@ -5,8 +5,8 @@ Generates SHAP values for model predictions to provide explanations.
 Maps feature importance to human-readable descriptions.
 """
 import logging
-from typing import Dict, Any, List, Optional
-import pandas as pd
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,193 @@ except ImportError:
     SHAP_AVAILABLE = False
     logger.warning("SHAP library not available. Falling back to feature importance.")
 
+# Numba is optional dependency - top-N kernel runs as plain Python if not available
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, parallel=True)
+def _top_n_abs(sv: np.ndarray, top_n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-N features by absolute SHAP value for every row, parallel over rows.
+
+    Uses a partial selection sort per row, which beats argpartition plus
+    argsort for the small top_n used in explanations. Ties keep the lower
+    feature index first.
+
+    Args:
+        sv: SHAP values, shape (rows, features)
+        top_n: Number of features per row (at most the feature count)
+
+    Returns:
+        Tuple of (indices, magnitudes), each shaped (rows, top_n) and
+        ordered by descending magnitude
+    """
+    n_rows, n_features = sv.shape
+    indices = np.empty((n_rows, top_n), dtype=np.int64)
+    values = np.empty((n_rows, top_n), dtype=np.float64)
+    for row in prange(n_rows):
+        taken = np.zeros(n_features, dtype=np.bool_)
+        for j in range(top_n):
+            best = -1
+            best_value = 0.0
+            for i in range(n_features):
+                if taken[i]:
+                    continue
+                magnitude = abs(sv[row, i])
+                if best == -1 or magnitude > best_value:
+                    best = i
+                    best_value = magnitude
+            taken[best] = True
+            indices[row, j] = best
+            values[row, j] = best_value
+    return indices, values
+
+
+# Rows in the warmup batch SHAP runs at init, matching typical batch sizes
+SHAP_WARMUP_BATCH_SIZE = 32
+
+
+# Readable description formatters: (feature_value, impact) -> text, or None
+# to fall through to the next matching rule
+
+
+def _describe_enrollment_velocity(feature_value: float, impact: str) -> Optional[str]:
+    """Week-over-week enrollment change"""
+    if feature_value > 0:
+        return f"Enrollment spike detected: +{feature_value*100:.1f}% week-over-week ({impact} shortage risk)"
+    return f"Enrollment decline: {feature_value*100:.1f}% week-over-week ({impact} shortage risk)"
+
+
+def _describe_utilization_trend(feature_value: float, impact: str) -> Optional[str]:
+    """Weekly utilization trend"""
+    if feature_value > 0:
+        return f"Utilization trending upward: +{feature_value:.1f}% per week ({impact} shortage risk)"
+    return f"Utilization declining: {feature_value:.1f}% per week ({impact} shortage risk)"
+
+
+def _describe_current_utilization(feature_value: float, impact: str) -> Optional[str]:
+    """Current week utilization"""
+    return f"Current utilization at {feature_value:.1f}% ({impact} shortage risk)"
+
+
+def _describe_seasonal_factor(feature_value: float, impact: str) -> Optional[str]:
+    """Seasonal demand relative to yearly average"""
+    if feature_value > 1.2:
+        return f"Seasonal spike: {feature_value*100:.0f}% of yearly average ({impact} shortage risk)"
+    elif feature_value < 0.8:
+        return f"Seasonal dip: {feature_value*100:.0f}% of yearly average ({impact} shortage risk)"
+    return f"Normal seasonal pattern ({impact} shortage risk)"
+
+
+def _describe_back_to_school(feature_value: float, impact: str) -> Optional[str]:
+    """Back-to-school flag; falls through when inactive"""
+    if feature_value > 0:
+        return f"Back-to-school season active ({impact} shortage risk)"
+    return None
+
+
+def _describe_summer(feature_value: float, impact: str) -> Optional[str]:
+    """Summer flag; falls through when inactive"""
+    if feature_value > 0:
+        return f"Summer season (typically lower demand) ({impact} shortage risk)"
+    return None
+
+
+def _describe_tutor_count(feature_value: float, impact: str) -> Optional[str]:
+    """Available tutors"""
+    return f"Tutor availability: {feature_value:.0f} tutors ({impact} shortage risk)"
+
+
+def _describe_session_rate(feature_value: float, impact: str) -> Optional[str]:
+    """Session booking rate"""
+    return f"Session booking rate: {feature_value:.1f} sessions/day ({impact} shortage risk)"
+
+
+def _describe_enrollment_rate(feature_value: float, impact: str) -> Optional[str]:
+    """Enrollment rate"""
+    return f"Enrollment rate: {feature_value:.1f} students/day ({impact} shortage risk)"
+
+
+def _describe_total_capacity(feature_value: float, impact: str) -> Optional[str]:
+    """Total weekly capacity"""
+    return f"Total capacity: {feature_value:.0f} hours/week ({impact} shortage risk)"
+
+
+DescriptionFormatter = Callable[[float, str], Optional[str]]
+
+# Substring rules in priority order; a feature name matching a rule's
+# substring uses its formatter (first non-None result wins)
+DESCRIPTION_RULES: Tuple[Tuple[str, DescriptionFormatter], ...] = (
+    ("enrollment_velocity", _describe_enrollment_velocity),
+    ("utilization_trend", _describe_utilization_trend),
+    ("utilization_current_week", _describe_current_utilization),
+    ("seasonal_factor", _describe_seasonal_factor),
+    ("is_back_to_school_season", _describe_back_to_school),
+    ("is_summer_season", _describe_summer),
+    ("tutor_count", _describe_tutor_count),
+    ("session_rate", _describe_session_rate),
+    ("enrollment_rate", _describe_enrollment_rate),
+    ("total_capacity_hours", _describe_total_capacity),
+)
+
+
+@lru_cache(maxsize=None)
+def _match_description_rules(feature_name: str) -> Tuple[DescriptionFormatter, ...]:
+    """Formatters whose substring occurs in feature_name, in rule order"""
+    return tuple(formatter for key, formatter in DESCRIPTION_RULES if key in feature_name)
+
+
+@lru_cache(maxsize=4096)
+def _describe(feature_name: str, feature_value: float, impact: str) -> str:
+    """
+    Readable description for a feature value and impact direction.
+
+    Cached per exact value: discrete features (counts, flags, seasonal
+    factors) repeat across predictions, and rounding the key would change
+    the rendered text.
+
+    Args:
+        feature_name: Technical feature name
+        feature_value: Feature value
+        impact: "increasing" or "decreasing"
+
+    Returns:
+        Human-readable description
+    """
+    for formatter in _match_description_rules(feature_name):
+        description = formatter(feature_value, impact)
+        if description is not None:
+            return description
+
+    # Generic description
+    return f"{feature_name.replace('_', ' ').title()}: {feature_value:.2f} ({impact} shortage risk)"
+
+
+def _positive_class_from_list(shap_values: List[np.ndarray]) -> np.ndarray:
+    """Positive class (shortage) SHAP values from per-class list output"""
+    return shap_values[1]
+
+
+def _positive_class_from_last_axis(shap_values: np.ndarray) -> np.ndarray:
+    """Positive class (shortage) SHAP values from (rows, features, classes) output"""
+    return shap_values[..., 1]
+
+
+def _single_output(shap_values: np.ndarray) -> np.ndarray:
+    """SHAP values of a single-output model, already (rows, features)"""
+    return shap_values
+
 
 class ExplainabilityEngine:
     """
@@ -38,16 +225,64 @@ class ExplainabilityEngine:
         self.model = model
         self.feature_columns = feature_columns
         self.explainer = None
-
-        if SHAP_AVAILABLE and model is not None:
+        self._extract_positive: Callable[[Any], np.ndarray] = _single_output
+
+        # Column order fixed once so feature dicts map straight into vectors
+        self._col_tuple = tuple(feature_columns or ())
+        self._n_cols = len(self._col_tuple)
+
+        # SHAP's tree extension does not bounds-check input width, so a column
+        # list that disagrees with the fitted model must never reach it
+        n_model_features = getattr(model, "n_features_in_", self._n_cols)
+        if SHAP_AVAILABLE and model is not None and n_model_features != self._n_cols:
+            logger.warning(
+                f"Model expects {n_model_features} features but {self._n_cols} columns were given; "
+                "falling back to feature importance"
+            )
+        elif SHAP_AVAILABLE and model is not None:
             try:
                 # Use TreeExplainer for tree-based models
                 self.explainer = shap.TreeExplainer(model)
+                self._extract_positive = self._detect_output_extractor()
                 logger.info("SHAP TreeExplainer initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize SHAP explainer: {e}")
                 self.explainer = None
 
+        if self.explainer is not None:
+            self._warm_up()
+
+    def _detect_output_extractor(self) -> Callable[[Any], np.ndarray]:
+        """
+        Probe the explainer once to pick how positive class values are read.
+
+        The SHAP output layout is fixed per model, so it is resolved here
+        instead of type-checking every explanation.
+
+        Returns:
+            Function mapping raw shap_values output to a (rows, features) array
+        """
+        out = self.explainer.shap_values(np.zeros((1, self._n_cols), dtype=np.float64))
+
+        # For binary classification, use positive class SHAP values
+        if isinstance(out, list):
+            return _positive_class_from_list
+        if np.ndim(out) == 3:
+            return _positive_class_from_last_axis
+        return _single_output
+
+    def _warm_up(self):
+        """
+        Run one batch through SHAP so the first real request does not pay
+        its lazy initialization cost.
+
+        The single-row path is already primed by _detect_output_extractor.
+        """
+        try:
+            self.explainer.shap_values(np.zeros((SHAP_WARMUP_BATCH_SIZE, self._n_cols), dtype=np.float64))
+        except Exception as e:
+            logger.warning(f"SHAP warmup failed: {e}")
+
     def explain_prediction(
         self,
         features: Dict[str, float],
@@ -68,55 +303,113 @@ class ExplainabilityEngine:
         else:
             return self._explain_with_feature_importance(features, top_n)
 
-    def _explain_with_shap(
+    def explain_predictions_batch(
         self,
-        features: Dict[str, float],
-        top_n: int
-    ) -> List[Dict[str, Any]]:
-        """Generate explanation using SHAP values"""
+        features_list: List[Dict[str, float]],
+        top_n: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Generate SHAP-based explanations for many predictions at once.
+
+        Stacks all feature rows into one matrix so SHAP runs a single
+        vectorized call, then selects every row's top features in one
+        parallel compiled kernel.
+
+        Args:
+            features_list: Feature dictionaries, one per prediction
+            top_n: Number of top features to return per prediction
+
+        Returns:
+            One list of top contributing features per input, in input order
+        """
+        if not features_list:
+            return []
+
+        if self.explainer is None or not SHAP_AVAILABLE:
+            return [self._explain_with_feature_importance(features, top_n) for features in features_list]
+
         try:
-            # Convert features to DataFrame
-            feature_df = pd.DataFrame([features])
+            feature_matrix = np.empty((len(features_list), self._n_cols), dtype=np.float64)
+            for row, features in enumerate(features_list):
+                feature_matrix[row] = self._feature_vector(features)
 
-            # Ensure all expected columns present
-            for col in self.feature_columns:
-                if col not in feature_df.columns:
-                    feature_df[col] = 0.0
+            shap_values = self._extract_positive(self.explainer.shap_values(feature_matrix))
 
-            feature_df = feature_df[self.feature_columns]
+            return self._select_top_features(np.asarray(shap_values), feature_matrix, top_n)
 
-            # Calculate SHAP values
-            shap_values = self.explainer.shap_values(feature_df)
+        except Exception as e:
+            logger.error(f"Batch SHAP explanation failed: {e}", exc_info=True)
+            return [self._explain_with_feature_importance(features, top_n) for features in features_list]
+
+    def _feature_vector(self, features: Dict[str, float]) -> np.ndarray:
+        """
+        Map a feature dict onto a vector in model column order.
+
+        Args:
+            features: Feature dictionary; missing features default to 0
+
+        Returns:
+            float64 array of length len(feature_columns)
+        """
+        get = features.get
+        return np.fromiter((get(col, 0.0) for col in self._col_tuple), dtype=np.float64, count=self._n_cols)
 
-            # For binary classification, use positive class SHAP values
-            if isinstance(shap_values, list):
-                shap_values = shap_values[1]  # Positive class (shortage)
+    def _select_top_features(
+        self,
+        shap_values: np.ndarray,
+        feature_matrix: np.ndarray,
+        top_n: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Build the top-N contribution dicts for each row of a SHAP matrix.
 
-            # Get feature contributions
-            contributions = []
-            for i, col in enumerate(self.feature_columns):
-                shap_value = shap_values[0][i]
-                feature_value = feature_df.iloc[0][col]
+        Args:
+            shap_values: SHAP values, shape (rows, features)
+            feature_matrix: Feature values, shape (rows, features)
+            top_n: Number of top features per row
 
-                contributions.append({
+        Returns:
+            Per-row lists of contributions sorted by absolute SHAP value
+        """
+        n_rows, n_features = shap_values.shape
+        k = min(top_n, n_features)
+        if k <= 0:
+            return [[] for _ in range(n_rows)]
+
+        top_idx, top_magnitudes = _top_n_abs(np.ascontiguousarray(shap_values, dtype=np.float64), k)
+
+        explanations = []
+        for row, indices in enumerate(top_idx):
+            top_features = []
+            for j, i in enumerate(indices):
+                col = self._col_tuple[i]
+                shap_value = float(shap_values[row, i])
+                feature_value = float(feature_matrix[row, i])
+                top_features.append({
                     "feature": col,
-                    "shap_value": float(shap_value),
-                    "feature_value": float(feature_value),
-                    "importance": abs(shap_value)
+                    "shap_value": shap_value,
+                    "feature_value": feature_value,
+                    "importance": float(top_magnitudes[row, j]),
+                    "readable_description": self._get_readable_description(col, feature_value, shap_value)
                 })
+            explanations.append(top_features)
+
+        return explanations
 
-            # Sort by absolute SHAP value and take top N
-            top_features = sorted(contributions, key=lambda x: x["importance"], reverse=True)[:top_n]
+    def _explain_with_shap(
+        self,
+        features: Dict[str, float],
+        top_n: int
+    ) -> List[Dict[str, Any]]:
+        """Generate explanation using SHAP values"""
+        try:
+            # One-row feature matrix in model column order
+            feature_row = self._feature_vector(features).reshape(1, self._n_cols)
 
-            # Add readable descriptions
-            for feature in top_features:
-                feature["readable_description"] = self._get_readable_description(
-                    feature["feature"],
-                    feature["feature_value"],
-                    feature["shap_value"]
-                )
+            # Calculate SHAP values
+            shap_values = self._extract_positive(self.explainer.shap_values(feature_row))
 
-            return top_features
+            return self._select_top_features(np.asarray(shap_values), feature_row, top_n)[0]
 
         except Exception as e:
             logger.error(f"SHAP explanation failed: {e}", exc_info=True)
@@ -143,34 +436,31 @@ class ExplainabilityEngine:
             ]
 
         # Use model's feature importances
-        importances = self.model.feature_importances_
-        contributions = []
-
-        for i, col in enumerate(self.feature_columns):
-            importance = importances[i]
-            feature_value = features.get(col, 0.0)
-
-            # Contribution = importance × feature value
-            contribution = importance * feature_value
-
-            contributions.append({
+        importances = np.asarray(self.model.feature_importances_, dtype=np.float64)[:self._n_cols]
+        feature_values = self._feature_vector(features)
+
+        # Contribution = importance × feature value
+        contributions = importances * feature_values
+
+        # Rank by importance, materializing dicts for the top N only
+        k = min(top_n, self._n_cols)
+        if k <= 0:
+            return []
+        top_idx, top_importances = _top_n_abs(importances.reshape(1, self._n_cols), k)
+
+        top_features = []
+        for i, importance in zip(top_idx[0], top_importances[0]):
+            col = self._col_tuple[i]
+            feature_value = float(feature_values[i])
+            contribution = float(contributions[i])
+            top_features.append({
                 "feature": col,
-                "shap_value": float(contribution),
-                "feature_value": float(feature_value),
-                "importance": float(importance)
+                "shap_value": contribution,
+                "feature_value": feature_value,
+                "importance": float(importance),
+                "readable_description": self._get_readable_description(col, feature_value, contribution)
             })
 
-        # Sort and take top N
-        top_features = sorted(contributions, key=lambda x: x["importance"], reverse=True)[:top_n]
-
-        # Add readable descriptions
-        for feature in top_features:
-            feature["readable_description"] = self._get_readable_description(
-                feature["feature"],
-                feature["feature_value"],
-                feature["shap_value"]
-            )
-
         return top_features
 
     def _get_readable_description(
@@ -193,57 +483,21 @@ class ExplainabilityEngine:
         # Determine impact direction
         impact = "increasing" if shap_value > 0 else "decreasing"
 
-        # Map feature names to readable descriptions
-        if "enrollment_velocity" in feature_name:
-            if feature_value > 0:
-                return f"Enrollment spike detected: +{feature_value*100:.1f}% week-over-week ({impact} shortage risk)"
-            else:
-                return f"Enrollment decline: {feature_value*100:.1f}% week-over-week ({impact} shortage risk)"
-
-        elif "utilization_trend" in feature_name:
-            if feature_value > 0:
-                return f"Utilization trending upward: +{feature_value:.1f}% per week ({impact} shortage risk)"
-            else:
-                return f"Utilization declining: {feature_value:.1f}% per week ({impact} shortage risk)"
-
-        elif "utilization_current_week" in feature_name:
-            return f"Current utilization at {feature_value:.1f}% ({impact} shortage risk)"
+        return _describe(feature_name, float(feature_value), impact)
 
-        elif "seasonal_factor" in feature_name:
-            if feature_value > 1.2:
-                return f"Seasonal spike: {feature_value*100:.0f}% of yearly average ({impact} shortage risk)"
-            elif feature_value < 0.8:
-                return f"Seasonal dip: {feature_value*100:.0f}% of yearly average ({impact} shortage risk)"
-            else:
-                return f"Normal seasonal pattern ({impact} shortage risk)"
 
-        elif "is_back_to_school_season" in feature_name and feature_value > 0:
-            return f"Back-to-school season active ({impact} shortage risk)"
-
-        elif "is_summer_season" in feature_name and feature_value > 0:
-            return f"Summer season (typically lower demand) ({impact} shortage risk)"
-
-        elif "tutor_count" in feature_name:
-            return f"Tutor availability: {feature_value:.0f} tutors ({impact} shortage risk)"
-
-        elif "session_rate" in feature_name:
-            return f"Session booking rate: {feature_value:.1f} sessions/day ({impact} shortage risk)"
-
-        elif "enrollment_rate" in feature_name:
-            return f"Enrollment rate: {feature_value:.1f} students/day ({impact} shortage risk)"
-
-        elif "total_capacity_hours" in feature_name:
-            return f"Total capacity: {feature_value:.0f} hours/week ({impact} shortage risk)"
-
-        else:
-            # Generic description
-            return f"{feature_name.replace('_', ' ').title()}: {feature_value:.2f} ({impact} shortage risk)"
+# Engine for the most recent model, reused while the model is unchanged
+_explainability_engine_instance: Optional[ExplainabilityEngine] = None
 
 
 def create_explainability_engine(model, feature_columns: List[str]) -> ExplainabilityEngine:
     """
     Factory function to create ExplainabilityEngine.
 
+    Returns the previous engine when called again with the same model object
+    and columns, so the SHAP explainer and its warmup are not rebuilt for
+    every prediction.
+
     Args:
         model: Trained ML model
         feature_columns: List of feature names
@@ -251,4 +505,8 @@ def create_explainability_engine(model, feature_columns: List[str]) -> Explainab
     Returns:
         ExplainabilityEngine instance
     """
-    return ExplainabilityEngine(model, feature_columns)
+    global _explainability_engine_instance
+    engine = _explainability_engine_instance
+    if engine is None or engine.model is not model or engine._col_tuple != tuple(feature_columns or ()):
+        engine = _explainability_engine_instance = ExplainabilityEngine(model, feature_columns)
+    return engine
@@ -5,11 +5,152 @@ Generates human-readable natural language explanations for predictions.
 Uses templates with dynamic data insertion.
 """
 import logging
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Hashable, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Number of explanation texts kept per generator (least recently used evicted)
+EXPLANATION_CACHE_SIZE = 4096
+
+# Certainty phrases by minimum shortage probability (%), first match wins
+_CERTAINTY: Tuple[Tuple[float, str], ...] = ((70, "will likely"), (50, "may"))
+_LOW_CERTAINTY = "has a low probability to"
+
+_SEVERITY_DESC: Dict[Optional[str], str] = {
+    "low": "minor capacity strain",
+    "medium": "moderate capacity shortage",
+    "high": "severe capacity shortage",
+    None: "capacity shortage",  # Unknown severity
+}
+
+# Timeframe phrases by bucket; {n} is the bucket's day/week/month count
+_TIMEFRAMES: Dict[str, str] = {
+    "week": "within the next week",
+    "days": "in approximately {n} days",
+    "weeks": "in about {n} weeks",
+    "months": "in approximately {n} months",
+}
+
+# Main statement per (certainty, severity, timeframe bucket), rendered with
+# subject, shortage_prob and n
+_MAIN_TEMPLATES: Dict[Tuple[str, Optional[str], str], str] = {
+    (certainty, severity, bucket): (
+        "Based on current trends, {subject} tutoring capacity " + certainty + " experience "
+        + severity_desc + " " + timeframe + " (estimated {shortage_prob:.0f}% probability)."
+    )
+    for certainty in (*(phrase for _, phrase in _CERTAINTY), _LOW_CERTAINTY)
+    for severity, severity_desc in _SEVERITY_DESC.items()
+    for bucket, timeframe in _TIMEFRAMES.items()
+}
+
+_RECOMMENDATIONS: Dict[str, str] = {
+    "urgent": (
+        "⚠️ URGENT: Immediate action recommended. Consider temporary capacity expansion, "
+        "prioritizing existing student commitments, or pausing new enrollments."
+    ),
+    "act": (
+        "Action recommended within the next week. Review tutor availability, "
+        "consider recruiting additional tutors, or adjust enrollment targets."
+    ),
+    "monitor": (
+        "Monitor closely and begin planning capacity adjustments. "
+        "Consider proactive tutor recruitment or redistribution of resources from lower-demand subjects."
+    ),
+    "plan": (
+        "Advance notice allows for strategic planning. Continue monitoring trends "
+        "and consider long-term capacity planning initiatives."
+    ),
+}
+
+# Confidence reasoning phrases; bit i of the reasoning mask selects phrase i
+_REASONING_PHRASES = (
+    "strong statistical correlation",  # model certainty >= 70
+    "high data quality",  # data quality >= 80
+    "clear trend patterns",  # pattern strength >= 70
+)
+
+# Confidence sentence per [level][reasoning mask], rendered with score;
+# level 0/1/2 is limited/moderate/high (score >= 60, >= 80)
+_CONFIDENCE_TEMPLATES: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(
+        "We have " + confidence_desc + " in this prediction ({score:.0f}%) based on "
+        + ", ".join(phrase for bit, phrase in enumerate(_REASONING_PHRASES) if mask >> bit & 1) + "."
+        if mask else "Confidence in this prediction is {score:.0f}%."
+        for mask in range(1 << len(_REASONING_PHRASES))
+    )
+    for confidence_desc in ("limited confidence", "moderate confidence", "high confidence")
+)
+
+# Full explanation: main statement, factors, confidence, historical context
+# (omitted with its separator when empty) and recommendation
+_EXPLANATION_LAYOUT = "{main}\n\n{factors}\n\n{confidence}\n\n{historical}{recommendation}"
+
+_IMPACT_SUFFIXES = (" (increasing shortage risk)", " (decreasing shortage risk)")
+
+
+def _strip_impact_suffix(description: str) -> str:
+    """Remove the technical impact suffix from a readable description"""
+    for suffix in _IMPACT_SUFFIXES:
+        description = description.replace(suffix, "")
+    return description
+
+
+def _seasonal_factor_context(feature: Dict[str, Any]) -> str:
+    """Historical context for an above- or below-normal seasonal factor"""
+    factor = feature.get("feature_value", 1.0)
+    if factor > 1.2:
+        return (
+            f"Current enrollment is {factor*100:.0f}% of the yearly average, "
+            "indicating an above-normal seasonal surge."
+        )
+    elif factor < 0.8:
+        return (
+            f"Current enrollment is {factor*100:.0f}% of the yearly average, "
+            "reflecting a typical seasonal downturn."
+        )
+    return ""
+
+
+_BACK_TO_SCHOOL_CONTEXT = (
+    "This pattern is consistent with historical back-to-school enrollment surges "
+    "typically observed in September and October."
+)
+
+_SUMMER_CONTEXT = (
+    "This forecast accounts for typical summer enrollment patterns, "
+    "which historically show reduced demand during June through August."
+)
+
+# Historical context by seasonal feature name; an empty result means the
+# feature has nothing notable and the next feature is tried
+_SEASONAL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "is_back_to_school_season": lambda feature: _BACK_TO_SCHOOL_CONTEXT,
+    "is_summer_season": lambda feature: _SUMMER_CONTEXT,
+    "seasonal_factor": _seasonal_factor_context,
+}
+
+
+def _timeframe_bucket(days_until: int) -> Tuple[str, int]:
+    """
+    Bucket days until shortage into a timeframe phrase.
+
+    Args:
+        days_until: Days until predicted shortage
+
+    Returns:
+        Tuple of (_TIMEFRAMES key, count rendered into the phrase)
+    """
+    if days_until <= 7:
+        return "week", days_until
+    elif days_until <= 14:
+        return "days", days_until
+    elif days_until <= 30:
+        return "weeks", days_until // 7
+    else:
+        return "months", days_until // 30
+
 
 class ExplanationGenerator:
     """
@@ -18,6 +159,9 @@ class ExplanationGenerator:
     Produces operations-manager-friendly text without technical jargon.
     """
 
+    def __init__(self):
+        self._cache: "OrderedDict[Tuple[Hashable, ...], str]" = OrderedDict()
+
     def generate_explanation(
         self,
         subject: str,
@@ -28,6 +172,10 @@ class ExplanationGenerator:
         """
         Generate complete natural language explanation.
 
+        Identical explanations recur across dashboards and polls, so texts are
+        cached by a signature of exactly what the text depends on: rendered
+        numbers and the thresholds they cross, not the raw floats.
+
         Args:
             subject: Subject name
             prediction: Prediction dictionary
@@ -41,38 +189,93 @@ class ExplanationGenerator:
         shortage_prob = prediction.get("shortage_probability", 0) * 100
         days_until = prediction.get("days_until_shortage", 0)
         severity = prediction.get("severity", "medium")
-        confidence_score = confidence.get("confidence_score", 0)
 
-        # Build explanation sections
-        sections = []
+        # Historical context scans features for seasonal signals; its text is
+        # part of the signature
+        historical_section = self._generate_historical_context(subject, top_features)
 
-        # 1. Main prediction statement
-        main_statement = self._generate_main_statement(
-            subject, shortage_prob, days_until, severity
+        key = self._explanation_signature(
+            subject, shortage_prob, days_until, severity, confidence, top_features, historical_section
         )
-        sections.append(main_statement)
+        try:
+            explanation = self._cache.get(key)
+        except TypeError:
+            # Unhashable input values, build without caching
+            return self._build_explanation(
+                subject, shortage_prob, days_until, severity, confidence, top_features, historical_section
+            )
 
-        # 2. Top contributing factors
-        factors_section = self._generate_factors_section(top_features)
-        sections.append(factors_section)
+        if explanation is not None:
+            self._cache.move_to_end(key)
+            return explanation
 
-        # 3. Confidence reasoning
-        confidence_section = self._generate_confidence_section(confidence)
-        sections.append(confidence_section)
+        explanation = self._build_explanation(
+            subject, shortage_prob, days_until, severity, confidence, top_features, historical_section
+        )
+        self._cache[key] = explanation
+        if len(self._cache) > EXPLANATION_CACHE_SIZE:
+            self._cache.popitem(last=False)
 
-        # 4. Historical context (if available)
-        historical_section = self._generate_historical_context(subject, top_features)
-        if historical_section:
-            sections.append(historical_section)
+        return explanation
 
-        # 5. Recommendation
-        recommendation = self._generate_recommendation(days_until, severity, shortage_prob)
-        sections.append(recommendation)
+    def _explanation_signature(
+        self,
+        subject: str,
+        shortage_prob: float,
+        days_until: int,
+        severity: str,
+        confidence: Dict[str, Any],
+        top_features: List[Dict[str, Any]],
+        historical_section: str
+    ) -> Tuple[Hashable, ...]:
+        """
+        Canonical cache key for an explanation.
 
-        # Combine all sections
-        explanation = "\n\n".join(sections)
+        Floats enter the key only as their rendered text plus the thresholds
+        compared against them, so inputs that produce the same text share an
+        entry.
 
-        return explanation
+        Returns:
+            Hashable signature tuple
+        """
+        confidence_score = confidence.get("confidence_score", 0)
+        breakdown = confidence.get("breakdown", {})
+
+        return (
+            subject,
+            f"{shortage_prob:.0f}",
+            shortage_prob >= 50,
+            shortage_prob >= 70,
+            days_until,
+            severity,
+            tuple(feature.get("readable_description", "Unknown factor") for feature in top_features[:3]),
+            f"{confidence_score:.0f}",
+            confidence_score >= 60,
+            confidence_score >= 80,
+            breakdown.get("model_certainty", 0) >= 70,
+            breakdown.get("data_quality", 0) >= 80,
+            breakdown.get("pattern_strength", 0) >= 70,
+            historical_section,
+        )
+
+    def _build_explanation(
+        self,
+        subject: str,
+        shortage_prob: float,
+        days_until: int,
+        severity: str,
+        confidence: Dict[str, Any],
+        top_features: List[Dict[str, Any]],
+        historical_section: str
+    ) -> str:
+        """Assemble all explanation sections"""
+        return _EXPLANATION_LAYOUT.format(
+            main=self._generate_main_statement(subject, shortage_prob, days_until, severity),
+            factors=self._generate_factors_section(top_features),
+            confidence=self._generate_confidence_section(confidence),
+            historical=historical_section + "\n\n" if historical_section else "",
+            recommendation=self._generate_recommendation(days_until, severity, shortage_prob),
+        )
 
     def _generate_main_statement(
         self,
@@ -82,31 +285,15 @@ class ExplanationGenerator:
         severity: str
     ) -> str:
         """Generate main prediction statement"""
-        if shortage_prob >= 70:
-            certainty = "will likely"
-        elif shortage_prob >= 50:
-            certainty = "may"
-        else:
-            certainty = "has a low probability to"
-
-        severity_desc = {
-            "low": "minor capacity strain",
-            "medium": "moderate capacity shortage",
-            "high": "severe capacity shortage"
-        }.get(severity, "capacity shortage")
-
-        if days_until <= 7:
-            timeframe = "within the next week"
-        elif days_until <= 14:
-            timeframe = f"in approximately {days_until} days"
-        elif days_until <= 30:
-            timeframe = f"in about {days_until // 7} weeks"
-        else:
-            timeframe = f"in approximately {days_until // 30} months"
+        certainty = next(
+            (phrase for threshold, phrase in _CERTAINTY if shortage_prob >= threshold),
+            _LOW_CERTAINTY
+        )
+        severity_key = severity if severity in _SEVERITY_DESC else None
+        bucket, n = _timeframe_bucket(days_until)
 
-        return (
-            f"Based on current trends, {subject} tutoring capacity {certainty} experience "
-            f"{severity_desc} {timeframe} (estimated {shortage_prob:.0f}% probability)."
+        return _MAIN_TEMPLATES[certainty, severity_key, bucket].format(
+            subject=subject, shortage_prob=shortage_prob, n=n
         )
 
     def _generate_factors_section(self, top_features: List[Dict[str, Any]]) -> str:
@@ -114,18 +301,13 @@ class ExplanationGenerator:
         if not top_features:
             return "Key factors contributing to this prediction are being analyzed."
 
-        # Get top 3 most important factors
-        top_3 = top_features[:3]
-
-        factors_text = "This prediction is primarily driven by:\n"
-
-        for i, feature in enumerate(top_3, 1):
-            desc = feature.get("readable_description", "Unknown factor")
-            # Clean up the description to remove technical suffix
-            desc = desc.replace(" (increasing shortage risk)", "").replace(" (decreasing shortage risk)", "")
-            factors_text += f"{i}. {desc}\n"
+        # Top 3 most important factors, without the technical impact suffix
+        factors = "\n".join(
+            f"{i}. {_strip_impact_suffix(feature.get('readable_description', 'Unknown factor'))}"
+            for i, feature in enumerate(top_features[:3], 1)
+        )
 
-        return factors_text.strip()
+        return f"This prediction is primarily driven by:\n{factors}".strip()
 
     def _generate_confidence_section(self, confidence: Dict[str, Any]) -> str:
         """Generate confidence reasoning section"""
@@ -136,32 +318,10 @@ class ExplanationGenerator:
         data_quality = breakdown.get("data_quality", 0)
         pattern_strength = breakdown.get("pattern_strength", 0)
 
-        # Determine confidence description
-        if confidence_score >= 80:
-            confidence_desc = "high confidence"
-        elif confidence_score >= 60:
-            confidence_desc = "moderate confidence"
-        else:
-            confidence_desc = "limited confidence"
-
-        # Build reasoning
-        reasoning_parts = []
-
-        if model_certainty >= 70:
-            reasoning_parts.append("strong statistical correlation")
-        if data_quality >= 80:
-            reasoning_parts.append("high data quality")
-        if pattern_strength >= 70:
-            reasoning_parts.append("clear trend patterns")
-
-        if reasoning_parts:
-            reasoning = ", ".join(reasoning_parts)
-            return (
-                f"We have {confidence_desc} in this prediction ({confidence_score:.0f}%) "
-                f"based on {reasoning}."
-            )
-        else:
-            return f"Confidence in this prediction is {confidence_score:.0f}%."
+        # int() first: numpy bools add as logical OR
+        level = int(confidence_score >= 60) + int(confidence_score >= 80)
+        mask = int(model_certainty >= 70) | int(data_quality >= 80) << 1 | int(pattern_strength >= 70) << 2
+        return _CONFIDENCE_TEMPLATES[level][mask].format(score=confidence_score)
 
     def _generate_historical_context(
         self,
@@ -169,40 +329,13 @@ class ExplanationGenerator:
         top_features: List[Dict[str, Any]]
     ) -> str:
         """Generate historical context section"""
-        # Check for seasonal patterns in features
-        seasonal_features = [f for f in top_features
-                            if "seasonal" in f.get("feature", "").lower()
-                            or "back_to_school" in f.get("feature", "").lower()]
-
-        if not seasonal_features:
-            return ""
-
-        # Extract seasonal information
-        for feature in seasonal_features:
-            feature_name = feature.get("feature", "")
-
-            if "is_back_to_school_season" in feature_name:
-                return (
-                    "This pattern is consistent with historical back-to-school enrollment surges "
-                    "typically observed in September and October."
-                )
-            elif "is_summer_season" in feature_name:
-                return (
-                    "This forecast accounts for typical summer enrollment patterns, "
-                    "which historically show reduced demand during June through August."
-                )
-            elif "seasonal_factor" in feature_name:
-                factor = feature.get("feature_value", 1.0)
-                if factor > 1.2:
-                    return (
-                        f"Current enrollment is {factor*100:.0f}% of the yearly average, "
-                        "indicating an above-normal seasonal surge."
-                    )
-                elif factor < 0.8:
-                    return (
-                        f"Current enrollment is {factor*100:.0f}% of the yearly average, "
-                        "reflecting a typical seasonal downturn."
-                    )
+        # First seasonal feature (in importance order) with notable context
+        for feature in top_features:
+            handler = _SEASONAL_HANDLERS.get(feature.get("feature", ""))
+            if handler is not None:
+                context = handler(feature)
+                if context:
+                    return context
 
         return ""
 
@@ -214,25 +347,15 @@ class ExplanationGenerator:
     ) -> str:
         """Generate actionable recommendation"""
         if days_until <= 7 and severity == "high":
-            return (
-                "⚠️ URGENT: Immediate action recommended. Consider temporary capacity expansion, "
-                "prioritizing existing student commitments, or pausing new enrollments."
-            )
+            key = "urgent"
         elif days_until <= 14 and shortage_prob >= 70:
-            return (
-                "Action recommended within the next week. Review tutor availability, "
-                "consider recruiting additional tutors, or adjust enrollment targets."
-            )
+            key = "act"
         elif days_until <= 30:
-            return (
-                "Monitor closely and begin planning capacity adjustments. "
-                "Consider proactive tutor recruitment or redistribution of resources from lower-demand subjects."
-            )
+            key = "monitor"
         else:
-            return (
-                "Advance notice allows for strategic planning. Continue monitoring trends "
-                "and consider long-term capacity planning initiatives."
-            )
+            key = "plan"
+
+        return _RECOMMENDATIONS[key]
 
 
 # Singleton instance
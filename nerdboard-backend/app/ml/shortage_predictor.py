@@ -6,20 +6,112 @@ Predicts: shortage_probability, predicted_shortage_date, severity.
 """
 import logging
 import os
-import pickle
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 import numpy as np
+import joblib
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 
 from app.database import AsyncSessionLocal
+from app.ml.compact_forest import CompactForest
 
 logger = logging.getLogger(__name__)
 
+# ONNX export and runtime are optional dependencies - the sklearn model is
+# used for inference when either is missing
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    SKL2ONNX_AVAILABLE = True
+except ImportError:
+    SKL2ONNX_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Batches at least this large predict with all cores; smaller inputs stay
+# single-threaded, where joblib dispatch costs more than tree traversal
+PARALLEL_PREDICT_MIN_ROWS = 32
+
+# Rows per server-side cursor fetch when streaming training data
+TRAINING_FETCH_SIZE = 10_000
+
+# Serializes temporary n_jobs changes on the (shared, cached) model
+_N_JOBS_LOCK = threading.Lock()
+
+# Loaded model payloads per model path, with the file's mtime when loaded, so
+# repeated loads in one process reuse the in-memory trees until the file changes
+_MODEL_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# Feature names present in any stored feature document
+_Q_FEATURE_KEYS = text("""
+    SELECT DISTINCT jsonb_object_keys(features_json) AS key
+    FROM prediction_features
+    ORDER BY key
+""")
+
+# Training rows with each row's peak weekly utilization over the following
+# horizon, evaluated per feature row in one round-trip. Features come back
+# as typed float8 columns expanded by jsonb_to_record (record type filled in
+# by _training_rows_query), so no JSON is parsed in Python. The lateral
+# subquery keeps the per-row window (reference_date + 1 day up to + horizon)
+# and the original tutor x session aggregation, so labels match the former
+# one-query-per-row implementation. Tutors are matched with @> so the GIN
+# index on tutors.subjects applies (= ANY cannot use it), and the session
+# side is served by the (subject, scheduled_time) INCLUDE (duration_minutes)
+# covering index.
+_TRAINING_ROWS_SQL = """
+    SELECT
+        future.max_utilization,
+        f.*
+    FROM prediction_features pf
+    CROSS JOIN LATERAL jsonb_to_record(pf.features_json) AS f({record_type})
+    CROSS JOIN LATERAL (
+        SELECT
+            COALESCE(MAX(utilization_rate), 0) as max_utilization
+        FROM (
+            SELECT
+                COALESCE(SUM(s.duration_minutes) / 60.0, 0) /
+                NULLIF(COALESCE(SUM(t.weekly_capacity_hours), 0), 0) as utilization_rate
+            FROM tutors t
+            LEFT JOIN sessions s ON
+                s.subject = pf.subject AND
+                s.scheduled_time >= pf.reference_date + INTERVAL '1 day' AND
+                s.scheduled_time < pf.reference_date + make_interval(days => :horizon_days)
+            WHERE t.subjects @> ARRAY[pf.subject]
+            GROUP BY DATE_TRUNC('week', s.scheduled_time)
+        ) weekly_utils
+    ) future
+    ORDER BY pf.reference_date
+"""
+
+
+@lru_cache(maxsize=16)
+def _training_rows_query(feature_names: Tuple[str, ...]) -> TextClause:
+    """
+    Build (and memoize) the training query for one set of feature names.
+
+    Args:
+        feature_names: Feature keys, in output column order
+
+    Returns:
+        Statement yielding (max_utilization, *features) rows
+    """
+    record_type = ", ".join(
+        '"{}" float8'.format(name.replace('"', '""')) for name in feature_names
+    )
+    return text(_TRAINING_ROWS_SQL.format(record_type=record_type))
+
 
 class ShortagePredictor:
     """
@@ -39,10 +131,22 @@ class ShortagePredictor:
             model_path = "models/shortage_predictor_v1.pkl"
 
         self.model_path = model_path
+        self.onnx_path = os.path.splitext(model_path)[0] + ".onnx"
         self.model = None
+        # onnxruntime session for self.model, when an export is available
+        self._ort = None
+        # (model, importance array, importance dict) for the last model seen
+        self._importance_cache: Optional[Tuple[Any, np.ndarray, Dict[str, float]]] = None
+        # (model, packed float32 forest or None) for the last model seen
+        self._compact_cache: Optional[Tuple[Any, Optional[CompactForest]]] = None
         self.feature_columns = None
         self.shortage_threshold = 0.95  # 95% utilization = shortage
 
+        # Inference row layout: feature name -> model column, plus one reusable
+        # row buffer per thread (see _index_feature_columns)
+        self._col_index: Dict[str, int] = {}
+        self._local = threading.local()
+
         # Prediction horizons (in weeks)
         self.horizons = {
             "2week": 14,
@@ -52,17 +156,115 @@ class ShortagePredictor:
         }
 
     def load_model(self):
-        """Load trained model from disk"""
+        """
+        Load trained model from disk.
+
+        Loads are cached per path until the file's mtime changes, so
+        repeated loads in one process reuse the same model. Models saved
+        with plain pickle still load.
+
+        If onnxruntime is installed and an ONNX export at least as new as
+        the model file exists, it is opened as the fallback for when the
+        packed forest is unavailable.
+        """
+        self._ort = None
         if os.path.exists(self.model_path):
-            with open(self.model_path, 'rb') as f:
-                model_data = pickle.load(f)
-                self.model = model_data['model']
-                self.feature_columns = model_data['feature_columns']
+            mtime_ns = os.stat(self.model_path).st_mtime_ns
+            cached = _MODEL_CACHE.get(self.model_path)
+            if cached is not None and cached[0] == mtime_ns:
+                model_data = cached[1]
+            else:
+                model_data = joblib.load(self.model_path)
+                _MODEL_CACHE[self.model_path] = (mtime_ns, model_data)
+            self.model = model_data['model']
+            self.feature_columns = model_data['feature_columns']
+            self._index_feature_columns()
+            self._use_single_thread_inference()
+            self._load_onnx_session(mtime_ns)
             logger.info(f"Loaded model from {self.model_path}")
         else:
             logger.warning(f"Model file not found: {self.model_path}")
             self.model = None
 
+    def _load_onnx_session(self, model_mtime_ns: int):
+        """
+        Open the ONNX export of the loaded model, if usable.
+
+        Args:
+            model_mtime_ns: mtime of the model file; older exports are stale
+        """
+        if not ONNXRUNTIME_AVAILABLE or not os.path.exists(self.onnx_path):
+            return
+        if os.stat(self.onnx_path).st_mtime_ns < model_mtime_ns:
+            logger.warning(f"Ignoring stale ONNX export: {self.onnx_path}")
+            return
+        try:
+            self._ort = ort.InferenceSession(self.onnx_path, providers=["CPUExecutionProvider"])
+            logger.info(f"Using ONNX runtime for inference: {self.onnx_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model, using sklearn: {e}")
+            self._ort = None
+
+    def _use_single_thread_inference(self):
+        """Default the model to n_jobs=1; large batches opt in to all cores"""
+        if self.model is not None and hasattr(self.model, "n_jobs"):
+            self.model.n_jobs = 1
+
+    def warmup(self):
+        """
+        Run one prediction on a zero row to page in the tree arrays.
+
+        Also packs the model and loads both compiled forest kernels, so the
+        first large batch does not pay for them.
+        """
+        if self.model is None:
+            return
+        try:
+            row = self._feature_row({})
+            self._predict_proba(row)
+            compact = self._compact_forest()
+            if compact is not None:
+                compact.predict_positive(row, parallel=True)
+        except Exception as e:
+            logger.warning(f"Model warmup failed: {e}")
+
+    def _index_feature_columns(self):
+        """Map feature names to model columns and drop stale row buffers"""
+        self._col_index = {col: i for i, col in enumerate(self.feature_columns or ())}
+        self._local = threading.local()
+
+    def _feature_row(self, features: Dict[str, float]) -> np.ndarray:
+        """
+        Fill this thread's reusable (1, n_features) row from a feature dict.
+
+        Trees compare in float32, so a float32 row predicts identically to
+        the former float64 DataFrame.
+
+        Args:
+            features: Feature dictionary; missing features default to 0,
+                unknown ones are ignored
+
+        Returns:
+            Row buffer in model column order (overwritten by the next call
+            on the same thread)
+        """
+        if len(self._col_index) != len(self.feature_columns):
+            # Model and columns assigned directly rather than loaded or trained
+            self._index_feature_columns()
+
+        row = getattr(self._local, "row_buf", None)
+        if row is None:
+            row = self._local.row_buf = np.zeros((1, len(self._col_index)), dtype=np.float32)
+        else:
+            row.fill(0.0)
+
+        col_index = self._col_index
+        for name, value in features.items():
+            i = col_index.get(name)
+            if i is not None:
+                row[0, i] = value
+        return row
+
     def save_model(self):
         """Save trained model to disk"""
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
@@ -74,11 +276,38 @@ class ShortagePredictor:
             'shortage_threshold': self.shortage_threshold
         }
 
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        joblib.dump(model_data, self.model_path, compress=3)
+        _MODEL_CACHE[self.model_path] = (os.stat(self.model_path).st_mtime_ns, model_data)
 
         logger.info(f"Saved model to {self.model_path}")
 
+        self._export_onnx()
+
+    def _export_onnx(self):
+        """
+        Write the model as ONNX next to the joblib file.
+
+        ZipMap is disabled so the probability output is a plain (N, 2)
+        tensor. Without skl2onnx, or if conversion fails, any previous export
+        is removed so load_model never pairs it with a newer model.
+        """
+        if SKL2ONNX_AVAILABLE:
+            try:
+                onnx_model = convert_sklearn(
+                    self.model,
+                    initial_types=[("X", FloatTensorType([None, len(self.feature_columns)]))],
+                    options={id(self.model): {"zipmap": False}}
+                )
+                with open(self.onnx_path, "wb") as f:
+                    f.write(onnx_model.SerializeToString())
+                logger.info(f"Saved ONNX model to {self.onnx_path}")
+                return
+            except Exception as e:
+                logger.warning(f"ONNX export failed: {e}")
+
+        if os.path.exists(self.onnx_path):
+            os.remove(self.onnx_path)
+
     async def prepare_training_data(
         self,
         horizon_days: int = 14
@@ -94,74 +323,41 @@ class ShortagePredictor:
         """
         logger.info(f"Preparing training data for {horizon_days}-day horizon")
 
+        n = 0
         async with AsyncSessionLocal() as session:
-            # Get features with their reference dates
-            query_features = text("""
-                SELECT
-                    subject,
-                    reference_date,
-                    features_json
-                FROM prediction_features
-                ORDER BY reference_date
-            """)
-            result = await session.execute(query_features)
-            feature_rows = result.fetchall()
-
-            training_data = []
-
-            for row in feature_rows:
-                subject = row.subject
-                reference_date = row.reference_date
-                features = row.features_json
-
-                # Look ahead to see if shortage occurred
-                future_date_start = reference_date + timedelta(days=1)
-                future_date_end = reference_date + timedelta(days=horizon_days)
-
-                # Check if utilization exceeded threshold in the horizon
-                query_shortage = text("""
-                    SELECT
-                        COALESCE(MAX(utilization_rate), 0) as max_utilization
-                    FROM (
-                        SELECT
-                            COALESCE(SUM(s.duration_minutes) / 60.0, 0) /
-                            NULLIF(COALESCE(SUM(t.weekly_capacity_hours), 0), 0) as utilization_rate
-                        FROM tutors t
-                        LEFT JOIN sessions s ON
-                            s.subject = :subject AND
-                            s.scheduled_time >= :start_date AND
-                            s.scheduled_time < :end_date
-                        WHERE :subject = ANY(t.subjects)
-                        GROUP BY DATE_TRUNC('week', s.scheduled_time)
-                    ) weekly_utils
-                """)
-
-                result_shortage = await session.execute(query_shortage, {
-                    "subject": subject,
-                    "start_date": future_date_start,
-                    "end_date": future_date_end
-                })
-                max_util = result_shortage.fetchone().max_utilization
-
-                # Label: 1 if shortage occurred, 0 otherwise
-                shortage_occurred = 1 if max_util >= self.shortage_threshold else 0
-
-                training_data.append({
-                    **features,
-                    'target': shortage_occurred,
-                    'max_future_utilization': max_util
-                })
-
-        if not training_data:
+            result = await session.execute(_Q_FEATURE_KEYS)
+            feature_names = tuple(row.key for row in result.fetchall())
+            if feature_names:
+                # Typed features with the peak utilization that followed each
+                # reference date, streamed from a server-side cursor so only
+                # one partition of rows is held in Python at a time
+                result = await session.stream(
+                    _training_rows_query(feature_names),
+                    {"horizon_days": horizon_days},
+                    execution_options={"yield_per": TRAINING_FETCH_SIZE}
+                )
+                features = np.empty((TRAINING_FETCH_SIZE, len(feature_names)), dtype=np.float64)
+                targets = np.empty(TRAINING_FETCH_SIZE, dtype=np.int8)
+                async for partition in result.partitions():
+                    # Column 0 is the label source, the rest are features;
+                    # NULL (a document without the key) becomes NaN
+                    block = np.array([tuple(row) for row in partition], dtype=np.float64)
+                    end = n + len(block)
+                    if end > len(targets):
+                        capacity = max(end, 2 * len(targets))
+                        features = np.resize(features, (capacity, len(feature_names)))
+                        targets = np.resize(targets, capacity)
+                    features[n:end] = block[:, 1:]
+                    # Label: 1 if utilization reached the shortage threshold, 0 otherwise
+                    targets[n:end] = block[:, 0] >= self.shortage_threshold
+                    n = end
+
+        if n == 0:
             logger.warning("No training data available")
             return pd.DataFrame(), pd.Series()
 
-        # Convert to DataFrame
-        df = pd.DataFrame(training_data)
-
-        # Separate features and target
-        y = df['target']
-        X = df.drop(columns=['target', 'max_future_utilization'])
+        X = pd.DataFrame(features[:n], columns=list(feature_names), copy=False)
+        y = pd.Series(targets[:n], name="target")
 
         # Store feature columns
         self.feature_columns = X.columns.tolist()
@@ -190,6 +386,16 @@ class ShortagePredictor:
         """
         logger.info("Training Random Forest model...")
 
+        # Fit on a plain matrix in feature_columns order; inference feeds rows
+        # built from the same column index. Frames from prepare_training_data
+        # are already in that order, so only reorder (a full copy) if needed
+        if self.feature_columns is None:
+            self.feature_columns = X.columns.tolist()
+        self._index_feature_columns()
+        if X.columns.tolist() != list(self.feature_columns):
+            X = X[self.feature_columns]
+        X = X.to_numpy(dtype=np.float64)
+
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
@@ -210,10 +416,12 @@ class ShortagePredictor:
             )
             grid_search.fit(X_train, y_train)
             self.model = grid_search.best_estimator_
+            self._ort = None
 
             logger.info(f"Best params: {grid_search.best_params_}")
         else:
             # Use default params for speed
+            self._ort = None
             self.model = RandomForestClassifier(
                 n_estimators=100,
                 max_depth=20,
@@ -238,6 +446,9 @@ class ShortagePredictor:
 
         logger.info(f"Model trained: Accuracy={metrics['accuracy']:.2%}, F1={metrics['f1_score']:.2%}")
 
+        # Training used all cores; single-row inference should not
+        self._use_single_thread_inference()
+
         return metrics
 
     def predict_shortage(
@@ -258,60 +469,213 @@ class ShortagePredictor:
         if self.model is None:
             raise ValueError("Model not loaded. Call load_model() first.")
 
-        # Convert features to DataFrame with correct column order
-        feature_df = pd.DataFrame([features])
+        # Predict
+        shortage_probability = self._predict_proba(self._feature_row(features))[0]
 
-        # Ensure all expected columns are present
-        for col in self.feature_columns:
-            if col not in feature_df.columns:
-                feature_df[col] = 0.0  # Default value for missing features
+        return self._build_predictions(
+            np.array([shortage_probability]), [features], [horizon]
+        )[0]
 
-        # Select only the columns used in training
-        feature_df = feature_df[self.feature_columns]
+    def predict_shortage_batch(
+        self,
+        feature_batch: List[Dict[str, float]],
+        horizons: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict shortage probability for many feature sets in one model call.
 
-        # Predict
-        shortage_probability = self.model.predict_proba(feature_df)[0, 1]
+        Args:
+            feature_batch: Feature dictionaries, one per prediction
+            horizons: Prediction horizon per feature dictionary
+                (2week, 4week, 6week, 8week)
 
-        # Calculate predicted shortage date
-        horizon_days = self.horizons.get(horizon, 14)
-        reference_date = datetime.utcnow()
+        Returns:
+            Prediction dictionaries in input order, as from predict_shortage
+        """
+        if self.model is None:
+            raise ValueError("Model not loaded. Call load_model() first.")
+        if len(feature_batch) != len(horizons):
+            raise ValueError("feature_batch and horizons must have the same length")
+        if not feature_batch:
+            return []
 
-        # Estimate when shortage will occur based on utilization trend
-        current_utilization = features.get('utilization_current_week', 0)
-        utilization_trend = features.get('utilization_trend', 0)
+        if len(self._col_index) != len(self.feature_columns):
+            self._index_feature_columns()
 
-        if utilization_trend > 0:
-            # Calculate days until 95% utilization
-            days_until = (self.shortage_threshold * 100 - current_utilization) / utilization_trend
-            days_until = max(0, min(days_until, horizon_days))
-        else:
-            # Use probability to estimate
-            days_until = horizon_days * (1 - shortage_probability)
+        # One (N, F) matrix in model column order; missing features stay 0
+        rows = np.zeros((len(feature_batch), len(self._col_index)), dtype=np.float32)
+        col_index = self._col_index
+        for r, features in enumerate(feature_batch):
+            for name, value in features.items():
+                i = col_index.get(name)
+                if i is not None:
+                    rows[r, i] = value
 
-        predicted_shortage_date = reference_date + timedelta(days=days_until)
+        probabilities = self._predict_proba(rows)
+
+        return self._build_predictions(probabilities, feature_batch, horizons)
+
+    def _predict_proba(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Shortage (class 1) probability per row.
+
+        Uses the packed float32 forest, which matches sklearn bit for bit.
+        When it is unavailable (no numba, or not a binary random forest)
+        the onnxruntime session is used if loaded, otherwise the sklearn
+        model. skl2onnx rounds thresholds to the nearest float32, so ONNX
+        may route inputs near a split differently from sklearn and is only
+        a fallback. Local paths stay single-threaded below
+        PARALLEL_PREDICT_MIN_ROWS rows.
+
+        Args:
+            rows: float32 (N, n_features) matrix in model column order
+
+        Returns:
+            (N,) probabilities
+        """
+        compact = self._compact_forest()
+        if compact is not None:
+            # Non-finite rows go to sklearn, which rejects them
+            if rows.shape[1] == compact.n_features and np.isfinite(rows).all():
+                return compact.predict_positive(rows, parallel=rows.shape[0] >= PARALLEL_PREDICT_MIN_ROWS)
+        elif self._ort is not None:
+            return self._ort.run(None, {"X": rows})[1][:, 1]
+
+        if rows.shape[0] >= PARALLEL_PREDICT_MIN_ROWS and hasattr(self.model, "n_jobs"):
+            with _N_JOBS_LOCK:
+                self.model.n_jobs = -1
+                try:
+                    return self.model.predict_proba(rows)[:, 1]
+                finally:
+                    self.model.n_jobs = 1
+        return self.model.predict_proba(rows)[:, 1]
+
+    def _build_predictions(
+        self,
+        probabilities: np.ndarray,
+        feature_batch: List[Dict[str, float]],
+        horizons: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Derive shortage timing and severity from model probabilities.
+
+        Args:
+            probabilities: Shortage probability per prediction
+            feature_batch: Feature dictionaries, one per prediction
+            horizons: Prediction horizon per prediction
+
+        Returns:
+            Prediction dictionaries in input order
+        """
+        n = len(feature_batch)
+        horizon_days = np.fromiter(
+            (self.horizons.get(horizon, 14) for horizon in horizons), dtype=np.float64, count=n
+        )
+        reference_date = datetime.utcnow()
+
+        # Estimate when shortage will occur based on utilization trend
+        current_utilization = np.fromiter(
+            (features.get('utilization_current_week', 0) for features in feature_batch), dtype=np.float64, count=n
+        )
+        utilization_trend = np.fromiter(
+            (features.get('utilization_trend', 0) for features in feature_batch), dtype=np.float64, count=n
+        )
+        rising = utilization_trend > 0
+        threshold_pct = self.shortage_threshold * 100
+
+        # Rising trend: days until 95% utilization, capped to the horizon;
+        # otherwise use probability to estimate
+        days_to_threshold = np.divide(
+            threshold_pct - current_utilization,
+            utilization_trend,
+            out=np.zeros(n),
+            where=rising
+        )
+        days_until = np.where(
+            rising,
+            np.clip(days_to_threshold, 0, horizon_days),
+            horizon_days * (1 - probabilities)
+        )
 
         # Calculate severity (how bad the shortage will be)
         predicted_peak_utilization = current_utilization + (utilization_trend * days_until)
-        shortage_amount = max(0, predicted_peak_utilization - (self.shortage_threshold * 100))
-        severity = "low" if shortage_amount < 10 else "medium" if shortage_amount < 20 else "high"
-
-        return {
-            "shortage_probability": float(shortage_probability),
-            "predicted_shortage_date": predicted_shortage_date.isoformat(),
-            "days_until_shortage": int(days_until),
-            "severity": severity,
-            "predicted_peak_utilization": float(predicted_peak_utilization),
-            "horizon": horizon,
-            "horizon_days": horizon_days
-        }
+        shortage_amount = np.maximum(0, predicted_peak_utilization - threshold_pct)
+        severities = np.select(
+            [shortage_amount < 10, shortage_amount < 20], ["low", "medium"], default="high"
+        ).tolist()
+
+        # Bulk-convert to Python scalars; days_until is never negative, so
+        # truncating to int64 matches int()
+        predictions = []
+        for probability, days, whole_days, severity, peak, horizon, days_in_horizon in zip(
+            probabilities.tolist(),
+            days_until.tolist(),
+            days_until.astype(np.int64).tolist(),
+            severities,
+            predicted_peak_utilization.tolist(),
+            horizons,
+            horizon_days.astype(np.int64).tolist()
+        ):
+            predictions.append({
+                "shortage_probability": probability,
+                "predicted_shortage_date": (reference_date + timedelta(days=days)).isoformat(),
+                "days_until_shortage": whole_days,
+                "severity": severity,
+                "predicted_peak_utilization": peak,
+                "horizon": horizon,
+                "horizon_days": days_in_horizon
+            })
+
+        return predictions
+
+    def _compact_forest(self) -> Optional[CompactForest]:
+        """Packed copy of the current model, built once per model object"""
+        cached = self._compact_cache
+        if cached is None or cached[0] is not self.model:
+            cached = self._compact_cache = (self.model, CompactForest.from_model(self.model))
+        return cached[1]
+
+    def _feature_importances(self) -> Optional[Tuple[np.ndarray, Dict[str, float]]]:
+        """
+        Importance array and name -> importance dict for the current model.
 
-    def get_feature_importance(self) -> Dict[str, float]:
-        """Get feature importance scores from trained model"""
+        RandomForestClassifier.feature_importances_ averages every tree on
+        each access, so both forms are computed once per model object and
+        reused until load_model, train_model or an assignment replaces it.
+        """
         if self.model is None or self.feature_columns is None:
-            return {}
+            return None
+
+        cached = self._importance_cache
+        if cached is None or cached[0] is not self.model:
+            importances = np.asarray(self.model.feature_importances_, dtype=np.float64)
+            importances.setflags(write=False)
+            cached = self._importance_cache = (
+                self.model,
+                importances,
+                dict(zip(self.feature_columns, importances.tolist()))
+            )
+        return cached[1], cached[2]
+
+    def get_feature_importance(self) -> Dict[str, float]:
+        """
+        Get feature importance scores from trained model.
 
-        importances = self.model.feature_importances_
-        return dict(zip(self.feature_columns, importances))
+        Returns:
+            Shared feature name -> importance dict (do not mutate)
+        """
+        cached = self._feature_importances()
+        return cached[1] if cached is not None else {}
+
+    def get_feature_importance_array(self) -> np.ndarray:
+        """
+        Get feature importance scores in feature_columns order.
+
+        Returns:
+            Read-only importance array (empty without a trained model)
+        """
+        cached = self._feature_importances()
+        return cached[0] if cached is not None else np.empty(0)
 
 
 # Singleton instance
@@ -324,4 +688,5 @@ def get_shortage_predictor() -> ShortagePredictor:
     if _predictor_instance is None:
         _predictor_instance = ShortagePredictor()
         _predictor_instance.load_model()
+        _predictor_instance.warmup()
     return _predictor_instance
@@ -37,7 +37,11 @@ class HealthMetric(Base):
 
     # Indexes for performance
     __table_args__ = (
-        Index("idx_health_customer_date", "customer_id", "date", postgresql_ops={"date": "DESC"}),
+        # Unique so batch recalculation can upsert one row per customer per day
+        Index("idx_health_customer_date_unique", "customer_id", "date", unique=True),
+        # Rows arrive in date order, so a BRIN index lets date-range scans skip
+        # whole block ranges at a fraction of a btree's size
+        Index("brin_health_date", "date", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
     )
 
     def __repr__(self):
@@ -4,12 +4,16 @@ Prediction Model
 Stores ML predictions for tutor shortage forecasts with confidence scores.
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Enum, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 
 from app.database import Base
 
+# Allowed values of the native prediction_status / prediction_severity enums
+PREDICTION_STATUSES = ("active", "resolved", "expired")
+PREDICTION_SEVERITIES = ("critical", "high", "medium", "low")
+
 
 class Prediction(Base):
     """
@@ -22,7 +26,7 @@ class Prediction(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     prediction_id = Column(String(100), unique=True, nullable=False, index=True)
-    subject = Column(String(100), nullable=False, index=True)
+    subject = Column(String(100), nullable=False)
 
     # Prediction outputs
     shortage_probability = Column(Float, nullable=False)  # 0.0 to 1.0
@@ -33,10 +37,10 @@ class Prediction(Base):
     # Confidence metrics
     confidence_score = Column(Float, nullable=False)  # 0-100
     confidence_level = Column(String(20), nullable=True)  # low/medium/high
-    confidence_breakdown = Column(Text, nullable=True)  # JSON string
+    confidence_breakdown = Column(JSONB, nullable=True)  # Component scores
 
     # Priority and severity
-    severity = Column(String(20), nullable=False)  # critical/high/medium/low
+    severity = Column(Enum(*PREDICTION_SEVERITIES, name="prediction_severity"), nullable=False)
     priority_score = Column(Float, nullable=False)  # 0-100
     is_critical = Column(Boolean, default=False, nullable=False)
 
@@ -45,13 +49,64 @@ class Prediction(Base):
     horizon_days = Column(Integer, nullable=True)
 
     # Status and metadata
-    status = Column(String(20), default="active", nullable=False)  # active/resolved/expired
+    status = Column(Enum(*PREDICTION_STATUSES, name="prediction_status"), default="active", nullable=False)
     explanation_text = Column(Text, nullable=True)
-    shap_values = Column(Text, nullable=True)  # JSON string of SHAP values
+    shap_values = Column(JSONB, nullable=True)  # SHAP values
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default="now()", nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default="now()", onupdate=datetime.utcnow, nullable=False)
 
+    # Indexes for the dashboard's active-prediction queries and keyset
+    # pagination of the predictions list
+    __table_args__ = (
+        # Subject lookups across all statuses (confidence history count)
+        Index("idx_predictions_subject", "subject"),
+        Index(
+            "idx_predictions_subject_active_priority",
+            "subject",
+            priority_score.desc(),
+            postgresql_where=text("status = 'active'"),
+        ),
+        Index(
+            "idx_predictions_active_shortage",
+            "subject",
+            postgresql_include=["shortage_probability"],
+            postgresql_where=text("status = 'active' AND shortage_probability > 0.5"),
+        ),
+        Index(
+            "idx_predictions_active_subject_horizon_created",
+            "subject",
+            "horizon",
+            created_at.desc(),
+            postgresql_where=text("status = 'active'"),
+        ),
+        Index(
+            "idx_predictions_critical_priority",
+            "status",
+            priority_score.desc(),
+            prediction_id.desc(),
+            postgresql_where=text("is_critical"),
+        ),
+        Index(
+            "idx_predictions_status_priority_keyset",
+            "status",
+            priority_score.desc(),
+            prediction_id.desc(),
+        ),
+        Index(
+            "idx_predictions_status_confidence_keyset",
+            "status",
+            confidence_score.desc(),
+            prediction_id.desc(),
+        ),
+        Index(
+            "idx_predictions_status_shortage_date_keyset",
+            "status",
+            predicted_shortage_date.desc().nulls_last(),
+            prediction_id.desc(),
+        ),
+    )
+
     def __repr__(self):
         return f"<Prediction(id={self.prediction_id}, subject={self.subject}, probability={self.shortage_probability})>"
@@ -4,7 +4,8 @@ Prediction Features Model
 Stores extracted time-series features for ML model input.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -21,7 +22,7 @@ class PredictionFeature(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     subject = Column(String(100), nullable=False, index=True)
     reference_date = Column(DateTime, nullable=False, index=True)
-    features_json = Column(JSON, nullable=False)  # All extracted features
+    features_json = Column(JSONB, nullable=False)  # All extracted features (numeric values)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     __table_args__ = (
@@ -34,6 +34,12 @@ class Session(Base):
     # Indexes for performance
     __table_args__ = (
         Index("idx_sessions_subject_time", "subject", "scheduled_time"),
+        Index(
+            "idx_sessions_subject_time_covering",
+            "subject",
+            "scheduled_time",
+            postgresql_include=["duration_minutes"],
+        ),
         Index("idx_sessions_tutor", "tutor_id"),
         Index("idx_sessions_student", "student_id"),
     )
@@ -1,5 +1,5 @@
 """Tutor model - Tutor resource availability and capacity"""
-from sqlalchemy import Column, String, Integer, Float, DateTime, CheckConstraint, Index
+from sqlalchemy import Column, String, Integer, Float, DateTime, CheckConstraint, Computed, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.sql import func
 import uuid
@@ -15,6 +15,7 @@ class Tutor(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tutor_id = Column(String(100), unique=True, nullable=False)
     subjects = Column(ARRAY(String), nullable=False)
+    primary_subject = Column(String(100), Computed("subjects[1]", persisted=True))
     weekly_capacity_hours = Column(Integer, nullable=False)
     utilization_rate = Column(
         Float,
@@ -34,6 +35,11 @@ class Tutor(Base):
     __table_args__ = (
         Index("idx_tutors_subjects", "subjects", postgresql_using="gin"),
         Index("idx_tutors_tutor_id", "tutor_id"),
+        Index(
+            "idx_tutors_primary_subject",
+            "primary_subject",
+            postgresql_include=["weekly_capacity_hours"],
+        ),
     )
 
     def __repr__(self):
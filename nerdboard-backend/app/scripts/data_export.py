@@ -5,12 +5,15 @@ Exports entire dataset to JSON/CSV format for backup and demo scenarios.
 Usage: python -m app.scripts.data_export --output data.json.gz
 """
 import asyncio
-import json
 import gzip
+import io
 import argparse
+import shutil
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from sqlalchemy import text
+from typing import BinaryIO, Tuple
+import orjson
 
 from app.database import AsyncSessionLocal
 
@@ -26,37 +29,120 @@ TABLES_TO_EXPORT = [
 ]
 
 
-async def export_table(table_name: str) -> list:
+# Output buffering: per-row writes are coalesced into 1 MB chunks before
+# they reach gzip or the file. Level 1 compresses several times faster
+# than the default 9 for a modestly larger backup file.
+EXPORT_WRITE_BUFFER = 1 << 20
+GZIP_COMPRESS_LEVEL = 1
+
+# Per-table spool kept in memory up to this size, then moved to a temp file
+EXPORT_SPOOL_SIZE = 8 << 20
+
+# COPY options for JSON lines: row_to_json escapes every control
+# character, so with these as delimiter and quote no row is ever quoted
+# and each output line is exactly one JSON object
+_COPY_JSON_OPTIONS = {"format": "csv", "delimiter": "\x02", "quote": "\x01"}
+
+
+class _JsonArrayWriter:
     """
-    Export all records from a table.
+    COPY output callback writing JSON lines as comma-separated array items.
+
+    Chunks may split or join rows arbitrarily; the separator for a row is
+    only written once its first bytes arrive.
+    """
+
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        self.separator = b"\n"
+
+    async def __call__(self, chunk: bytes):
+        body = chunk[:-1] if chunk.endswith(b"\n") else chunk
+        if body:
+            self.out.write(self.separator)
+            self.out.write(body.replace(b"\n", b",\n"))
+            self.separator = b""
+        if len(body) < len(chunk):
+            self.separator = b",\n"
+
+
+async def copy_table(table_name: str, out: BinaryIO) -> int:
+    """
+    Write all records of a table as JSON array items.
+
+    PostgreSQL renders each row with row_to_json and streams it over the
+    COPY protocol on the pooled connection's asyncpg driver connection, so
+    rows are never decoded into Python values.
 
     Args:
         table_name: Name of table to export
+        out: Binary stream the items are written to
 
     Returns:
-        list: All records as dictionaries
+        int: Number of records written
     """
     async with AsyncSessionLocal() as session:
-        query = text(f"SELECT * FROM {table_name}")
-        result = await session.execute(query)
-
-        # Convert rows to dictionaries
-        columns = result.keys()
-        records = []
-        for row in result.fetchall():
-            record = {}
-            for col, val in zip(columns, row):
-                # Convert non-JSON-serializable types
-                if isinstance(val, datetime):
-                    record[col] = val.isoformat()
-                elif hasattr(val, '__iter__') and not isinstance(val, str):
-                    # Handle arrays
-                    record[col] = list(val) if val else []
-                else:
-                    record[col] = val
-            records.append(record)
-
-        return records
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+
+        status = await driver.copy_from_query(
+            f"SELECT row_to_json(t) FROM {table_name} t",
+            output=_JsonArrayWriter(out),
+            **_COPY_JSON_OPTIONS
+        )
+
+    # Status is "COPY <rows>"
+    return int(status.split()[-1])
+
+
+async def _copy_table_to_spool(table_name: str) -> Tuple[BinaryIO, int]:
+    """Copy a table's items into its own spool file, rewound for reading"""
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+    count = await copy_table(table_name, spool)
+    spool.seek(0)
+    return spool, count
+
+
+async def write_export(out: BinaryIO) -> int:
+    """
+    Write the export document with all tables copied concurrently.
+
+    Each table streams over its own pooled connection into a spool file,
+    so the server scans tables in parallel; the spools are then appended
+    to the document in TABLES_TO_EXPORT order. Metadata follows the data
+    so the record count is known when written; readers load the whole
+    document, so key order does not matter.
+
+    Args:
+        out: Binary stream to write UTF-8 JSON to
+
+    Returns:
+        int: Total records written
+    """
+    print(f"Exporting {len(TABLES_TO_EXPORT)} tables...")
+    spools = await asyncio.gather(*[_copy_table_to_spool(table) for table in TABLES_TO_EXPORT])
+
+    total_records = 0
+    out.write(b'{"data":{')
+    for t, (table, (spool, count)) in enumerate(zip(TABLES_TO_EXPORT, spools)):
+        out.write(b"," if t else b"")
+        out.write(b"\n" + orjson.dumps(table) + b":[")
+        with spool:
+            shutil.copyfileobj(spool, out, EXPORT_WRITE_BUFFER)
+        out.write(b"\n]")
+        total_records += count
+        print(f"  {table}: {count} records")
+
+    metadata = {
+        "export_time": datetime.utcnow().isoformat(),
+        "version": "1.0",
+        "tables": TABLES_TO_EXPORT,
+        "total_records": total_records
+    }
+    out.write(b'\n},"metadata":' + orjson.dumps(metadata) + b"}\n")
+
+    return total_records
 
 
 async def export_all_data(output_file: str, compress: bool = True):
@@ -69,38 +155,14 @@ async def export_all_data(output_file: str, compress: bool = True):
     """
     print(f"Starting data export to {output_file}...")
 
-    # Export all tables
-    data = {}
-    total_records = 0
-
-    for table in TABLES_TO_EXPORT:
-        print(f"Exporting {table}...", end=" ")
-        records = await export_table(table)
-        data[table] = records
-        total_records += len(records)
-        print(f"{len(records)} records")
-
-    # Create export package
-    export_data = {
-        "metadata": {
-            "export_time": datetime.utcnow().isoformat(),
-            "version": "1.0",
-            "tables": TABLES_TO_EXPORT,
-            "total_records": total_records
-        },
-        "data": data
-    }
-
-    # Write to file
-    json_str = json.dumps(export_data, indent=2)
-
     if compress and output_file.endswith(".gz"):
-        with gzip.open(output_file, 'wt', encoding='utf-8') as f:
-            f.write(json_str)
+        with gzip.GzipFile(output_file, 'wb', compresslevel=GZIP_COMPRESS_LEVEL) as gz, \
+                io.BufferedWriter(gz, buffer_size=EXPORT_WRITE_BUFFER) as f:
+            total_records = await write_export(f)
         print(f"\n✓ Export complete: {output_file} (compressed)")
     else:
-        with open(output_file, 'w') as f:
-            f.write(json_str)
+        with open(output_file, 'wb', buffering=EXPORT_WRITE_BUFFER) as f:
+            total_records = await write_export(f)
         print(f"\n✓ Export complete: {output_file}")
 
     # Show file size
@@ -9,51 +9,139 @@ import json
 import gzip
 import argparse
 from datetime import datetime
+from itertools import groupby, islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Tuple
 from sqlalchemy import text
 
 from app.database import AsyncSessionLocal
 
+# ijson is optional dependency - without it the whole file is loaded at once
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# Records per executemany call, each applied atomically
+IMPORT_BATCH_SIZE = 1000
+
+# Tables imported, in dependency order
+IMPORT_ORDER = [
+    "tutors",          # No dependencies
+    "simulation_state", # No dependencies
+    "enrollments",     # No dependencies
+    "sessions",        # Depends on tutors
+    "health_metrics",  # No dependencies
+    "capacity_snapshots", # No dependencies
+    "data_quality_log" # No dependencies
+]
+
+
+def _open_export(input_file: str) -> BinaryIO:
+    """Open an export file for binary reading, decompressing .gz files"""
+    if input_file.endswith(".gz"):
+        return gzip.open(input_file, 'rb')
+    return open(input_file, 'rb')
+
+
+def _read_metadata(input_file: str) -> Dict[str, Any]:
+    """
+    Read only the metadata object of an export file.
+
+    Exports write metadata after the data, so this scans the file once
+    without keeping any records.
+    """
+    with _open_export(input_file) as f:
+        return next(ijson.items(f, "metadata", use_float=True), {})
+
+
+def _stream_records(input_file: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (table, record) for every record under "data", in file order.
+
+    Records are built one at a time from parser events, so memory stays
+    bounded by a single record regardless of file size.
+    """
+    with _open_export(input_file) as f:
+        builder = None
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if event == "end_map" and prefix == record_prefix:
+                    yield table, builder.value
+                    builder = None
+            elif event == "start_map" and prefix.startswith("data.") and prefix.endswith(".item"):
+                table = prefix[len("data."):-len(".item")]
+                if "." not in table:
+                    record_prefix = prefix
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+
+
+async def clear_tables(table_names: list):
+    """
+    Clear all records from the given tables.
+
+    One TRUNCATE covers every table, so foreign keys between them need no
+    ordering and no rows are deleted one by one.
+
+    Args:
+        table_names: Names of tables to clear
+    """
+    if not table_names:
+        return
 
-async def clear_table(table_name: str):
-    """Clear all records from a table"""
     async with AsyncSessionLocal() as session:
-        await session.execute(text(f"DELETE FROM {table_name}"))
+        await session.execute(text(
+            f"TRUNCATE {', '.join(table_names)} RESTART IDENTITY CASCADE"
+        ))
         await session.commit()
-    print(f"  Cleared {table_name}")
+    print(f"  Cleared {len(table_names)} tables")
 
 
-async def import_table(table_name: str, records: list):
+async def import_table(table_name: str, records: Iterable[Dict[str, Any]]):
     """
     Import records into a table.
 
+    The INSERT is prepared once on the pooled connection's asyncpg driver
+    connection, and each batch runs as one executemany of that statement,
+    so PostgreSQL parses and plans it once per table and SQLAlchemy adds
+    no per-batch statement or parameter processing. Records are consumed
+    one batch at a time, so they may come from a stream.
+
     Args:
         table_name: Name of table to import into
-        records: List of record dictionaries
+        records: Record dictionaries, all with the same keys
     """
-    if not records:
+    records = iter(records)
+    batch = list(islice(records, IMPORT_BATCH_SIZE))
+    if not batch:
         print(f"  {table_name}: No records to import")
         return
 
     async with AsyncSessionLocal() as session:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+
         # Get column names from first record
-        columns = list(records[0].keys())
-        placeholders = ", ".join([f":{col}" for col in columns])
+        columns = list(batch[0].keys())
+        placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
         columns_str = ", ".join(columns)
 
-        insert_query = text(
+        insert_statement = await driver.prepare(
             f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
         )
 
-        # Import in batches for performance
-        batch_size = 100
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            for record in batch:
-                await session.execute(insert_query, record)
+        # Import in batches; each executemany is atomic
+        imported = 0
+        while batch:
+            await insert_statement.executemany([tuple(record[col] for col in columns) for record in batch])
+            imported += len(batch)
+            batch = list(islice(records, IMPORT_BATCH_SIZE))
 
-            await session.commit()
-
-        print(f"  {table_name}: Imported {len(records)} records")
+        print(f"  {table_name}: Imported {imported} records")
 
 
 async def import_all_data(input_file: str, confirm: bool = False):
@@ -71,45 +159,39 @@ async def import_all_data(input_file: str, confirm: bool = False):
 
     print(f"Starting data import from {input_file}...")
 
-    # Read file
-    if input_file.endswith(".gz"):
-        with gzip.open(input_file, 'rt', encoding='utf-8') as f:
-            import_data = json.load(f)
+    # Read file: stream records when ijson is available, otherwise load
+    # the whole document
+    if IJSON_AVAILABLE:
+        metadata = _read_metadata(input_file)
     else:
-        with open(input_file, 'r') as f:
+        with _open_export(input_file) as f:
             import_data = json.load(f)
+        metadata = import_data.get("metadata", {})
 
     # Show metadata
-    metadata = import_data.get("metadata", {})
     print(f"\nImport metadata:")
     print(f"  Export time: {metadata.get('export_time')}")
     print(f"  Version: {metadata.get('version')}")
     print(f"  Total records: {metadata.get('total_records')}")
 
-    # Clear all tables (in reverse order to handle foreign keys)
+    # Clear all tables
     print("\nClearing existing data...")
-    tables = metadata.get("tables", [])
-    for table in reversed(tables):
-        await clear_table(table)
+    await clear_tables(metadata.get("tables", []))
 
     # Import data (in correct order for foreign keys)
     print("\nImporting data...")
-    data = import_data.get("data", {})
-
-    # Import in dependency order
-    import_order = [
-        "tutors",          # No dependencies
-        "simulation_state", # No dependencies
-        "enrollments",     # No dependencies
-        "sessions",        # Depends on tutors
-        "health_metrics",  # No dependencies
-        "capacity_snapshots", # No dependencies
-        "data_quality_log" # No dependencies
-    ]
-
-    for table in import_order:
-        if table in data:
-            await import_table(table, data[table])
+
+    if IJSON_AVAILABLE:
+        # Streamed tables arrive in file order; exports write tutors before
+        # sessions, so foreign keys are satisfied
+        for table, rows in groupby(_stream_records(input_file), key=lambda item: item[0]):
+            if table in IMPORT_ORDER:
+                await import_table(table, (record for _, record in rows))
+    else:
+        data = import_data.get("data", {})
+        for table in IMPORT_ORDER:
+            if table in data:
+                await import_table(table, data[table])
 
     print(f"\n✓ Import complete!")
 
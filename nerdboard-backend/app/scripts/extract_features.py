@@ -12,6 +12,12 @@ import sys
 from app.services.feature_engineer import get_feature_engineer
 
 
+# Reference dates extracted concurrently in a historical backfill. Each
+# date holds one pooled connection at a time, so this stays well under
+# the pool size (20).
+HISTORICAL_CONCURRENCY = 8
+
+
 async def extract_for_subject(subject: str, date: datetime = None):
     """Extract features for a single subject"""
     print(f"\n=== Extracting features for {subject} ===")
@@ -55,16 +61,21 @@ async def extract_historical_features(days_back: int = 30):
 
     engineer = get_feature_engineer()
     today = datetime.utcnow()
+    reference_dates = [today - timedelta(days=day_offset) for day_offset in range(days_back, 0, -1)]
+
+    # Dates are independent, so their queries overlap on separate connections
+    semaphore = asyncio.Semaphore(HISTORICAL_CONCURRENCY)
 
-    for day_offset in range(days_back, 0, -1):
-        reference_date = today - timedelta(days=day_offset)
-        print(f"\nExtracting features for {reference_date.date()}...")
+    async def extract_day(reference_date: datetime) -> int:
+        async with semaphore:
+            all_features = await engineer.extract_features_for_all_subjects(reference_date)
+            print(f"  ✓ {reference_date.date()}: {len(all_features)} subjects")
+            return len(all_features)
 
-        all_features = await engineer.extract_features_for_all_subjects(reference_date)
-        print(f"  ✓ {len(all_features)} subjects")
+    counts = await asyncio.gather(*(extract_day(reference_date) for reference_date in reference_dates))
 
     print(f"\n✅ Historical feature extraction complete!")
-    print(f"   {days_back} days × {len(all_features)} subjects = {days_back * len(all_features)} feature sets")
+    print(f"   {days_back} days, {sum(counts)} feature sets")
 
 
 async def main():
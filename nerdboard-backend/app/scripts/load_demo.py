@@ -7,8 +7,9 @@ Usage: python -m app.scripts.load_demo --scenario physics_shortage
 import asyncio
 import argparse
 from datetime import datetime, timedelta
+import os
 import uuid
-from sqlalchemy import text
+from sqlalchemy import insert, text
 
 from app.database import AsyncSessionLocal
 from app.models.enrollment import Enrollment
@@ -17,12 +18,32 @@ from app.models.session import Session
 from app.models.health_metric import HealthMetric
 
 
+def _uuid4_batch(count: int) -> list:
+    """
+    Generate random version 4 UUIDs from one urandom read.
+
+    Args:
+        count: Number of UUIDs
+
+    Returns:
+        list: UUIDs, as uuid.uuid4() would produce them
+    """
+    buf = os.urandom(16 * count)
+    return [uuid.UUID(bytes=buf[i:i + 16], version=4) for i in range(0, len(buf), 16)]
+
+
 async def clear_test_data():
-    """Clear all existing data"""
+    """
+    Clear all existing data.
+
+    A single TRUNCATE empties every table without per-row WAL or
+    foreign key checks.
+    """
     async with AsyncSessionLocal() as session:
-        tables = ["sessions", "health_metrics", "capacity_snapshots", "enrollments", "tutors"]
-        for table in tables:
-            await session.execute(text(f"DELETE FROM {table}"))
+        await session.execute(text(
+            "TRUNCATE tutors, sessions, health_metrics, capacity_snapshots, enrollments "
+            "RESTART IDENTITY CASCADE"
+        ))
         await session.commit()
     print("✓ Cleared existing data")
 
@@ -36,36 +57,37 @@ async def load_physics_shortage_scenario():
     print("\nLoading Physics Shortage scenario...")
 
     async with AsyncSessionLocal() as session:
-        # Create 20 Physics tutors
-        tutors = []
-        for i in range(20):
-            tutor = Tutor(
-                tutor_id=f"PHYS_TUTOR_{i+1}",
-                subjects=["Physics"],
-                weekly_capacity_hours=30,  # 20 tutors * 30 hours = 600 total
-                utilization_rate=0.85
-            )
-            tutors.append(tutor)
-            session.add(tutor)
-
-        await session.commit()
+        # Create 20 Physics tutors; ids are set here so sessions can
+        # reference them without a round-trip
+        tutor_ids = _uuid4_batch(20)
+        tutors = [
+            {
+                "id": tutor_ids[i],
+                "tutor_id": f"PHYS_TUTOR_{i+1}",
+                "subjects": ["Physics"],
+                "weekly_capacity_hours": 30,  # 20 tutors * 30 hours = 600 total
+                "utilization_rate": 0.85
+            }
+            for i in range(20)
+        ]
+        await session.execute(insert(Tutor.__table__), tutors)
         print(f"  Created {len(tutors)} Physics tutors (600 weekly hours)")
 
         # Create high volume of sessions (540 hours booked = 90%)
-        sessions = []
         now = datetime.utcnow()
-
-        for i in range(90):  # 90 sessions * 6 hours = 540 hours
-            session_obj = Session(
-                session_id=f"PHYS_SESSION_{i+1}",
-                subject="Physics",
-                tutor_id=tutors[i % len(tutors)].id,
-                student_id=uuid.uuid4(),
-                scheduled_time=now + timedelta(days=(i % 14)),  # Next 2 weeks
-                duration_minutes=360  # 6 hours each
-            )
-            sessions.append(session_obj)
-            session.add(session_obj)
+        student_ids = _uuid4_batch(90)
+        sessions = [
+            {
+                "session_id": f"PHYS_SESSION_{i+1}",
+                "subject": "Physics",
+                "tutor_id": tutors[i % len(tutors)]["id"],
+                "student_id": student_ids[i],
+                "scheduled_time": now + timedelta(days=(i % 14)),  # Next 2 weeks
+                "duration_minutes": 360  # 6 hours each
+            }
+            for i in range(90)  # 90 sessions * 6 hours = 540 hours
+        ]
+        await session.execute(insert(Session.__table__), sessions)
 
         await session.commit()
         print(f"  Created {len(sessions)} sessions (540 hours booked, 90% utilization)")
@@ -83,47 +105,46 @@ async def load_sat_spike_scenario():
 
     async with AsyncSessionLocal() as session:
         # Create SAT tutors
-        tutors = []
-        for i in range(15):
-            tutor = Tutor(
-                tutor_id=f"SAT_TUTOR_{i+1}",
-                subjects=["SAT Prep"],
-                weekly_capacity_hours=40,
-                utilization_rate=0.60
-            )
-            tutors.append(tutor)
-            session.add(tutor)
-
-        await session.commit()
+        tutors = [
+            {
+                "tutor_id": f"SAT_TUTOR_{i+1}",
+                "subjects": ["SAT Prep"],
+                "weekly_capacity_hours": 40,
+                "utilization_rate": 0.60
+            }
+            for i in range(15)
+        ]
+        await session.execute(insert(Tutor.__table__), tutors)
         print(f"  Created {len(tutors)} SAT tutors")
 
         # Create baseline enrollments (50/week)
-        enrollments = []
         now = datetime.utcnow()
+        student_ids = _uuid4_batch(220)
 
         # Baseline enrollments (weeks 2-4 ago)
-        for i in range(150):  # 50/week * 3 weeks
-            enrollment = Enrollment(
-                student_id=uuid.uuid4(),
-                subject="SAT Prep",
-                cohort_id="SAT_2025_Q1",
-                start_date=now - timedelta(days=(28 - i % 21)),
-                engagement_score=0.70
-            )
-            enrollments.append(enrollment)
-            session.add(enrollment)
+        enrollments = [
+            {
+                "student_id": student_ids[i],
+                "subject": "SAT Prep",
+                "cohort_id": "SAT_2025_Q1",
+                "start_date": now - timedelta(days=(28 - i % 21)),
+                "engagement_score": 0.70
+            }
+            for i in range(150)  # 50/week * 3 weeks
+        ]
 
         # Spike enrollments (last 7 days, +40%)
-        for i in range(70):  # 50 * 1.4 = 70 for last week
-            enrollment = Enrollment(
-                student_id=uuid.uuid4(),
-                subject="SAT Prep",
-                cohort_id="SAT_2025_Q1",
-                start_date=now - timedelta(days=(i % 7)),
-                engagement_score=0.75
-            )
-            enrollments.append(enrollment)
-            session.add(enrollment)
+        enrollments += [
+            {
+                "student_id": student_ids[150 + i],
+                "subject": "SAT Prep",
+                "cohort_id": "SAT_2025_Q1",
+                "start_date": now - timedelta(days=(i % 7)),
+                "engagement_score": 0.75
+            }
+            for i in range(70)  # 50 * 1.4 = 70 for last week
+        ]
+        await session.execute(insert(Enrollment.__table__), enrollments)
 
         await session.commit()
         print(f"  Created {len(enrollments)} enrollments (70 in last 7 days, +40% spike)")
@@ -141,39 +162,35 @@ async def load_churn_risk_scenario():
 
     async with AsyncSessionLocal() as session:
         # Create 5 high-risk customers
-        customer_ids = [str(uuid.uuid4()) for _ in range(5)]
-
-        for i, customer_id in enumerate(customer_ids):
-            # Create enrollment
-            enrollment = Enrollment(
-                student_id=uuid.UUID(customer_id),
-                subject="Math",
-                cohort_id="MATH_2025_Q1",
-                start_date=datetime.utcnow() - timedelta(days=60),
-                engagement_score=0.30  # Low engagement
-            )
-            session.add(enrollment)
-
-            # Create health metrics with high IB calls
-            today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-
-            health_metric_1 = HealthMetric(
-                customer_id=customer_id,
-                date=today - timedelta(days=12),
-                health_score=45.0,
-                engagement_level=35,
-                support_ticket_count=1  # First IB call
-            )
-            session.add(health_metric_1)
-
-            health_metric_2 = HealthMetric(
-                customer_id=customer_id,
-                date=today - timedelta(days=5),
-                health_score=35.0,
-                engagement_level=30,
-                support_ticket_count=1  # Second IB call
-            )
-            session.add(health_metric_2)
+        customer_uuids = _uuid4_batch(5)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Create enrollments
+        enrollments = [
+            {
+                "student_id": customer_uuid,
+                "subject": "Math",
+                "cohort_id": "MATH_2025_Q1",
+                "start_date": datetime.utcnow() - timedelta(days=60),
+                "engagement_score": 0.30  # Low engagement
+            }
+            for customer_uuid in customer_uuids
+        ]
+        await session.execute(insert(Enrollment.__table__), enrollments)
+
+        # Create health metrics with high IB calls, one 12 and one 5 days ago
+        health_metrics = [
+            {
+                "customer_id": str(customer_uuid),
+                "date": today - timedelta(days=days_ago),
+                "health_score": health_score,
+                "engagement_level": engagement_level,
+                "support_ticket_count": 1
+            }
+            for customer_uuid in customer_uuids
+            for days_ago, health_score, engagement_level in ((12, 45.0, 35), (5, 35.0, 30))
+        ]
+        await session.execute(insert(HealthMetric.__table__), health_metrics)
 
         await session.commit()
         print(f"  Created 5 high-risk customers")
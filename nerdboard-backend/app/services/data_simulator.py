@@ -9,8 +9,9 @@ import asyncio
 import uuid
 import random
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 import numpy as np
 
 from app.database import AsyncSessionLocal
@@ -268,6 +269,95 @@ class EventGenerator:
         return updates
 
 
+# Event timestamp ring buffer size (power of two so the slot is head & mask)
+METRICS_RING_SIZE = 4096
+
+# Number of most recent events the events-per-second rate is derived from
+METRICS_RATE_WINDOW = 1000
+
+
+class SimulationMetrics:
+    """Event rate and generation time tracking for the simulator (AC-2)
+
+    Each generated event writes its monotonic completion time into a fixed
+    NumPy ring buffer, so recording is allocation-free and the rate over the
+    last METRICS_RATE_WINDOW events is two lookups into the ring.
+    """
+
+    def __init__(self, size: int = METRICS_RING_SIZE):
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f"Ring size must be a power of two, got {size}")
+        self._ts_ring = np.zeros(size, dtype=np.int64)
+        self._ring_mask = size - 1
+        self._ring_head = 0
+        self._generation_ns = 0
+
+    def record_events(self, count: int, generation_ns: int = 0):
+        """
+        Record a batch of generated events.
+
+        Events are spread evenly over the batch's generation time, ending
+        now, so a single batch still spans a real interval.
+
+        Args:
+            count: Number of events generated
+            generation_ns: Time spent generating the batch, in nanoseconds
+        """
+        if count <= 0:
+            return
+
+        now = time.monotonic_ns()
+        size = self._ts_ring.shape[0]
+        start = self._ring_head & self._ring_mask
+        filled = min(count, size)
+        end = start + filled
+
+        # Completion times of the last `filled` events, oldest first
+        stamps = now - np.arange(filled - 1, -1, -1, dtype=np.int64) * generation_ns // count
+
+        # Write at most one slice per side of the wrap
+        if end <= size:
+            self._ts_ring[start:end] = stamps
+        else:
+            self._ts_ring[start:] = stamps[:size - start]
+            self._ts_ring[:end - size] = stamps[size - start:]
+
+        self._ring_head += count
+        self._generation_ns += generation_ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current simulation performance metrics.
+
+        events_per_second is the rate between the oldest and newest of the
+        last METRICS_RATE_WINDOW events, so it does not decay while idle.
+
+        Returns:
+            Dictionary with events_per_second, avg_event_generation_time_ms
+            and total_events_generated
+        """
+        head = self._ring_head
+        if head == 0:
+            return {
+                "events_per_second": 0.0,
+                "avg_event_generation_time_ms": 0.0,
+                "total_events_generated": 0
+            }
+
+        window = min(head, METRICS_RATE_WINDOW, self._ts_ring.shape[0])
+        oldest_ns = int(self._ts_ring[(head - window) & self._ring_mask])
+        newest_ns = int(self._ts_ring[(head - 1) & self._ring_mask])
+        span_ns = newest_ns - oldest_ns
+        # window events are separated by window - 1 intervals
+        events_per_second = (window - 1) * 1e9 / span_ns if span_ns > 0 else 0.0
+
+        return {
+            "events_per_second": round(events_per_second, 2),
+            "avg_event_generation_time_ms": round(self._generation_ns / head / 1e6, 3),
+            "total_events_generated": head
+        }
+
+
 class DataSimulator:
     """Main simulation engine with pause/resume/fast-forward (AC-2, AC-3, AC-7)"""
 
@@ -283,6 +373,7 @@ class DataSimulator:
         self.state_manager = SimulationStateManager()
         self.scheduler_task: Optional[asyncio.Task] = None
         self._shutdown_event = asyncio.Event()
+        self.metrics = SimulationMetrics()
 
     async def start_simulation(self):
         """Start real-time simulation (AC-3)"""
@@ -316,7 +407,26 @@ class DataSimulator:
         Fast-forward simulation by N days (AC-7)
         Generates batch events for the time period
         """
-        import time
+        summary: Dict[str, Any] = {}
+        async for update in self.advance_simulation_stream(days):
+            summary = update
+        summary.pop("event", None)
+        return summary
+
+    async def advance_simulation_stream(self, days: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fast-forward simulation by N days, yielding progress per batch (AC-7)
+
+        Yields a "progress" update after each inserted batch, then a final
+        "complete" update with the same summary advance_simulation returns.
+        Only one batch of events is held in memory at a time.
+
+        Args:
+            days: Number of days to advance
+
+        Yields:
+            Progress dictionaries, ending with the completion summary
+        """
         start_time = time.time()
 
         state = await self.state_manager.load_state()
@@ -338,25 +448,45 @@ class DataSimulator:
         for i in range(0, total_enrollments, batch_size):
             count = min(batch_size, total_enrollments - i)
             generator = EventGenerator(current_date + timedelta(days=i * days / total_enrollments))
+            gen_start = time.perf_counter_ns()
             enrollments = await generator.generate_enrollment_events(count)
+            self.metrics.record_events(len(enrollments), time.perf_counter_ns() - gen_start)
 
             if enrollments:
                 await self._insert_enrollments(enrollments)
                 enrollments_created += len(enrollments)
 
+            yield {
+                "event": "progress",
+                "phase": "enrollments",
+                "generated": enrollments_created,
+                "total": total_enrollments
+            }
+
         # Generate sessions
         for i in range(0, total_sessions, batch_size):
             count = min(batch_size, total_sessions - i)
             generator = EventGenerator(current_date + timedelta(days=i * days / total_sessions))
+            gen_start = time.perf_counter_ns()
             sessions = await generator.generate_session_events(count)
+            self.metrics.record_events(len(sessions), time.perf_counter_ns() - gen_start)
 
             if sessions:
                 await self._insert_sessions(sessions)
                 sessions_created += len(sessions)
 
+            yield {
+                "event": "progress",
+                "phase": "sessions",
+                "generated": sessions_created,
+                "total": total_sessions
+            }
+
         # Tutor updates
         generator = EventGenerator(new_date)
+        gen_start = time.perf_counter_ns()
         tutor_updates = await generator.generate_tutor_status_changes()
+        self.metrics.record_events(len(tutor_updates), time.perf_counter_ns() - gen_start)
         if tutor_updates:
             await self._update_tutors(tutor_updates)
             tutors_updated = len(tutor_updates)
@@ -370,7 +500,8 @@ class DataSimulator:
         duration = time.time() - start_time
         logger.info(f"Fast-forwarded {days} days in {duration:.2f}s ({enrollments_created} enrollments, {sessions_created} sessions)")
 
-        return {
+        yield {
+            "event": "complete",
             "days_advanced": days,
             "new_time": new_date.isoformat(),
             "events_generated": {
@@ -401,7 +532,6 @@ class DataSimulator:
 
     async def _generate_event_cycle(self):
         """Generate one cycle of events (AC-1)"""
-        import time
         start_time = time.time()
 
         state = await self.state_manager.load_state()
@@ -410,19 +540,25 @@ class DataSimulator:
         generator = EventGenerator(current_date)
 
         # Generate enrollments
+        gen_start = time.perf_counter_ns()
         enrollments = await generator.generate_enrollment_events(self.enrollments_per_cycle)
+        self.metrics.record_events(len(enrollments), time.perf_counter_ns() - gen_start)
         if enrollments:
             await self._insert_enrollments(enrollments)
 
         # Generate sessions
+        gen_start = time.perf_counter_ns()
         sessions = await generator.generate_session_events(self.sessions_per_cycle)
+        self.metrics.record_events(len(sessions), time.perf_counter_ns() - gen_start)
         if sessions:
             await self._insert_sessions(sessions)
             # Trigger capacity updates for affected subjects (Story 1.4 integration)
             await self._update_capacity_for_sessions(sessions)
 
         # Tutor status changes
+        gen_start = time.perf_counter_ns()
         tutor_updates = await generator.generate_tutor_status_changes()
+        self.metrics.record_events(len(tutor_updates), time.perf_counter_ns() - gen_start)
         if tutor_updates:
             await self._update_tutors(tutor_updates)
 
@@ -518,12 +654,10 @@ class DataSimulator:
 
 
 # Global simulator instance
-_simulator: Optional[DataSimulator] = None
+# (created at import; construction touches neither the database nor the loop)
+_simulator = DataSimulator()
 
 
 def get_simulator() -> DataSimulator:
-    """Get or create global simulator instance"""
-    global _simulator
-    if _simulator is None:
-        _simulator = DataSimulator()
+    """Get global simulator instance"""
     return _simulator
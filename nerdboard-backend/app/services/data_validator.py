@@ -4,6 +4,7 @@ Data Quality Validator
 Validates data integrity, detects anomalies, and calculates quality scores
 per data stream. Alerts when quality drops below acceptable thresholds.
 """
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple
@@ -28,6 +29,9 @@ class DataValidator:
     ANOMALY_STD_THRESHOLD = 3.0  # Flag if >3 standard deviations from mean
     ROLLING_WINDOW_DAYS = 7  # Use 7-day rolling average
 
+    # Tables validated at once; each holds one pooled connection while running
+    VALIDATION_CONCURRENCY = 8
+
     def __init__(self):
         """Initialize data validator"""
         self.validation_rules = self._define_validation_rules()
@@ -254,24 +258,25 @@ class DataValidator:
             dict: Validation summary with overall quality
         """
         tables = list(self.validation_rules.keys())
-        results = []
-        total_quality = 0.0
 
-        for table in tables:
-            table_result = await self.validate_table(table)
-            results.append(table_result)
-            total_quality += table_result["quality_score"]
+        # Tables are independent, so validate them concurrently on separate sessions
+        semaphore = asyncio.Semaphore(self.VALIDATION_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._validate_table_bounded(table, semaphore) for table in tables)
+        )
 
+        for table_result in results:
             # Alert if quality below threshold (AC-4)
             if table_result["quality_score"] < self.ALERT_THRESHOLD:
                 logger.warning(
-                    f"Data quality ALERT: {table} score {table_result['quality_score']:.1f}% "
+                    f"Data quality ALERT: {table_result['table_name']} score {table_result['quality_score']:.1f}% "
                     f"(threshold: {self.ALERT_THRESHOLD}%)"
                 )
 
-            # Save to database (AC-5)
-            await self.save_validation_result(table_result)
+        # Save to database in one transaction (AC-5)
+        await self.save_validation_results(results)
 
+        total_quality = sum(r["quality_score"] for r in results)
         avg_quality = total_quality / len(tables) if tables else 0.0
 
         return {
@@ -279,9 +284,23 @@ class DataValidator:
             "tables_validated": len(tables),
             "average_quality_score": round(avg_quality, 2),
             "tables_below_threshold": sum(1 for r in results if r["quality_score"] < self.ALERT_THRESHOLD),
-            "results": results
+            "results": list(results)
         }
 
+    async def _validate_table_bounded(self, table_name: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """
+        Validate a table once a concurrency slot is free.
+
+        Args:
+            table_name: Name of table to validate
+            semaphore: Semaphore bounding concurrent validations
+
+        Returns:
+            dict: Validation results from validate_table()
+        """
+        async with semaphore:
+            return await self.validate_table(table_name)
+
     async def save_validation_result(self, result: Dict[str, Any]) -> None:
         """
         Save validation result to data_quality_log table (AC-5).
@@ -289,16 +308,31 @@ class DataValidator:
         Args:
             result: Validation result from validate_table()
         """
+        await self.save_validation_results([result])
+
+    async def save_validation_results(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Save several validation results to data_quality_log in one transaction.
+
+        Args:
+            results: Validation results from validate_table()
+        """
+        if not results:
+            return
+
+        validation_time = datetime.utcnow()
         async with AsyncSessionLocal() as session:
-            quality_log = DataQualityLog(
-                table_name=result["table_name"],
-                validation_time=datetime.utcnow(),
-                quality_score=result["quality_score"],
-                critical_issues=result.get("critical_issues", 0),
-                warnings=result.get("warnings", 0),
-                issues_json={"issues": result.get("issues", [])}
-            )
-            session.add(quality_log)
+            session.add_all([
+                DataQualityLog(
+                    table_name=result["table_name"],
+                    validation_time=validation_time,
+                    quality_score=result["quality_score"],
+                    critical_issues=result.get("critical_issues", 0),
+                    warnings=result.get("warnings", 0),
+                    issues_json={"issues": result.get("issues", [])}
+                )
+                for result in results
+            ])
             await session.commit()
 
     async def detect_anomalies(self, table_name: str, metric_name: str) -> List[Dict[str, Any]]:
@@ -13,7 +13,8 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-from sqlalchemy import text
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import AsyncSessionLocal
@@ -22,6 +23,59 @@ from app.services.data_generator import SUBJECTS
 
 logger = logging.getLogger(__name__)
 
+# Batch recalculation: customers fetched per cursor chunk, the maximum
+# number of per-customer breakdown queries in flight at once, and the rows
+# written per multi-row upsert statement
+BATCH_CHUNK_SIZE = 50
+BATCH_CONCURRENCY = 16
+UPSERT_CHUNK_SIZE = 1000
+
+
+def _normalize_session_velocity(session_count: int) -> float:
+    """
+    Normalize a 30-day session count to a 0-100 velocity score.
+
+    sessions_per_week = (session_count / 30) * 7, and 5 sessions/week = 100.
+    """
+    sessions_per_week = (session_count / 30.0) * 7.0
+    return round(min(sessions_per_week / 5.0 * 100, 100), 2)
+
+
+def _ib_penalty_for_calls(total_ib_calls: int) -> float:
+    """Map 14-day IB call count to penalty: 0 -> 0, 1 -> 20, 2+ -> 50"""
+    if total_ib_calls == 0:
+        return 0.0
+    elif total_ib_calls == 1:
+        return 20.0
+    else:
+        return 50.0
+
+
+def _ib_calls_from_penalty(ib_penalty: float) -> int:
+    """Recover the (capped) IB call count from its penalty"""
+    return 0 if ib_penalty == 0 else (1 if ib_penalty == 20 else 2)
+
+
+def _scale_engagement_score(engagement_score: Optional[float]) -> float:
+    """Scale a 0-1 enrollment engagement score to 0-100 (None -> 0)"""
+    if engagement_score is None:
+        return 0.0
+    return round(engagement_score * 100, 2)
+
+
+def _classify_churn_risk(ib_calls: int, health_score: float) -> str:
+    """
+    Classify churn risk from IB calls and health score.
+
+    High: >=2 IB calls or score < 40; Medium: 1 IB call or score < 60; else Low.
+    """
+    if ib_calls >= 2 or health_score < 40:
+        return "high"
+    elif ib_calls == 1 or health_score < 60:
+        return "medium"
+    else:
+        return "low"
+
 
 class HealthScoreCalculator:
     """Calculate customer health scores and detect churn risks"""
@@ -54,26 +108,108 @@ class HealthScoreCalculator:
             - Returns 0 if customer_id doesn't exist
         """
         try:
-            # Get all components
-            first_session = await self._get_first_session_success(customer_id)
-            velocity = await self._calculate_session_velocity(customer_id)
-            ib_penalty = await self._calculate_ib_penalty(customer_id)
-            engagement = await self._get_engagement_score(customer_id)
-
-            # Apply formula
-            health_score = (
-                self.formula_weights["first_session_success"] * first_session +
-                self.formula_weights["session_velocity"] * velocity +
-                self.formula_weights["ib_penalty_inverse"] * (100 - ib_penalty) +
-                self.formula_weights["engagement"] * engagement
-            )
-
-            return round(health_score, 2)
+            breakdown = await self.get_full_health_breakdown(customer_id)
+            return breakdown["health_score"]
 
         except Exception as e:
             logger.error(f"Error calculating health score for customer {customer_id}: {e}", exc_info=True)
             return 0.0
 
+    async def get_full_health_breakdown(self, customer_id: str) -> Dict[str, Any]:
+        """
+        Fetch every health score input in one query and derive score and churn risk.
+
+        Bundles first session success, 30-day session count, 14-day IB calls
+        and latest engagement score into a single round-trip.
+
+        Args:
+            customer_id: Customer UUID as string
+
+        Returns:
+            dict: {
+                "health_score": float,
+                "churn_risk": str,
+                "components": {first_session_success, session_velocity,
+                               ib_penalty, engagement_score},
+                "ib_calls": int (capped at 2),
+                "sessions_per_week": float
+            }
+        """
+        async with AsyncSessionLocal() as session:
+            query = text("""
+                WITH first_session AS (
+                    SELECT EXISTS(
+                        SELECT 1 FROM sessions
+                        WHERE CAST(student_id AS TEXT) = :customer_id
+                        AND scheduled_time < NOW()
+                    ) as has_first_session
+                ),
+                velocity AS (
+                    SELECT COUNT(*) as session_count
+                    FROM sessions
+                    WHERE CAST(student_id AS TEXT) = :customer_id
+                    AND scheduled_time >= NOW() - INTERVAL '30 days'
+                    AND scheduled_time <= NOW()
+                ),
+                ib AS (
+                    SELECT COALESCE(SUM(support_ticket_count), 0) as total_ib_calls
+                    FROM health_metrics
+                    WHERE customer_id = :customer_id
+                    AND date >= NOW() - INTERVAL '14 days'
+                )
+                SELECT
+                    first_session.has_first_session,
+                    velocity.session_count,
+                    ib.total_ib_calls,
+                    (
+                        SELECT engagement_score
+                        FROM enrollments
+                        WHERE CAST(student_id AS TEXT) = :customer_id
+                        ORDER BY start_date DESC
+                        LIMIT 1
+                    ) as engagement_score
+                FROM first_session, velocity, ib
+            """)
+            result = await session.execute(query, {"customer_id": customer_id})
+            row = result.fetchone()
+
+        first_session = 100.0 if row.has_first_session else 0.0
+        velocity = _normalize_session_velocity(row.session_count or 0)
+        ib_penalty = _ib_penalty_for_calls(row.total_ib_calls or 0)
+        engagement = _scale_engagement_score(row.engagement_score)
+
+        health_score = self._apply_formula(first_session, velocity, ib_penalty, engagement)
+        ib_calls = _ib_calls_from_penalty(ib_penalty)
+
+        return {
+            "health_score": health_score,
+            "churn_risk": _classify_churn_risk(ib_calls, health_score),
+            "components": {
+                "first_session_success": first_session,
+                "session_velocity": velocity,
+                "ib_penalty": ib_penalty,
+                "engagement_score": engagement
+            },
+            "ib_calls": ib_calls,
+            "sessions_per_week": (velocity / 100.0) * 5.0  # Reverse normalization
+        }
+
+    def _apply_formula(
+        self,
+        first_session: float,
+        velocity: float,
+        ib_penalty: float,
+        engagement: float
+    ) -> float:
+        """Apply the weighted health score formula to component scores"""
+        health_score = (
+            self.formula_weights["first_session_success"] * first_session +
+            self.formula_weights["session_velocity"] * velocity +
+            self.formula_weights["ib_penalty_inverse"] * (100 - ib_penalty) +
+            self.formula_weights["engagement"] * engagement
+        )
+        return round(health_score, 2)
+
     async def _get_first_session_success(self, customer_id: str) -> float:
         """
         Determine if customer's first session was successful (0 or 100).
@@ -128,13 +264,7 @@ class HealthScoreCalculator:
             result = await session.execute(query, {"customer_id": customer_id})
             session_count = result.scalar() or 0
 
-            # Calculate sessions per week
-            sessions_per_week = (session_count / 30.0) * 7.0
-
-            # Normalize to 0-100 scale (5 sessions/week = 100)
-            normalized = min(sessions_per_week / 5.0 * 100, 100)
-
-            return round(normalized, 2)
+            return _normalize_session_velocity(session_count)
 
     async def _calculate_ib_penalty(self, customer_id: str) -> float:
         """
@@ -161,12 +291,7 @@ class HealthScoreCalculator:
             result = await session.execute(query, {"customer_id": customer_id})
             total_ib_calls = result.scalar() or 0
 
-            if total_ib_calls == 0:
-                return 0.0
-            elif total_ib_calls == 1:
-                return 20.0
-            else:
-                return 50.0
+            return _ib_penalty_for_calls(total_ib_calls)
 
     async def _get_engagement_score(self, customer_id: str) -> float:
         """
@@ -189,11 +314,7 @@ class HealthScoreCalculator:
             result = await session.execute(query, {"customer_id": customer_id})
             engagement_score = result.scalar()
 
-            if engagement_score is None:
-                return 0.0
-
-            # Scale from 0-1 to 0-100
-            return round(engagement_score * 100, 2)
+            return _scale_engagement_score(engagement_score)
 
     async def detect_churn_risk(self, customer_id: str) -> str:
         """
@@ -211,20 +332,8 @@ class HealthScoreCalculator:
             str: "low", "medium", or "high"
         """
         try:
-            # Get IB calls
-            ib_penalty = await self._calculate_ib_penalty(customer_id)
-            ib_calls = 0 if ib_penalty == 0 else (1 if ib_penalty == 20 else 2)
-
-            # Get health score
-            health_score = await self.calculate_health_score(customer_id)
-
-            # Determine risk level
-            if ib_calls >= 2 or health_score < 40:
-                return "high"
-            elif ib_calls == 1 or health_score < 60:
-                return "medium"
-            else:
-                return "low"
+            breakdown = await self.get_full_health_breakdown(customer_id)
+            return breakdown["churn_risk"]
 
         except Exception as e:
             logger.error(f"Error detecting churn risk for customer {customer_id}: {e}", exc_info=True)
@@ -248,31 +357,59 @@ class HealthScoreCalculator:
         import time
         start_time = time.time()
 
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        customers_processed = 0
+        successful_updates = 0
+        failed_updates = 0
+        pending_rows: List[Dict[str, Any]] = []
+
         try:
-            # Get all active customer IDs
+            # Stream active customer IDs with a server-side cursor, one chunk at a time
             async with AsyncSessionLocal() as session:
                 query = text("""
                     SELECT DISTINCT CAST(student_id AS TEXT) as customer_id
                     FROM enrollments
                     WHERE start_date >= NOW() - INTERVAL '90 days'
                 """)
-                result = await session.execute(query)
-                customer_ids = [row.customer_id for row in result.fetchall()]
-
-            logger.info(f"Starting health score calculation for {len(customer_ids)} customers")
-
-            # Calculate health scores in parallel
-            tasks = [self._calculate_and_save_health(customer_id) for customer_id in customer_ids]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Count successful updates
-            successful_updates = sum(1 for r in results if r is True)
-            failed_updates = sum(1 for r in results if isinstance(r, Exception))
+                result = await session.stream(query)
+
+                async for chunk in result.partitions(BATCH_CHUNK_SIZE):
+                    customer_ids = [row.customer_id for row in chunk]
+                    customers_processed += len(customer_ids)
+
+                    # Calculate chunk in parallel, bounded by the semaphore
+                    results = await asyncio.gather(
+                        *(self._calculate_health_row(customer_id, semaphore) for customer_id in customer_ids),
+                        return_exceptions=True
+                    )
+
+                    for customer_id, row in zip(customer_ids, results):
+                        if isinstance(row, Exception):
+                            logger.error(f"Failed to calculate health for customer {customer_id}: {row}")
+                            failed_updates += 1
+                        else:
+                            pending_rows.append(row)
+
+                    # Write in large upserts rather than one statement per chunk
+                    if len(pending_rows) >= UPSERT_CHUNK_SIZE:
+                        saved = await self._save_health_rows(pending_rows, today)
+                        successful_updates += saved
+                        failed_updates += len(pending_rows) - saved
+                        pending_rows = []
+
+                    # Yield to the event loop between chunks
+                    await asyncio.sleep(0)
+
+            if pending_rows:
+                saved = await self._save_health_rows(pending_rows, today)
+                successful_updates += saved
+                failed_updates += len(pending_rows) - saved
 
             duration_ms = (time.time() - start_time) * 1000
 
             summary = {
-                "customers_processed": len(customer_ids),
+                "customers_processed": customers_processed,
                 "health_scores_updated": successful_updates,
                 "failed_updates": failed_updates,
                 "duration_ms": round(duration_ms, 2),
@@ -291,54 +428,60 @@ class HealthScoreCalculator:
             logger.error(f"Error in batch health score calculation: {e}", exc_info=True)
             duration_ms = (time.time() - start_time) * 1000
             return {
-                "customers_processed": 0,
-                "health_scores_updated": 0,
-                "failed_updates": 0,
+                "customers_processed": customers_processed,
+                "health_scores_updated": successful_updates,
+                "failed_updates": failed_updates,
                 "duration_ms": round(duration_ms, 2),
                 "timestamp": datetime.utcnow().isoformat(),
                 "error": str(e)
             }
 
-    async def _calculate_and_save_health(self, customer_id: str) -> bool:
+    async def _calculate_health_row(self, customer_id: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
         """
-        Calculate health score for customer and save to database.
+        Calculate health for one customer as a health_metrics row.
 
         Args:
             customer_id: Customer UUID as string
+            semaphore: Bounds concurrent breakdown queries
 
         Returns:
-            bool: True if successful, False otherwise
+            dict: Row for save_health_metrics()
         """
-        try:
-            # Calculate health score and churn risk
-            health_score = await self.calculate_health_score(customer_id)
-            churn_risk = await self.detect_churn_risk(customer_id)
-
-            # Get component metrics for storage
-            engagement = await self._get_engagement_score(customer_id)
-
-            # Save to database
-            health_data = {
-                "health_score": health_score,
-                "engagement_level": int(engagement),  # Store as integer 0-100
-                "churn_risk_level": churn_risk
-            }
+        async with semaphore:
+            breakdown = await self.get_full_health_breakdown(customer_id)
 
-            await self.save_health_metric(customer_id, health_data)
+        health_score = breakdown["health_score"]
 
-            # Log high churn risk
-            if churn_risk == "high":
-                ib_calls = await self._calculate_ib_penalty(customer_id)
-                logger.warning(
-                    f"Churn risk HIGH: customer {customer_id}, "
-                    f"score {health_score}, IB penalty {ib_calls}"
-                )
+        # Log high churn risk
+        if breakdown["churn_risk"] == "high":
+            logger.warning(
+                f"Churn risk HIGH: customer {customer_id}, "
+                f"score {health_score}, IB penalty {breakdown['components']['ib_penalty']}"
+            )
 
-            return True
+        return {
+            "customer_id": customer_id,
+            "health_score": health_score,
+            "engagement_level": int(breakdown["components"]["engagement_score"])  # Store as integer 0-100
+        }
+
+    async def _save_health_rows(self, rows: List[Dict[str, Any]], date: datetime) -> int:
+        """
+        Upsert calculated rows, logging rather than raising on failure.
+
+        Args:
+            rows: Rows from _calculate_health_row()
+            date: Metric date (midnight UTC)
 
+        Returns:
+            int: Number of rows saved (0 if the upsert failed)
+        """
+        try:
+            await self.save_health_metrics(rows, date)
+            return len(rows)
         except Exception as e:
-            logger.error(f"Failed to calculate/save health for customer {customer_id}: {e}")
-            return False
+            logger.error(f"Failed to save health metrics for {len(rows)} customers: {e}")
+            return 0
 
     async def save_health_metric(self, customer_id: str, health_data: Dict[str, Any]) -> None:
         """
@@ -350,43 +493,45 @@ class HealthScoreCalculator:
             customer_id: Customer UUID as string
             health_data: Dict with health_score, engagement_level, etc.
         """
-        async with AsyncSessionLocal() as session:
-            today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        await self.save_health_metrics([{"customer_id": customer_id, **health_data}], today)
 
-            # Check if record exists for today
-            query = text("""
-                SELECT id FROM health_metrics
-                WHERE customer_id = :customer_id
-                AND date = :today
-            """)
-            result = await session.execute(query, {"customer_id": customer_id, "today": today})
-            existing_id = result.scalar()
-
-            if existing_id:
-                # Update existing record
-                update_query = text("""
-                    UPDATE health_metrics
-                    SET health_score = :health_score,
-                        engagement_level = :engagement_level,
-                        updated_at = NOW()
-                    WHERE id = :id
-                """)
-                await session.execute(update_query, {
-                    "id": existing_id,
-                    "health_score": health_data["health_score"],
-                    "engagement_level": health_data.get("engagement_level", 0)
-                })
-            else:
-                # Insert new record
-                health_metric = HealthMetric(
-                    customer_id=customer_id,
-                    date=today,
-                    health_score=health_data["health_score"],
-                    engagement_level=health_data.get("engagement_level", 0),
-                    support_ticket_count=health_data.get("support_ticket_count", 0)
-                )
-                session.add(health_metric)
+    async def save_health_metrics(self, rows: List[Dict[str, Any]], date: datetime) -> None:
+        """
+        Upsert health metrics for many customers in one transaction.
+
+        Inserts one row per customer for date; on conflict with an existing
+        (customer_id, date) row, updates health_score and engagement_level.
 
+        Args:
+            rows: Dicts with customer_id, health_score and optional
+                engagement_level / support_ticket_count
+            date: Metric date (midnight UTC)
+        """
+        values = [
+            {
+                "customer_id": row["customer_id"],
+                "date": date,
+                "health_score": row["health_score"],
+                "engagement_level": row.get("engagement_level", 0),
+                "support_ticket_count": row.get("support_ticket_count", 0)
+            }
+            for row in rows
+        ]
+
+        async with AsyncSessionLocal() as session:
+            # One multi-row statement per UPSERT_CHUNK_SIZE rows, in one transaction
+            for start in range(0, len(values), UPSERT_CHUNK_SIZE):
+                stmt = pg_insert(HealthMetric).values(values[start:start + UPSERT_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["customer_id", "date"],
+                    set_={
+                        "health_score": stmt.excluded.health_score,
+                        "engagement_level": stmt.excluded.engagement_level,
+                        "updated_at": func.now()
+                    }
+                )
+                await session.execute(stmt)
             await session.commit()
 
     async def get_dashboard_health_metrics(self) -> Dict[str, Any]:
@@ -10,11 +10,13 @@ Orchestrates the complete prediction pipeline:
 - Prioritization
 - Storage
 """
+import asyncio
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from sqlalchemy import text
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
 
 from app.database import AsyncSessionLocal
 from app.services.feature_engineer import get_feature_engineer
@@ -25,6 +27,58 @@ from app.ml.explanation_generator import get_explanation_generator
 
 logger = logging.getLogger(__name__)
 
+# Subjects predicted concurrently in a full run. Each subject holds at most
+# one pooled connection at a time, so this stays under the pool size (20)
+# and leaves connections free for API traffic.
+PREDICTION_CONCURRENCY = 16
+
+# Static SQL statements, built once at import
+
+# Subjects with enrollment history
+_Q_SUBJECTS = text("SELECT DISTINCT subject FROM enrollments ORDER BY subject")
+
+# Latest active prediction probability for a subject and horizon
+_Q_LATEST_ACTIVE_PROBABILITY = text("""
+    SELECT shortage_probability
+    FROM predictions
+    WHERE subject = :subject
+    AND horizon = :horizon
+    AND status = 'active'
+    ORDER BY created_at DESC
+    LIMIT 1
+""")
+
+# Insert a new active prediction; the breakdown dict is bound as JSONB and
+# encoded by the engine's JSON serializer
+_Q_INSERT_PREDICTION = text("""
+    INSERT INTO predictions (
+        prediction_id, subject,
+        shortage_probability, predicted_shortage_date,
+        days_until_shortage, severity, predicted_peak_utilization,
+        horizon, horizon_days,
+        confidence_score, confidence_level, confidence_breakdown,
+        priority_score, is_critical,
+        status, created_at, updated_at
+    ) VALUES (
+        :prediction_id, :subject,
+        :shortage_probability, :predicted_shortage_date,
+        :days_until_shortage, :severity, :predicted_peak_utilization,
+        :horizon, :horizon_days,
+        :confidence_score, :confidence_level, :confidence_breakdown,
+        :priority_score, :is_critical,
+        'active', NOW(), NOW()
+    )
+""").bindparams(bindparam("confidence_breakdown", type_=JSONB))
+
+# Insert the explanation for a prediction
+_Q_INSERT_EXPLANATION = text("""
+    INSERT INTO explanations (
+        prediction_id, top_features, explanation_text, created_at
+    ) VALUES (
+        :prediction_id, :top_features, :explanation_text, NOW()
+    )
+""").bindparams(bindparam("top_features", type_=JSONB))
+
 
 class PredictionService:
     """
@@ -78,73 +132,96 @@ class PredictionService:
             )
             top_features = explainer.explain_prediction(features, top_n=5)
 
-            # 5. Generate natural language explanation
-            explanation_gen = get_explanation_generator()
-            explanation_text = explanation_gen.generate_explanation(
-                subject,
-                prediction,
-                confidence,
-                top_features
-            )
+            return await self._finalize_prediction(subject, horizon, prediction, confidence, top_features)
 
-            # 6. Calculate priority score
-            priority_score = self._calculate_priority_score(
-                prediction["days_until_shortage"],
-                confidence["confidence_score"],
-                prediction["severity"]
-            )
+        except Exception as e:
+            logger.error(f"Failed to generate prediction for {subject} {horizon}: {e}", exc_info=True)
+            return None
 
-            is_critical = self._is_critical(
-                prediction["days_until_shortage"],
-                confidence["confidence_score"],
-                prediction["severity"]
-            )
+    async def _finalize_prediction(
+        self,
+        subject: str,
+        horizon: str,
+        prediction: Dict[str, Any],
+        confidence: Dict[str, Any],
+        top_features: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Explain, prioritize and store a scored prediction.
 
-            # 7. Check if prediction should be created (significant change)
-            should_create = await self._should_create_prediction(
-                subject,
-                horizon,
-                prediction["shortage_probability"]
-            )
+        Args:
+            subject: Subject name
+            horizon: Prediction horizon
+            prediction: Model output from ShortagePredictor
+            confidence: Confidence payload from ConfidenceCalculator
+            top_features: Top contributing features from ExplainabilityEngine
 
-            if not should_create:
-                logger.info(f"Skipping prediction for {subject} {horizon} - no significant change")
-                return None
+        Returns:
+            Complete prediction with explanation, or None if skipped
+        """
+        # 5. Generate natural language explanation
+        explanation_gen = get_explanation_generator()
+        explanation_text = explanation_gen.generate_explanation(
+            subject,
+            prediction,
+            confidence,
+            top_features
+        )
 
-            # 8. Store prediction and explanation
-            prediction_id = f"pred_{uuid.uuid4().hex[:12]}"
+        # 6. Calculate priority score
+        priority_score = self._calculate_priority_score(
+            prediction["days_until_shortage"],
+            confidence["confidence_score"],
+            prediction["severity"]
+        )
 
-            await self._store_prediction(
-                prediction_id=prediction_id,
-                subject=subject,
-                prediction=prediction,
-                confidence=confidence,
-                priority_score=priority_score,
-                is_critical=is_critical
-            )
+        is_critical = self._is_critical(
+            prediction["days_until_shortage"],
+            confidence["confidence_score"],
+            prediction["severity"]
+        )
 
-            await self._store_explanation(
-                prediction_id=prediction_id,
-                top_features=top_features,
-                explanation_text=explanation_text
-            )
+        # 7. Check if prediction should be created (significant change)
+        should_create = await self._should_create_prediction(
+            subject,
+            horizon,
+            prediction["shortage_probability"]
+        )
+
+        if not should_create:
+            logger.info(f"Skipping prediction for {subject} {horizon} - no significant change")
+            return None
 
-            logger.info(f"Created prediction {prediction_id} for {subject} {horizon}")
+        # 8. Store prediction and explanation
+        prediction_id = f"pred_{uuid.uuid4().hex[:12]}"
 
-            return {
-                "prediction_id": prediction_id,
-                "subject": subject,
-                **prediction,
-                **confidence,
-                "priority_score": priority_score,
-                "is_critical": is_critical,
-                "top_features": top_features,
-                "explanation_text": explanation_text
-            }
+        await self._store_prediction(
+            prediction_id=prediction_id,
+            subject=subject,
+            prediction=prediction,
+            confidence=confidence,
+            priority_score=priority_score,
+            is_critical=is_critical
+        )
 
-        except Exception as e:
-            logger.error(f"Failed to generate prediction for {subject} {horizon}: {e}", exc_info=True)
-            return None
+        await self._store_explanation(
+            prediction_id=prediction_id,
+            top_features=top_features,
+            explanation_text=explanation_text
+        )
+
+        logger.info(f"Created prediction {prediction_id} for {subject} {horizon}")
+
+        return {
+            "prediction_id": prediction_id,
+            "subject": subject,
+            **prediction,
+            **confidence,
+            "priority_score": priority_score,
+            "is_critical": is_critical,
+            "top_features": top_features,
+            "explanation_text": explanation_text
+        }
 
     async def generate_predictions_for_all_subjects(
         self,
@@ -153,6 +230,9 @@ class PredictionService:
         """
         Generate predictions for all subjects across all horizons.
 
+        Features are extracted once per subject; the model, confidence and
+        SHAP stages then run once over the whole batch (see _score_batch).
+
         Args:
             horizons: List of horizons to predict (default: all)
 
@@ -168,23 +248,47 @@ class PredictionService:
 
         # Get all subjects
         async with AsyncSessionLocal() as session:
-            query = text("SELECT DISTINCT subject FROM enrollments ORDER BY subject")
-            result = await session.execute(query)
+            result = await session.execute(_Q_SUBJECTS)
             subjects = [row.subject for row in result.fetchall()]
 
-        total_predictions = 0
-        predictions_by_subject = {}
+        semaphore = asyncio.Semaphore(PREDICTION_CONCURRENCY)
+        engineer = get_feature_engineer()
 
-        for subject in subjects:
-            subject_predictions = []
+        # 1. Features depend only on the subject: extract once per subject,
+        # concurrently so their database round-trips overlap
+        async def extract(subject: str) -> Optional[Dict[str, float]]:
+            async with semaphore:
+                try:
+                    return await engineer.extract_features_for_subject(subject)
+                except Exception as e:
+                    logger.error(f"Failed to extract features for {subject}: {e}", exc_info=True)
+                    return None
 
-            for horizon in horizons:
-                prediction = await self.generate_prediction_for_subject(subject, horizon)
-                if prediction:
-                    subject_predictions.append(prediction)
-                    total_predictions += 1
+        extracted = await asyncio.gather(*(extract(subject) for subject in subjects))
+        ready = [(subject, features) for subject, features in zip(subjects, extracted) if features is not None]
 
-            predictions_by_subject[subject] = len(subject_predictions)
+        try:
+            scored = await self._score_batch(ready, horizons)
+        except Exception as e:
+            logger.error(f"Failed to score prediction batch: {e}", exc_info=True)
+            scored = {}
+
+        # 5-8. Explain, prioritize and store; subjects run concurrently,
+        # horizons for one subject stay sequential
+        async def finish_subject(subject: str) -> int:
+            async with semaphore:
+                created = 0
+                for horizon, prediction, confidence, top_features in scored.get(subject, ()):
+                    try:
+                        if await self._finalize_prediction(subject, horizon, prediction, confidence, top_features):
+                            created += 1
+                    except Exception as e:
+                        logger.error(f"Failed to generate prediction for {subject} {horizon}: {e}", exc_info=True)
+                return created
+
+        counts = await asyncio.gather(*(finish_subject(subject) for subject in subjects))
+        predictions_by_subject = dict(zip(subjects, counts))
+        total_predictions = sum(counts)
 
         duration = (datetime.utcnow() - start_time).total_seconds()
 
@@ -201,6 +305,62 @@ class PredictionService:
 
         return summary
 
+    async def _score_batch(
+        self,
+        subject_features: List[Tuple[str, Dict[str, float]]],
+        horizons: List[str]
+    ) -> Dict[str, List[Tuple[str, Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]]]:
+        """
+        Run model, confidence and SHAP for every subject and horizon at once.
+
+        The model scores all subject × horizon rows in one call, confidence
+        is computed as arrays with one database lookup per subject, and SHAP
+        explains one row per subject, since features do not vary by horizon.
+
+        Args:
+            subject_features: (subject, features) pairs
+            horizons: Horizons to predict for every subject
+
+        Returns:
+            Per subject, (horizon, prediction, confidence, top_features)
+            tuples in horizon order
+        """
+        if not subject_features:
+            return {}
+
+        # 2. Run ML model prediction
+        predictor = get_shortage_predictor()
+        batch_subjects = [subject for subject, _ in subject_features for _ in horizons]
+        batch_features = [features for _, features in subject_features for _ in horizons]
+        predictions = predictor.predict_shortage_batch(batch_features, list(horizons) * len(subject_features))
+
+        # 3. Calculate confidence scores
+        confidence_calc = get_confidence_calculator()
+        confidences = await confidence_calc.batch_calculate_confidence(
+            batch_subjects,
+            [prediction["shortage_probability"] for prediction in predictions],
+            batch_features
+        )
+
+        # 4. Generate SHAP explanations
+        explainer = create_explainability_engine(
+            predictor.model,
+            predictor.feature_columns
+        )
+        top_features_list = explainer.explain_predictions_batch(
+            [features for _, features in subject_features], top_n=5
+        )
+
+        scored = {}
+        n_horizons = len(horizons)
+        for s, ((subject, _), top_features) in enumerate(zip(subject_features, top_features_list)):
+            rows = range(s * n_horizons, (s + 1) * n_horizons)
+            scored[subject] = [
+                (horizons[r - s * n_horizons], predictions[r], confidences[r].to_dict(), top_features)
+                for r in rows
+            ]
+        return scored
+
     def _calculate_priority_score(
         self,
         days_until: int,
@@ -294,16 +454,7 @@ class PredictionService:
             True if prediction should be created
         """
         async with AsyncSessionLocal() as session:
-            query = text("""
-                SELECT shortage_probability
-                FROM predictions
-                WHERE subject = :subject
-                AND horizon = :horizon
-                AND status = 'active'
-                ORDER BY created_at DESC
-                LIMIT 1
-            """)
-            result = await session.execute(query, {
+            result = await session.execute(_Q_LATEST_ACTIVE_PROBABILITY, {
                 "subject": subject,
                 "horizon": horizon
             })
@@ -330,27 +481,7 @@ class PredictionService:
     ):
         """Store prediction in database"""
         async with AsyncSessionLocal() as session:
-            query = text("""
-                INSERT INTO predictions (
-                    prediction_id, subject,
-                    shortage_probability, predicted_shortage_date,
-                    days_until_shortage, severity, predicted_peak_utilization,
-                    horizon, horizon_days,
-                    confidence_score, confidence_level, confidence_breakdown,
-                    priority_score, is_critical,
-                    status, created_at, updated_at
-                ) VALUES (
-                    :prediction_id, :subject,
-                    :shortage_probability, :predicted_shortage_date,
-                    :days_until_shortage, :severity, :predicted_peak_utilization,
-                    :horizon, :horizon_days,
-                    :confidence_score, :confidence_level, :confidence_breakdown,
-                    :priority_score, :is_critical,
-                    'active', NOW(), NOW()
-                )
-            """)
-
-            await session.execute(query, {
+            await session.execute(_Q_INSERT_PREDICTION, {
                 "prediction_id": prediction_id,
                 "subject": subject,
                 "shortage_probability": prediction["shortage_probability"],
@@ -376,15 +507,7 @@ class PredictionService:
     ):
         """Store explanation in database"""
         async with AsyncSessionLocal() as session:
-            query = text("""
-                INSERT INTO explanations (
-                    prediction_id, top_features, explanation_text, created_at
-                ) VALUES (
-                    :prediction_id, :top_features, :explanation_text, NOW()
-                )
-            """)
-
-            await session.execute(query, {
+            await session.execute(_Q_INSERT_EXPLANATION, {
                 "prediction_id": prediction_id,
                 "top_features": top_features,
                 "explanation_text": explanation_text
@@ -8,12 +8,13 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from datetime import datetime
 import time
 
 from app.api.routes import health, capacity, quality, simulation, predictions, dashboard
+from app.database import init_redis, close_redis
 from app.services.scheduler import start_scheduler, stop_scheduler
 
 # Configure logging
@@ -34,6 +35,10 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting NerdBoard API server...")
 
+    # Connect Redis (connections are opened lazily on first command)
+    await init_redis()
+    logger.info("Redis client initialized")
+
     # Start background scheduler
     start_scheduler()
     logger.info("Background scheduler started")
@@ -45,6 +50,8 @@ async def lifespan(app: FastAPI):
     stop_scheduler()
     logger.info("Background scheduler stopped")
 
+    await close_redis()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -54,7 +61,8 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -0,0 +1,62 @@
+"""
+Unit tests for CompactForest
+
+Tests packed float32 forest inference against sklearn's predict_proba.
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml.compact_forest import NUMBA_AVAILABLE, CompactForest, _floor_float32
+
+
+@pytest.fixture(scope="module")
+def model():
+    """Forest over features on very different scales"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 4)) * np.array([1.0, 100.0, 1e-3, 1.0])
+    X[:, 3] = np.round(X[:, 3] * 3)
+    y = (X[:, 0] + 0.3 * X[:, 3] + rng.normal(size=400) * 0.5 > 0).astype(int)
+    return RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+
+
+class TestFloorFloat32:
+    """Test threshold narrowing"""
+
+    def test_never_rounds_up(self):
+        """Test narrowed thresholds keep every float32 comparison unchanged"""
+        values = np.random.default_rng(1).normal(size=1000) * 1e3
+
+        narrowed = _floor_float32(values)
+
+        assert (narrowed.astype(np.float64) <= values).all()
+        assert (np.nextafter(narrowed, np.float32(np.inf)).astype(np.float64) > values).all()
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+class TestCompactForest:
+    """Test packed forest predictions"""
+
+    def test_matches_predict_proba_exactly(self, model):
+        """Test serial and parallel kernels reproduce sklearn, including rows on thresholds"""
+        rng = np.random.default_rng(2)
+        rows = (rng.normal(size=(300, 4)) * np.array([1.0, 100.0, 1e-3, 1.0])).astype(np.float32)
+        tree = model.estimators_[0].tree_
+        for i, (feature, threshold) in enumerate(zip(tree.feature, tree.threshold)):
+            if feature >= 0 and i < len(rows):
+                rows[i, feature] = np.float32(threshold)
+        compact = CompactForest.from_model(model)
+
+        expected = model.predict_proba(rows)[:, 1]
+
+        assert compact.predict_positive(rows).tolist() == expected.tolist()
+        assert compact.predict_positive(rows, parallel=True).tolist() == expected.tolist()
+
+    def test_unsupported_models_are_not_packed(self, model):
+        """Test non-forest and multiclass models fall back"""
+        X = np.random.default_rng(3).random((30, 2))
+        multiclass = RandomForestClassifier(n_estimators=2, random_state=0).fit(X, np.arange(30) % 3)
+
+        assert CompactForest.from_model(None) is None
+        assert CompactForest.from_model(multiclass) is None
+        assert CompactForest.from_model(RandomForestClassifier()) is None
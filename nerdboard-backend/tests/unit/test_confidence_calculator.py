@@ -0,0 +1,275 @@
+"""
+Unit tests for ConfidenceCalculator
+
+Tests model certainty, pattern strength, and Redis caching of the
+historical accuracy and data quality lookups.
+"""
+import pytest
+
+from app.ml import confidence_calculator as confidence_module
+from app.ml.confidence_calculator import (
+    DATA_QUALITY_CACHE_KEY,
+    STATS_CACHE_TTL,
+    ConfidenceCalculator,
+    ConfidenceResult,
+    _data_quality_from_average,
+    _historical_accuracy_from_count,
+)
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in recording SETEX calls"""
+
+    def __init__(self, fail: bool = False):
+        self.store = {}
+        self.ttls = {}
+        self.fail = fail
+
+    async def mget(self, keys):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return [self.store.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+
+class TestComponentScores:
+    """Test pure component calculations"""
+
+    def test_model_certainty_extremes(self):
+        """Test certainty is 0 at p=0.5 and 100 at p=0 or 1"""
+        calculator = ConfidenceCalculator()
+
+        assert calculator._calculate_model_certainty(0.5) == 0.0
+        assert calculator._calculate_model_certainty(1.0) == 100.0
+        assert calculator._calculate_model_certainty(0.0) == 100.0
+
+    def test_pattern_strength_is_capped(self):
+        """Test strong trends saturate at 100"""
+        calculator = ConfidenceCalculator()
+
+        strength = calculator._calculate_pattern_strength(
+            {"utilization_trend": -25.0, "enrollment_velocity": 1.0}
+        )
+
+        assert strength == 100.0
+
+    def test_pattern_strength_batch_matches_scalar(self):
+        """Test batch kernel agrees with per-prediction calculation"""
+        calculator = ConfidenceCalculator()
+        features_list = [
+            {"utilization_trend": 2.5, "enrollment_velocity": -0.1},
+            {"utilization_trend": -12.0},
+            {},
+        ]
+
+        batch = calculator._calculate_pattern_strength_batch(features_list)
+
+        assert batch.tolist() == [
+            calculator._calculate_pattern_strength(features) for features in features_list
+        ]
+
+
+class TestScoreMapping:
+    """Test raw statistics to score mapping"""
+
+    def test_historical_accuracy_buckets(self):
+        """Test prediction count thresholds"""
+        assert _historical_accuracy_from_count(0) == 50.0
+        assert _historical_accuracy_from_count(5) == 60.0
+        assert _historical_accuracy_from_count(11) == 75.0
+
+    def test_data_quality_defaults_without_history(self):
+        """Test missing quality data defaults to 90"""
+        assert _data_quality_from_average(None) == 90.0
+        assert _data_quality_from_average(82.5) == 82.5
+
+
+class TestStatsCache:
+    """Test Redis caching of database-backed scores"""
+
+    @pytest.mark.asyncio
+    async def test_miss_runs_one_query_and_caches_both(self, monkeypatch):
+        """Test first lookup queries once, second is served from Redis"""
+        redis = FakeRedis()
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: redis)
+        calculator = ConfidenceCalculator()
+        calls = []
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            calls.append(subject)
+            return 12, 88.5
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        assert await calculator._get_database_scores("Physics") == (75.0, 88.5)
+        assert await calculator._get_database_scores("Physics") == (75.0, 88.5)
+
+        assert calls == ["Physics"]
+        assert redis.ttls == {
+            "conf:hist_acc:Physics": STATS_CACHE_TTL,
+            DATA_QUALITY_CACHE_KEY: STATS_CACHE_TTL
+        }
+
+    @pytest.mark.asyncio
+    async def test_data_quality_shared_across_subjects(self, monkeypatch):
+        """Test a new subject only misses on historical accuracy"""
+        redis = FakeRedis()
+        redis.store[DATA_QUALITY_CACHE_KEY] = "70.0"
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: redis)
+        calculator = ConfidenceCalculator()
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            return 0, 95.0
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        assert await calculator._get_database_scores("Math") == (50.0, 70.0)
+        assert redis.store[DATA_QUALITY_CACHE_KEY] == "70.0"
+
+    @pytest.mark.asyncio
+    async def test_supplied_data_quality_is_kept(self, monkeypatch):
+        """Test a pre-calculated data quality score is not overridden"""
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: None)
+        calculator = ConfidenceCalculator()
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            return 3, 95.0
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        assert await calculator._get_database_scores("Math", 40.0) == (60.0, 40.0)
+
+    @pytest.mark.asyncio
+    async def test_query_skips_supplied_or_cached_scores(self, monkeypatch):
+        """Test only the missing inputs are queried"""
+        redis = FakeRedis()
+        redis.store["conf:hist_acc:Art"] = "75.0"
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: redis)
+        calculator = ConfidenceCalculator()
+        calls = []
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            calls.append((subject, need_count, need_quality))
+            return (3 if need_count else None), (95.0 if need_quality else None)
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        assert await calculator._get_database_scores("Math", 40.0) == (60.0, 40.0)
+        assert await calculator._get_database_scores("Art") == (75.0, 95.0)
+        assert calls == [("Math", True, False), ("Art", False, True)]
+
+    def test_statements_only_touch_needed_tables(self):
+        """Test the count-only statement does not read data_quality_log"""
+        statements = confidence_module._Q_CONFIDENCE_STATS
+
+        assert "data_quality_log" not in str(statements[True, False])
+        assert "predictions" not in str(statements[False, True])
+        assert "predictions" in str(statements[True, True]) and "data_quality_log" in str(statements[True, True])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("redis", [None, FakeRedis(fail=True)])
+    async def test_falls_back_to_database_without_redis(self, monkeypatch, redis):
+        """Test missing or failing Redis does not break scoring"""
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: redis)
+        calculator = ConfidenceCalculator()
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            return 3, None
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        assert await calculator._get_database_scores("Math") == (60.0, 90.0)
+
+
+class TestBatchConfidence:
+    """Test batch confidence scoring"""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_predictions(self, monkeypatch):
+        """Test batch results format to the same payload as per-call scoring"""
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: None)
+        calculator = ConfidenceCalculator()
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            return (20 if subject == "Math" else 0), 85.0
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+        subjects = ["Math", "Physics", "Math"]
+        probabilities = [0.95, 0.4, 0.5]
+        features_list = [
+            {"utilization_trend": 6.0, "enrollment_velocity": 0.3},
+            {"utilization_trend": -1.0},
+            {},
+        ]
+
+        batch = await calculator.batch_calculate_confidence(subjects, probabilities, features_list)
+
+        assert all(isinstance(result, ConfidenceResult) for result in batch)
+        for result, subject, probability, features in zip(batch, subjects, probabilities, features_list):
+            single = await calculator.calculate_confidence(subject, probability, features)
+            assert result.to_dict() == single
+
+    @pytest.mark.asyncio
+    async def test_database_scores_looked_up_once_per_subject(self, monkeypatch):
+        """Test repeated subjects share one lookup"""
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: None)
+        calculator = ConfidenceCalculator()
+        calls = []
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            calls.append(subject)
+            return 0, None
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        await calculator.batch_calculate_confidence(["Math", "Math", "Art"], [0.1, 0.2, 0.3], [{}, {}, {}])
+
+        assert calls == ["Math", "Art"]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        """Test empty input returns empty output"""
+        assert await ConfidenceCalculator().batch_calculate_confidence([], [], []) == []
+
+
+class TestWeighting:
+    """Test weighted combination of components"""
+
+    def test_weight_vector_follows_component_order(self):
+        """Test weight vector mirrors the weights dict and sums to 1"""
+        calculator = ConfidenceCalculator()
+
+        assert calculator._weight_vec.tolist() == [
+            calculator.weights[name] for name in confidence_module.COMPONENT_ORDER
+        ]
+        assert calculator._weight_vec.sum() == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_score_is_weighted_sum(self, monkeypatch):
+        """Test 40/25/20/15 weighting of the breakdown"""
+        monkeypatch.setattr(confidence_module, "get_redis", lambda: None)
+        calculator = ConfidenceCalculator()
+
+        async def fake_query(subject, need_count=True, need_quality=True):
+            return 0, 80.0
+
+        monkeypatch.setattr(calculator, "_query_database_stats", fake_query)
+
+        result = await calculator.calculate_confidence("Math", 1.0, {"utilization_trend": 5.0})
+
+        # 0.40*100 + 0.25*80 + 0.20*25 + 0.15*50
+        assert result["confidence_score"] == 72.5
+        assert result["confidence_level"] == "medium"
+
+
+class TestSingleton:
+    """Test module-level singleton"""
+
+    def test_same_instance_returned(self):
+        """Test the getter returns the instance created at import"""
+        assert confidence_module.get_confidence_calculator() is confidence_module.get_confidence_calculator()
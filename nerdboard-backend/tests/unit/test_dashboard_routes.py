@@ -0,0 +1,45 @@
+"""
+Unit tests for dashboard routes
+
+Tests request validation that happens before any database access.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.cache import get_response_cache
+from app.api.dependencies import now_iso
+from app.api.routes.dashboard import SUBJECTS_SET, get_subject_detail
+from app.services.capacity_calculator import SUBJECTS
+
+
+class TestSubjectDetailValidation:
+    """Test subject path parameter validation"""
+
+    def test_subjects_set_matches_subjects(self):
+        """Test frozenset mirrors the canonical SUBJECTS list"""
+        assert SUBJECTS_SET == frozenset(SUBJECTS)
+
+    @pytest.mark.asyncio
+    async def test_unknown_subject_returns_404(self):
+        """Test unknown subject is rejected without querying"""
+        get_response_cache().clear()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_subject_detail(subject="Underwater Basket Weaving")
+
+        assert exc_info.value.status_code == 404
+
+
+class TestNowIso:
+    """Test last_updated / metadata timestamp formatting"""
+
+    def test_is_parseable_utc_iso8601(self):
+        """Test timestamp is ISO-8601 in UTC with a Z suffix"""
+        timestamp = now_iso()
+        parsed = datetime.fromisoformat(timestamp)
+
+        assert timestamp.endswith("Z")
+        assert parsed.tzinfo == timezone.utc
+        assert parsed.microsecond == 0
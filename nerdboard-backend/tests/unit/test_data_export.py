@@ -0,0 +1,134 @@
+"""
+Unit tests for the data export script
+
+Tests the streamed export document against a stubbed database session.
+"""
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.scripts import data_export as export_module
+
+
+class FakeDriverConnection:
+    """asyncpg connection stand-in serving COPY output as JSON lines"""
+
+    def __init__(self, tables, chunk_size):
+        self.tables = tables
+        self.chunk_size = chunk_size
+        self.copies = []
+        self.active = 0
+        self.peak_active = 0
+
+    async def copy_from_query(self, query, output, **options):
+        self.copies.append((query, options))
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        await asyncio.sleep(0)
+        rows = self.tables.get(query.split()[-2], [])
+        data = b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+        # Deliver in fixed-size chunks that split rows mid-way
+        for start in range(0, len(data), self.chunk_size):
+            await output(data[start:start + self.chunk_size])
+        self.active -= 1
+        return f"COPY {len(rows)}"
+
+
+class FakeStreamSession:
+    """Async session stand-in exposing a fake driver connection"""
+
+    def __init__(self, tables, chunk_size=7):
+        self.driver = FakeDriverConnection(tables, chunk_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def connection(self):
+        driver = self.driver
+
+        class Connection:
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=driver)
+
+        return Connection()
+
+
+class TestStreamedExport:
+    """Test the streamed export document"""
+
+    TABLES = {
+        "tutors": [
+            {"tutor_id": "T1", "subjects": ["Math", "Physics"], "created_at": "2025-01-02T00:00:00"},
+            {"tutor_id": "T2", "subjects": [], "bio": "line\nbreak"},
+        ],
+        "sessions": [{"id": "00000000-0000-0000-0000-000000000001", "cost": 12.50}],
+    }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    async def test_document_round_trips(self, monkeypatch, chunk_size):
+        """Test every table and the metadata parse back for any COPY chunking"""
+        session = FakeStreamSession(self.TABLES, chunk_size)
+        monkeypatch.setattr(export_module, "AsyncSessionLocal", lambda: session)
+        out = io.BytesIO()
+
+        total = await export_module.write_export(out)
+
+        document = json.loads(out.getvalue())
+        assert total == 3
+        assert document["metadata"]["total_records"] == 3
+        assert document["metadata"]["tables"] == export_module.TABLES_TO_EXPORT
+        assert list(document["data"]) == export_module.TABLES_TO_EXPORT
+        assert document["data"]["tutors"] == self.TABLES["tutors"]
+        assert document["data"]["sessions"] == self.TABLES["sessions"]
+        assert document["data"]["enrollments"] == []
+
+    @pytest.mark.asyncio
+    async def test_copy_renders_rows_server_side(self, monkeypatch):
+        """Test rows are rendered by row_to_json in unquoted CSV mode"""
+        session = FakeStreamSession({})
+        monkeypatch.setattr(export_module, "AsyncSessionLocal", lambda: session)
+
+        await export_module.write_export(io.BytesIO())
+
+        query, options = session.driver.copies[0]
+        assert query == "SELECT row_to_json(t) FROM enrollments t"
+        assert options == {"format": "csv", "delimiter": "\x02", "quote": "\x01"}
+
+    @pytest.mark.asyncio
+    async def test_tables_copied_concurrently(self, monkeypatch):
+        """Test all table copies are in flight together and kept in table order"""
+        session = FakeStreamSession(self.TABLES)
+        monkeypatch.setattr(export_module, "AsyncSessionLocal", lambda: session)
+        out = io.BytesIO()
+
+        await export_module.write_export(out)
+
+        assert session.driver.peak_active == len(export_module.TABLES_TO_EXPORT)
+        assert list(json.loads(out.getvalue())["data"]) == export_module.TABLES_TO_EXPORT
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("filename", ["export.json.gz", "export.json"])
+    async def test_export_file_readable(self, monkeypatch, tmp_path, filename):
+        """Test buffered gzip and plain outputs are complete when closed"""
+        import gzip
+
+        rows = [{"tutor_id": f"T{i}", "subjects": ["Math"]} for i in range(5000)]
+        monkeypatch.setattr(
+            export_module, "AsyncSessionLocal", lambda: FakeStreamSession({"tutors": rows}, 4096)
+        )
+        output = tmp_path / filename
+
+        await export_module.export_all_data(str(output))
+
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(output, "rb") as f:
+            document = json.loads(f.read())
+        assert document["data"]["tutors"] == rows
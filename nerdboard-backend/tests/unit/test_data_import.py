@@ -0,0 +1,153 @@
+"""
+Unit tests for the data import script
+
+Tests batched inserts against a stubbed database session.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.scripts import data_import as import_module
+
+
+class FakeStatement:
+    """asyncpg prepared statement stand-in recording executemany batches"""
+
+    def __init__(self, query):
+        self.query = query
+        self.batches = []
+
+    async def executemany(self, args):
+        self.batches.append(args)
+
+
+class FakeDriverConnection:
+    """asyncpg connection stand-in recording prepared statements"""
+
+    def __init__(self):
+        self.prepared = []
+
+    async def prepare(self, query):
+        statement = FakeStatement(query)
+        self.prepared.append(statement)
+        return statement
+
+
+class FakeSession:
+    """Async session stand-in recording execute and commit calls"""
+
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+        self.driver = FakeDriverConnection()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+
+    async def commit(self):
+        self.commits += 1
+
+    async def connection(self):
+        driver = self.driver
+
+        class Connection:
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=driver)
+
+        return Connection()
+
+
+class TestBatchedImport:
+    """Test import_table sends one executemany per batch"""
+
+    @pytest.mark.asyncio
+    async def test_statement_prepared_once(self, monkeypatch):
+        """Test one prepared INSERT runs every batch with positional rows"""
+        session = FakeSession()
+        monkeypatch.setattr(import_module, "AsyncSessionLocal", lambda: session)
+        monkeypatch.setattr(import_module, "IMPORT_BATCH_SIZE", 2)
+        records = [{"id": i, "subject": "Math"} for i in range(5)]
+
+        await import_module.import_table("tutors", records)
+
+        (statement,) = session.driver.prepared
+        assert statement.query == "INSERT INTO tutors (id, subject) VALUES ($1, $2)"
+        assert [len(batch) for batch in statement.batches] == [2, 2, 1]
+        assert [row for batch in statement.batches for row in batch] == [(i, "Math") for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_empty_table_skips_session(self, monkeypatch):
+        """Test no session is opened without records"""
+        def fail():
+            raise AssertionError("session opened")
+
+        monkeypatch.setattr(import_module, "AsyncSessionLocal", fail)
+
+        await import_module.import_table("tutors", [])
+
+
+class TestClearTables:
+    """Test existing data is cleared with one statement"""
+
+    @pytest.mark.asyncio
+    async def test_single_truncate(self, monkeypatch):
+        """Test all tables are truncated together and committed once"""
+        session = FakeSession()
+        monkeypatch.setattr(import_module, "AsyncSessionLocal", lambda: session)
+
+        await import_module.clear_tables(["tutors", "sessions"])
+
+        assert session.executed == [("TRUNCATE tutors, sessions RESTART IDENTITY CASCADE", None)]
+        assert session.commits == 1
+
+
+class TestImportFile:
+    """Test reading export documents"""
+
+    DOCUMENT = {
+        "data": {
+            "enrollments": [{"id": "e1", "score": 0.5}],
+            "tutors": [{"id": "t1", "subjects": ["Math"], "meta": {"data": {"item": 1}}}, {"id": "t2", "subjects": [], "meta": {}}],
+            "sessions": [{"id": "s1", "tutor_id": "t1"}],
+            "predictions": [{"id": "p1"}],
+        },
+        "metadata": {"tables": ["enrollments", "tutors", "sessions"], "total_records": 5},
+    }
+
+    def _write(self, tmp_path):
+        import gzip
+
+        path = tmp_path / "export.json.gz"
+        with gzip.open(path, "wt") as f:
+            json.dump(self.DOCUMENT, f)
+        return str(path)
+
+    @pytest.mark.asyncio
+    async def test_whole_document_fallback(self, monkeypatch, tmp_path):
+        """Test tables import in dependency order without ijson"""
+        session = FakeSession()
+        monkeypatch.setattr(import_module, "AsyncSessionLocal", lambda: session)
+        monkeypatch.setattr(import_module, "IJSON_AVAILABLE", False)
+
+        await import_module.import_all_data(self._write(tmp_path), confirm=True)
+
+        tables = [statement.query.split()[2] for statement in session.driver.prepared]
+        assert tables == ["tutors", "enrollments", "sessions"]
+        assert session.executed[0][0] == "TRUNCATE enrollments, tutors, sessions RESTART IDENTITY CASCADE"
+
+    @pytest.mark.skipif(not import_module.IJSON_AVAILABLE, reason="ijson not installed")
+    def test_streamed_records(self, tmp_path):
+        """Test records stream in file order with nested values intact"""
+        path = self._write(tmp_path)
+
+        assert import_module._read_metadata(path) == self.DOCUMENT["metadata"]
+        assert list(import_module._stream_records(path)) == [
+            (table, record) for table, records in self.DOCUMENT["data"].items() for record in records
+        ]
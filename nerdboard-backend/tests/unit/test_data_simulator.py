@@ -17,6 +17,7 @@ from app.services.data_simulator import (
     EventGenerator,
     SimulationStateManager,
     DataSimulator,
+    SimulationMetrics,
 )
 
 
@@ -177,6 +178,141 @@ class TestDataSimulator:
             # In real test, we'd mock all database calls
 
 
+class TestAdvanceStream:
+    """Test streamed fast-forward progress (AC-7)"""
+
+    @staticmethod
+    def _patched(simulator):
+        """Patch database access and event generation for a simulator"""
+        mock_state = Mock()
+        mock_state.current_date = datetime(2024, 1, 1)
+
+        async def events(self, count):
+            return [{}] * count
+
+        async def tutor_changes(self, tutor_update_probability=0.10):
+            return [{}, {}]
+
+        return [
+            patch.object(simulator, '_insert_enrollments', new=AsyncMock()),
+            patch.object(simulator, '_insert_sessions', new=AsyncMock()),
+            patch.object(simulator, '_update_tutors', new=AsyncMock()),
+            patch.object(simulator.state_manager, 'load_state', new=AsyncMock(return_value=mock_state)),
+            patch.object(simulator.state_manager, 'save_state', new=AsyncMock()),
+            patch.object(EventGenerator, 'generate_enrollment_events', new=events),
+            patch.object(EventGenerator, 'generate_session_events', new=events),
+            patch.object(EventGenerator, 'generate_tutor_status_changes', new=tutor_changes),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_batch_progress_then_summary(self):
+        """Test one progress update per 1000-event batch and a final summary"""
+        simulator = DataSimulator(event_interval_seconds=300, enrollments_per_cycle=5, sessions_per_cycle=10)
+        patches = self._patched(simulator)
+        for p in patches:
+            p.start()
+        try:
+            updates = [u async for u in simulator.advance_simulation_stream(days=1)]
+        finally:
+            for p in patches:
+                p.stop()
+
+        # 1 day = 288 cycles -> 1440 enrollments (2 batches), 2880 sessions (3 batches)
+        progress = [(u["phase"], u["generated"]) for u in updates if u["event"] == "progress"]
+        assert progress == [
+            ("enrollments", 1000), ("enrollments", 1440),
+            ("sessions", 1000), ("sessions", 2000), ("sessions", 2880),
+        ]
+        assert updates[-1]["event"] == "complete"
+        assert updates[-1]["events_generated"] == {"enrollments": 1440, "sessions": 2880, "tutor_updates": 2}
+
+    @pytest.mark.asyncio
+    async def test_advance_returns_stream_summary(self):
+        """Test the non-streaming call returns the final summary only"""
+        simulator = DataSimulator()
+        patches = self._patched(simulator)
+        for p in patches:
+            p.start()
+        try:
+            result = await simulator.advance_simulation(days=1)
+        finally:
+            for p in patches:
+                p.stop()
+
+        assert "event" not in result
+        assert result["days_advanced"] == 1
+        assert result["new_time"] == datetime(2024, 1, 2).isoformat()
+
+
+class TestSimulationMetrics:
+    """Test ring buffer backed simulation metrics (AC-2)"""
+
+    def test_empty_metrics(self):
+        """Test metrics are zero before any event is generated"""
+        metrics = SimulationMetrics()
+
+        assert metrics.snapshot() == {
+            "events_per_second": 0.0,
+            "avg_event_generation_time_ms": 0.0,
+            "total_events_generated": 0
+        }
+
+    def test_records_totals_and_generation_time(self):
+        """Test totals accumulate and generation time is averaged per event"""
+        metrics = SimulationMetrics()
+
+        metrics.record_events(5, generation_ns=2_000_000)
+        metrics.record_events(15, generation_ns=8_000_000)
+        snapshot = metrics.snapshot()
+
+        assert snapshot["total_events_generated"] == 20
+        assert snapshot["avg_event_generation_time_ms"] == 0.5
+        assert snapshot["events_per_second"] > 0
+
+    def test_ring_wraps_around(self):
+        """Test batches crossing the ring end write both sides of the wrap"""
+        metrics = SimulationMetrics(size=8)
+
+        metrics.record_events(6)
+        metrics._ts_ring[:] = 0
+        metrics.record_events(4)
+
+        assert metrics._ts_ring.tolist().count(0) == 4
+        assert metrics._ts_ring[6] > 0 and metrics._ts_ring[1] > 0
+        assert metrics.snapshot()["total_events_generated"] == 10
+
+    def test_rate_measured_over_generation_interval(self, monkeypatch):
+        """Test one batch reports its generation rate, unchanged while idle"""
+        import app.services.data_simulator as simulator_module
+
+        clock = iter([10_000_000_000])
+        monkeypatch.setattr(simulator_module.time, "monotonic_ns", lambda: next(clock))
+        metrics = SimulationMetrics()
+
+        metrics.record_events(1000, generation_ns=1_000_000_000)
+
+        assert metrics.snapshot()["events_per_second"] == 1000.0
+        assert metrics.snapshot()["events_per_second"] == 1000.0
+
+    def test_instant_batch_has_no_rate(self):
+        """Test events sharing one timestamp report no rate instead of a huge one"""
+        metrics = SimulationMetrics()
+
+        metrics.record_events(1000)
+
+        assert metrics.snapshot()["events_per_second"] == 0.0
+
+    @pytest.mark.parametrize("size", [0, 6, 1000])
+    def test_ring_size_must_be_power_of_two(self, size):
+        """Test sizes the slot mask cannot address are rejected"""
+        with pytest.raises(ValueError):
+            SimulationMetrics(size=size)
+
+    def test_simulator_owns_metrics(self):
+        """Test each simulator tracks its own metrics"""
+        assert isinstance(DataSimulator().metrics, SimulationMetrics)
+
+
 class TestCLIHelpers:
     """Test CLI argument parsing helpers"""
 
@@ -0,0 +1,60 @@
+"""
+Unit tests for DataValidator
+
+Tests quality score formula and concurrent validation of all tables.
+"""
+import asyncio
+
+import pytest
+from app.services.data_validator import DataValidator
+
+
+class TestQualityScore:
+    """Test quality score calculation (AC-3)"""
+
+    def test_score_deducts_per_issue(self):
+        """Test critical and warning weights are applied"""
+        validator = DataValidator()
+
+        assert validator._calculate_quality_score(1, 2) == 70.0
+
+    def test_score_clamped_to_zero(self):
+        """Test score never goes negative"""
+        validator = DataValidator()
+
+        assert validator._calculate_quality_score(10, 0) == 0.0
+
+
+class TestValidateAllTables:
+    """Test validate_all_tables aggregation (AC-3, AC-4, AC-5)"""
+
+    @pytest.mark.asyncio
+    async def test_tables_validated_concurrently_and_saved_once(self, monkeypatch):
+        """Test tables overlap, keep rule order and are saved in one batch"""
+        validator = DataValidator()
+        tables = list(validator.validation_rules.keys())
+        in_flight = 0
+        peak = 0
+        saved = []
+
+        async def fake_validate_table(table_name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            score = 60.0 if table_name == tables[0] else 100.0
+            return {"table_name": table_name, "quality_score": score}
+
+        async def fake_save(results):
+            saved.append(list(results))
+
+        monkeypatch.setattr(validator, "validate_table", fake_validate_table)
+        monkeypatch.setattr(validator, "save_validation_results", fake_save)
+
+        summary = await validator.validate_all_tables()
+
+        assert peak > 1
+        assert [r["table_name"] for r in summary["results"]] == tables
+        assert summary["tables_below_threshold"] == 1
+        assert len(saved) == 1 and len(saved[0]) == len(tables)
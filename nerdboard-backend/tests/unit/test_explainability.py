@@ -0,0 +1,212 @@
+"""
+Unit tests for ExplainabilityEngine
+
+Tests single and batched SHAP explanations and the feature importance fallback.
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml.explainability import (
+    SHAP_AVAILABLE,
+    ExplainabilityEngine,
+    _describe,
+    _top_n_abs,
+    create_explainability_engine,
+)
+
+FEATURE_COLUMNS = [
+    "utilization_current_week",
+    "utilization_trend",
+    "enrollment_velocity",
+    "seasonal_factor",
+    "tutor_count",
+    "session_rate",
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    """Small random forest trained on synthetic shortage data"""
+    rng = np.random.default_rng(0)
+    X = rng.random((200, len(FEATURE_COLUMNS)))
+    y = (X[:, 0] + 0.5 * X[:, 2] > 0.8).astype(int)
+    return RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+
+
+def _features(seed: int):
+    """Feature dict with deterministic values"""
+    rng = np.random.default_rng(seed)
+    return dict(zip(FEATURE_COLUMNS, rng.random(len(FEATURE_COLUMNS)).tolist()))
+
+
+class TestTopNKernel:
+    """Test the per-row top-N selection kernel"""
+
+    def test_matches_sorted_magnitudes(self):
+        """Test indices and magnitudes agree with a full sort per row"""
+        sv = np.random.default_rng(3).normal(size=(16, 9))
+
+        indices, values = _top_n_abs(sv, 4)
+
+        expected = np.argsort(-np.abs(sv), axis=1, kind="stable")[:, :4]
+        assert indices.tolist() == expected.tolist()
+        assert values == pytest.approx(np.take_along_axis(np.abs(sv), expected, axis=1))
+
+    def test_ties_keep_lower_index_first(self):
+        """Test equal magnitudes are ordered by feature index"""
+        indices, values = _top_n_abs(np.array([[0.5, -2.0, 2.0, 0.1]]), 3)
+
+        assert indices.tolist() == [[1, 2, 0]]
+        assert values.tolist() == [[2.0, 2.0, 0.5]]
+
+
+@pytest.mark.skipif(not SHAP_AVAILABLE, reason="SHAP not installed")
+class TestBatchExplanations:
+    """Test explain_predictions_batch against per-row explanations"""
+
+    def test_batch_matches_single_explanations(self, model):
+        """Test batching yields the same features and values as single calls"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS)
+        features_list = [_features(seed) for seed in range(4)]
+
+        batch = engine.explain_predictions_batch(features_list, top_n=3)
+
+        assert len(batch) == len(features_list)
+        for features, explanation in zip(features_list, batch):
+            single = engine.explain_prediction(features, top_n=3)
+            assert [f["feature"] for f in explanation] == [f["feature"] for f in single]
+            assert [f["shap_value"] for f in explanation] == pytest.approx(
+                [f["shap_value"] for f in single]
+            )
+
+    def test_rows_sorted_by_absolute_shap(self, model):
+        """Test each row's top features are in descending importance"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS)
+
+        explanation = engine.explain_predictions_batch([_features(7)], top_n=len(FEATURE_COLUMNS) + 2)[0]
+
+        importances = [f["importance"] for f in explanation]
+        assert len(explanation) == len(FEATURE_COLUMNS)
+        assert importances == sorted(importances, reverse=True)
+        assert all(f["readable_description"] for f in explanation)
+
+    def test_output_layout_detected_at_init(self, model):
+        """Test the probed extractor yields positive class (rows, features) values"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS)
+        feature_row = np.zeros((2, len(FEATURE_COLUMNS)))
+
+        values = engine._extract_positive(engine.explainer.shap_values(feature_row))
+
+        assert np.shape(values) == (2, len(FEATURE_COLUMNS))
+
+    def test_mismatched_columns_skip_shap(self, model):
+        """Test a column list narrower than the model never reaches SHAP"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS[:3])
+
+        assert engine.explainer is None
+        assert len(engine.explain_prediction(_features(5), top_n=5)) == 3
+
+    def test_empty_batch(self, model):
+        """Test empty input returns empty output"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS)
+
+        assert engine.explain_predictions_batch([]) == []
+
+
+class TestFeatureImportanceFallback:
+    """Test explanations without a SHAP explainer"""
+
+    def test_batch_without_explainer_uses_fallback(self):
+        """Test each row falls back to feature values when no model is set"""
+        engine = ExplainabilityEngine(None, FEATURE_COLUMNS)
+        features = {"utilization_trend": 4.0, "enrollment_velocity": -0.2, "tutor_count": 12.0}
+
+        batch = engine.explain_predictions_batch([features], top_n=2)
+
+        assert [f["feature"] for f in batch[0]] == ["tutor_count", "utilization_trend"]
+
+    def test_importance_path_defaults_missing_features(self, model):
+        """Test model importance path maps dicts in column order with 0 defaults"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS)
+        engine.explainer = None
+
+        explanation = engine.explain_prediction({"utilization_current_week": 2.0}, top_n=len(FEATURE_COLUMNS))
+
+        values = {f["feature"]: f["feature_value"] for f in explanation}
+        assert values["utilization_current_week"] == 2.0
+        assert values["tutor_count"] == 0.0
+
+    def test_importance_path_ranks_by_model_importance(self, model):
+        """Test top N follow feature_importances_ with importance x value contributions"""
+        engine = ExplainabilityEngine(model, FEATURE_COLUMNS)
+        engine.explainer = None
+        features = _features(11)
+
+        explanation = engine.explain_prediction(features, top_n=3)
+
+        importances = model.feature_importances_
+        expected = sorted(range(len(FEATURE_COLUMNS)), key=lambda i: importances[i], reverse=True)[:3]
+        assert [f["feature"] for f in explanation] == [FEATURE_COLUMNS[i] for i in expected]
+        for f in explanation:
+            i = FEATURE_COLUMNS.index(f["feature"])
+            assert f["shap_value"] == pytest.approx(importances[i] * features[f["feature"]])
+
+
+class TestReadableDescriptions:
+    """Test feature name to description dispatch"""
+
+    def test_suffixed_feature_names_match_rules(self):
+        """Test substring rules apply to windowed feature names"""
+        engine = ExplainabilityEngine(None, ["session_rate_7d", "seasonal_factor"])
+
+        assert engine._get_readable_description("session_rate_7d", 3.25, 0.1) == (
+            "Session booking rate: 3.2 sessions/day (increasing shortage risk)"
+        )
+        assert engine._get_readable_description("seasonal_factor", 1.5, -0.1) == (
+            "Seasonal spike: 150% of yearly average (decreasing shortage risk)"
+        )
+
+    def test_inactive_season_flag_falls_through_to_generic(self):
+        """Test conditional rules fall through when they do not apply"""
+        engine = ExplainabilityEngine(None, ["is_summer_season"])
+
+        assert engine._get_readable_description("is_summer_season", 1.0, 0.2) == (
+            "Summer season (typically lower demand) (increasing shortage risk)"
+        )
+        assert engine._get_readable_description("is_summer_season", 0.0, 0.2) == (
+            "Is Summer Season: 0.00 (increasing shortage risk)"
+        )
+
+    def test_unknown_feature_uses_generic_description(self):
+        """Test names without a matching rule get the generic description"""
+        engine = ExplainabilityEngine(None, [])
+
+        assert engine._get_readable_description("avg_tutor_utilization", 0.5, 0.0) == (
+            "Avg Tutor Utilization: 0.50 (decreasing shortage risk)"
+        )
+
+    def test_descriptions_are_cached_per_exact_value(self):
+        """Test repeated values hit the cache without merging nearby values"""
+        engine = ExplainabilityEngine(None, ["enrollment_velocity"])
+        _describe.cache_clear()
+
+        first = engine._get_readable_description("enrollment_velocity", 0.123, 0.2)
+        again = engine._get_readable_description("enrollment_velocity", 0.123, 0.3)
+        nearby = engine._get_readable_description("enrollment_velocity", 0.14, 0.3)
+
+        assert first == again == "Enrollment spike detected: +12.3% week-over-week (increasing shortage risk)"
+        assert nearby == "Enrollment spike detected: +14.0% week-over-week (increasing shortage risk)"
+        assert _describe.cache_info().hits == 1
+
+
+class TestEngineFactory:
+    """Test create_explainability_engine reuse"""
+
+    def test_engine_reused_for_same_model(self, model):
+        """Test the explainer is built and warmed once per model"""
+        engine = create_explainability_engine(model, FEATURE_COLUMNS)
+
+        assert create_explainability_engine(model, list(FEATURE_COLUMNS)) is engine
+        assert create_explainability_engine(model, FEATURE_COLUMNS[:3]) is not engine
+        assert create_explainability_engine(None, FEATURE_COLUMNS) is not engine
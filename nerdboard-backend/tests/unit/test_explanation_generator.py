@@ -0,0 +1,194 @@
+"""
+Unit tests for ExplanationGenerator
+
+Tests template-based statement, factor and recommendation text.
+"""
+import pytest
+
+from app.ml.explanation_generator import ExplanationGenerator, _timeframe_bucket
+
+
+class TestMainStatement:
+    """Test main prediction statement templates"""
+
+    def test_high_probability_high_severity(self):
+        """Test certainty, severity and week-count phrasing"""
+        generator = ExplanationGenerator()
+
+        statement = generator._generate_main_statement("Physics", 82.4, 21, "high")
+
+        assert statement == (
+            "Based on current trends, Physics tutoring capacity will likely experience "
+            "severe capacity shortage in about 3 weeks (estimated 82% probability)."
+        )
+
+    def test_unknown_severity_and_low_probability(self):
+        """Test fallback severity wording and low certainty phrasing"""
+        generator = ExplanationGenerator()
+
+        statement = generator._generate_main_statement("Art", 12.0, 5, "extreme")
+
+        assert statement == (
+            "Based on current trends, Art tutoring capacity has a low probability to experience "
+            "capacity shortage within the next week (estimated 12% probability)."
+        )
+
+    def test_subject_with_braces_is_not_formatted(self):
+        """Test subject text is inserted literally"""
+        generator = ExplanationGenerator()
+
+        statement = generator._generate_main_statement("C{++}", 55.0, 10, "medium")
+
+        assert statement.startswith("Based on current trends, C{++} tutoring capacity may experience")
+
+    @pytest.mark.parametrize("days,expected", [
+        (7, ("week", 7)),
+        (14, ("days", 14)),
+        (30, ("weeks", 4)),
+        (75, ("months", 2)),
+    ])
+    def test_timeframe_buckets(self, days, expected):
+        """Test bucket boundaries"""
+        assert _timeframe_bucket(days) == expected
+
+
+class TestSections:
+    """Test factor and recommendation sections"""
+
+    def test_factors_numbered_without_impact_suffix(self):
+        """Test top 3 factors are listed and cleaned"""
+        generator = ExplanationGenerator()
+        features = [
+            {"readable_description": "Tutor availability: 3 tutors (decreasing shortage risk)"},
+            {"readable_description": "Enrollment rate: 4.0 students/day (increasing shortage risk)"},
+            {},
+            {"readable_description": "Ignored fourth factor"},
+        ]
+
+        assert generator._generate_factors_section(features) == (
+            "This prediction is primarily driven by:\n"
+            "1. Tutor availability: 3 tutors\n"
+            "2. Enrollment rate: 4.0 students/day\n"
+            "3. Unknown factor"
+        )
+
+    def test_recommendation_urgency(self):
+        """Test recommendation selection by timeframe, severity and probability"""
+        generator = ExplanationGenerator()
+
+        assert generator._generate_recommendation(5, "high", 40).startswith("⚠️ URGENT")
+        assert generator._generate_recommendation(12, "medium", 75).startswith("Action recommended")
+        assert generator._generate_recommendation(12, "medium", 60).startswith("Monitor closely")
+        assert generator._generate_recommendation(45, "high", 90).startswith("Advance notice")
+
+    def test_confidence_reasoning_combinations(self):
+        """Test reasoning phrases join in fixed order and levels follow the score"""
+        import numpy as np
+
+        generator = ExplanationGenerator()
+
+        def section(score, certainty, quality, pattern):
+            return generator._generate_confidence_section({
+                "confidence_score": score,
+                "breakdown": {"model_certainty": certainty, "data_quality": quality, "pattern_strength": pattern},
+            })
+
+        assert section(85, 70, 80, 70) == (
+            "We have high confidence in this prediction (85%) based on "
+            "strong statistical correlation, high data quality, clear trend patterns."
+        )
+        assert section(np.float32(80.0), 0, 0, 75) == (
+            "We have high confidence in this prediction (80%) based on clear trend patterns."
+        )
+        assert section(59.6, 10, 95, 10) == (
+            "We have limited confidence in this prediction (60%) based on high data quality."
+        )
+        assert section(72, 69, 79, 69) == "Confidence in this prediction is 72%."
+
+
+class TestHistoricalContext:
+    """Test seasonal historical context dispatch"""
+
+    def test_first_notable_seasonal_feature_wins(self):
+        """Test normal seasonal factor falls through to the next seasonal feature"""
+        generator = ExplanationGenerator()
+        features = [
+            {"feature": "tutor_count", "feature_value": 3.0},
+            {"feature": "seasonal_factor", "feature_value": 1.0},
+            {"feature": "is_back_to_school_season", "feature_value": 1.0},
+        ]
+
+        assert generator._generate_historical_context("Math", features).startswith(
+            "This pattern is consistent with historical back-to-school"
+        )
+
+    def test_summer_flag_has_context(self):
+        """Test summer season feature produces summer context"""
+        generator = ExplanationGenerator()
+
+        assert generator._generate_historical_context(
+            "Math", [{"feature": "is_summer_season", "feature_value": 1.0}]
+        ).startswith("This forecast accounts for typical summer enrollment patterns")
+
+    def test_seasonal_factor_surge(self):
+        """Test above-normal seasonal factor wording"""
+        generator = ExplanationGenerator()
+
+        assert generator._generate_historical_context(
+            "Math", [{"feature": "seasonal_factor", "feature_value": 1.35}]
+        ) == (
+            "Current enrollment is 135% of the yearly average, "
+            "indicating an above-normal seasonal surge."
+        )
+
+    def test_non_seasonal_features_have_no_context(self):
+        """Test related but unhandled names are ignored"""
+        generator = ExplanationGenerator()
+
+        assert generator._generate_historical_context(
+            "Math", [{"feature": "known_seasonal_multiplier", "feature_value": 1.3}]
+        ) == ""
+
+
+class TestExplanationCache:
+    """Test explanation memoization by canonical signature"""
+
+    CONFIDENCE = {"confidence_score": 72.3, "breakdown": {"model_certainty": 75, "data_quality": 90, "pattern_strength": 40}}
+    FEATURES = [{"feature": "tutor_count", "feature_value": 4, "readable_description": "Tutor availability: 4 tutors"}]
+
+    def _explain(self, generator, probability, confidence=None):
+        prediction = {"shortage_probability": probability, "days_until_shortage": 10, "severity": "high"}
+        return generator.generate_explanation("Math", prediction, confidence or self.CONFIDENCE, self.FEATURES)
+
+    def test_same_rendered_inputs_share_an_entry(self):
+        """Test probabilities rendering to the same text reuse the cached explanation"""
+        generator = ExplanationGenerator()
+
+        first = self._explain(generator, 0.8121)
+        second = self._explain(generator, 0.8149)
+
+        assert first is second
+        assert len(generator._cache) == 1
+
+    def test_threshold_crossing_is_not_merged(self):
+        """Test 69.6% and 70.2% both render as 70% but keep distinct wording"""
+        generator = ExplanationGenerator()
+
+        below = self._explain(generator, 0.696)
+        above = self._explain(generator, 0.702)
+
+        assert "capacity may experience" in below
+        assert "capacity will likely experience" in above
+        assert below == ExplanationGenerator()._build_explanation(
+            "Math", 69.6, 10, "high", self.CONFIDENCE, self.FEATURES, ""
+        )
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """Test least recently used entries are evicted"""
+        monkeypatch.setattr("app.ml.explanation_generator.EXPLANATION_CACHE_SIZE", 2)
+        generator = ExplanationGenerator()
+
+        for probability in (0.1, 0.2, 0.3):
+            self._explain(generator, probability)
+
+        assert len(generator._cache) == 2
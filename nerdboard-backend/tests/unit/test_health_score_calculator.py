@@ -3,8 +3,17 @@ Unit tests for HealthScoreCalculator
 
 Tests health score formula, component calculations, churn risk detection logic.
 """
+import asyncio
+
 import pytest
-from app.services.health_score_calculator import HealthScoreCalculator
+from app.services.health_score_calculator import (
+    HealthScoreCalculator,
+    _classify_churn_risk,
+    _ib_calls_from_penalty,
+    _ib_penalty_for_calls,
+    _normalize_session_velocity,
+    _scale_engagement_score,
+)
 
 
 class TestHealthScoreFormula:
@@ -337,3 +346,74 @@ class TestEdgeCases:
             scaled = engagement_score * 100
 
         assert scaled == 0.0
+
+
+class TestComponentHelpers:
+    """Test pure component helpers shared by the batched breakdown query"""
+
+    def test_normalize_session_velocity(self):
+        """Test 30-day session count normalization and cap"""
+        assert _normalize_session_velocity(0) == 0.0
+        assert _normalize_session_velocity(15) == 70.0
+        assert _normalize_session_velocity(100) == 100.0
+
+    def test_ib_penalty_round_trip(self):
+        """Test IB calls map to penalty and back (capped at 2)"""
+        for calls, penalty, capped in [(0, 0.0, 0), (1, 20.0, 1), (2, 50.0, 2), (5, 50.0, 2)]:
+            assert _ib_penalty_for_calls(calls) == penalty
+            assert _ib_calls_from_penalty(penalty) == capped
+
+    def test_scale_engagement_score(self):
+        """Test engagement scaling with missing enrollment"""
+        assert _scale_engagement_score(None) == 0.0
+        assert _scale_engagement_score(0.8) == 80.0
+
+    def test_classify_churn_risk(self):
+        """Test churn risk thresholds"""
+        assert _classify_churn_risk(2, 80.0) == "high"
+        assert _classify_churn_risk(0, 30.0) == "high"
+        assert _classify_churn_risk(1, 80.0) == "medium"
+        assert _classify_churn_risk(0, 50.0) == "medium"
+        assert _classify_churn_risk(0, 80.0) == "low"
+
+    def test_apply_formula(self):
+        """Test weighted formula matches manual calculation"""
+        calculator = HealthScoreCalculator()
+
+        assert calculator._apply_formula(100.0, 65.0, 0.0, 80.0) == 87.5
+
+
+class TestBatchHealthRow:
+    """Test per-customer row built for the batch upsert (AC-2)"""
+
+    @pytest.mark.asyncio
+    async def test_health_row_from_breakdown(self, monkeypatch):
+        """Test row carries score and integer engagement level"""
+        calculator = HealthScoreCalculator()
+
+        async def fake_breakdown(customer_id):
+            return {
+                "health_score": 72.5,
+                "churn_risk": "low",
+                "components": {"ib_penalty": 0.0, "engagement_score": 80.6}
+            }
+
+        monkeypatch.setattr(calculator, "get_full_health_breakdown", fake_breakdown)
+
+        row = await calculator._calculate_health_row("C001", asyncio.Semaphore(1))
+
+        assert row == {"customer_id": "C001", "health_score": 72.5, "engagement_level": 80}
+
+    @pytest.mark.asyncio
+    async def test_failed_upsert_counts_no_rows_saved(self, monkeypatch):
+        """Test upsert errors are logged and reported as zero saved rows"""
+        calculator = HealthScoreCalculator()
+
+        async def failing_save(rows, date):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(calculator, "save_health_metrics", failing_save)
+
+        rows = [{"customer_id": "C001", "health_score": 72.5, "engagement_level": 80}]
+
+        assert await calculator._save_health_rows(rows, None) == 0
@@ -0,0 +1,74 @@
+"""
+Unit tests for the demo scenario loader
+
+Tests scenario rows are sent as bulk Core inserts and committed once.
+"""
+import pytest
+
+from app.scripts import load_demo
+
+
+class FakeSession:
+    """Async session stand-in recording executemany inserts and commits"""
+
+    def __init__(self):
+        self.inserts = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.inserts.append((statement.table.name, params))
+
+    async def commit(self):
+        self.commits += 1
+
+
+class TestScenarioLoaders:
+    """Test scenario loaders insert rows in bulk"""
+
+    @pytest.mark.asyncio
+    async def test_physics_shortage_sessions_reference_tutors(self, monkeypatch):
+        """Test tutor ids are assigned up front and reused by sessions"""
+        session = FakeSession()
+        monkeypatch.setattr(load_demo, "AsyncSessionLocal", lambda: session)
+
+        await load_demo.load_physics_shortage_scenario()
+
+        (tutor_table, tutors), (session_table, sessions) = session.inserts
+        assert (tutor_table, len(tutors)) == ("tutors", 20)
+        assert (session_table, len(sessions)) == ("sessions", 90)
+        assert {s["tutor_id"] for s in sessions} == {t["id"] for t in tutors}
+        assert session.commits == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("loader,expected", [
+        (load_demo.load_sat_spike_scenario, [("tutors", 15), ("enrollments", 220)]),
+        (load_demo.load_churn_risk_scenario, [("enrollments", 5), ("health_metrics", 10)]),
+    ])
+    async def test_one_insert_per_table(self, monkeypatch, loader, expected):
+        """Test each table gets a single executemany and one commit overall"""
+        session = FakeSession()
+        monkeypatch.setattr(load_demo, "AsyncSessionLocal", lambda: session)
+
+        await loader()
+
+        assert [(table, len(rows)) for table, rows in session.inserts] == expected
+        assert session.commits == 1
+
+
+class TestUuidBatch:
+    """Test batched UUID generation"""
+
+    def test_version_4_and_unique(self):
+        """Test ids carry the uuid4 version and variant bits"""
+        import uuid
+
+        ids = load_demo._uuid4_batch(220)
+
+        assert len(set(ids)) == 220
+        assert all(u.version == 4 and u.variant == uuid.RFC_4122 for u in ids)
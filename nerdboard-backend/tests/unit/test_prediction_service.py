@@ -0,0 +1,146 @@
+"""
+Unit tests for PredictionService
+
+Tests the batched all-subjects prediction run against stubbed pipeline stages.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import prediction_service as service_module
+from app.services.prediction_service import PredictionService
+
+
+class FakeSession:
+    """Async session stand-in returning the subject list"""
+
+    def __init__(self, subjects):
+        self.subjects = subjects
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        rows = [SimpleNamespace(subject=subject) for subject in self.subjects]
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+class FakeEngineer:
+    """Feature engineer stand-in tracking concurrent extractions"""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def extract_features_for_subject(self, subject):
+        self.calls.append(subject)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        if subject == "Subject 3":
+            raise RuntimeError("no data")
+        return {"index": float(subject[-1])}
+
+
+class FakeBatchStages:
+    """Predictor, confidence calculator and explainer recording batch calls"""
+
+    def __init__(self):
+        self.model = object()
+        self.feature_columns = ["index"]
+        self.calls = []
+
+    def predict_shortage_batch(self, feature_batch, horizons):
+        self.calls.append(("predict", len(feature_batch)))
+        return [
+            {"shortage_probability": features["index"] / 10, "horizon": horizon}
+            for features, horizon in zip(feature_batch, horizons)
+        ]
+
+    async def batch_calculate_confidence(self, subjects, probabilities, features_list):
+        self.calls.append(("confidence", len(subjects)))
+        return [SimpleNamespace(to_dict=lambda p=p: {"confidence_score": p * 100}) for p in probabilities]
+
+    def explain_predictions_batch(self, features_list, top_n=5):
+        self.calls.append(("explain", len(features_list)))
+        return [[{"feature": "index", "value": features["index"]}] for features in features_list]
+
+
+class TestAllSubjects:
+    """Test the batched prediction run across subjects"""
+
+    @pytest.mark.asyncio
+    async def test_stages_run_once_per_batch(self, monkeypatch):
+        """Test features once per subject, one model/confidence/SHAP call, bounded concurrency"""
+        subjects = [f"Subject {i}" for i in range(5)]
+        engineer = FakeEngineer()
+        stages = FakeBatchStages()
+        monkeypatch.setattr(service_module, "AsyncSessionLocal", lambda: FakeSession(subjects))
+        monkeypatch.setattr(service_module, "PREDICTION_CONCURRENCY", 2)
+        monkeypatch.setattr(service_module, "get_feature_engineer", lambda: engineer)
+        monkeypatch.setattr(service_module, "get_shortage_predictor", lambda: stages)
+        monkeypatch.setattr(service_module, "get_confidence_calculator", lambda: stages)
+        monkeypatch.setattr(service_module, "create_explainability_engine", lambda model, columns: stages)
+        service = PredictionService()
+        finalized = []
+
+        async def fake_finalize(subject, horizon, prediction, confidence, top_features):
+            finalized.append((subject, horizon, prediction["shortage_probability"], confidence, top_features))
+            # Only the 2week horizon of even-numbered subjects is created
+            return {"subject": subject} if horizon == "2week" and int(subject[-1]) % 2 == 0 else None
+
+        monkeypatch.setattr(service, "_finalize_prediction", fake_finalize)
+
+        summary = await service.generate_predictions_for_all_subjects(["2week", "4week"])
+
+        assert sorted(engineer.calls) == subjects
+        assert engineer.peak == 2
+        assert stages.calls == [("predict", 8), ("confidence", 8), ("explain", 4)]
+        assert ("Subject 2", "4week", 0.2, {"confidence_score": 20.0}, [{"feature": "index", "value": 2.0}]) in finalized
+        assert len(finalized) == 8
+        assert summary["subjects_analyzed"] == 5
+        assert summary["predictions_created"] == 3
+        assert summary["predictions_by_subject"] == {
+            "Subject 0": 1, "Subject 1": 0, "Subject 2": 1, "Subject 3": 0, "Subject 4": 1
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_creates_nothing(self, monkeypatch):
+        """Test a failing model call is logged and reported as zero predictions"""
+        stages = FakeBatchStages()
+
+        def fail(feature_batch, horizons):
+            raise ValueError("Model not loaded")
+
+        stages.predict_shortage_batch = fail
+        monkeypatch.setattr(service_module, "AsyncSessionLocal", lambda: FakeSession(["Math"]))
+        monkeypatch.setattr(service_module, "get_feature_engineer", lambda: FakeEngineer())
+        monkeypatch.setattr(service_module, "get_shortage_predictor", lambda: stages)
+
+        summary = await PredictionService().generate_predictions_for_all_subjects(["2week"])
+
+        assert summary["predictions_by_subject"] == {"Math": 0}
+
+
+class TestStorageStatements:
+    """Test JSON parameters on the insert statements"""
+
+    def test_json_documents_bound_as_jsonb(self):
+        """Test dicts and lists are bound as JSONB and encoded by the engine"""
+        import numpy as np
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        from app.database import engine
+
+        prediction = service_module._Q_INSERT_PREDICTION.compile(dialect=engine.dialect)
+        explanation = service_module._Q_INSERT_EXPLANATION.compile(dialect=engine.dialect)
+
+        assert isinstance(prediction.binds["confidence_breakdown"].type, JSONB)
+        assert isinstance(explanation.binds["top_features"].type, JSONB)
+        assert engine.dialect._json_serializer({"model_certainty": np.float64(72.5)}) == '{"model_certainty":72.5}'
@@ -0,0 +1,133 @@
+"""
+Unit tests for predictions routes
+
+Tests keyset pagination cursor encoding, predicate building and page meta.
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.routes.predictions import _decode_cursor, _encode_cursor, _keyset_clause, _page_meta
+
+
+class TestKeysetCursor:
+    """Test cursor round-trip and validation"""
+
+    def test_priority_cursor_round_trip(self):
+        """Test float sort key and prediction_id survive encoding"""
+        row = {"priority_score": 87.5, "prediction_id": "pred_042"}
+
+        cursor = _encode_cursor("priority_desc", row)
+
+        assert _decode_cursor(cursor, "priority_desc") == (87.5, "pred_042")
+
+    def test_date_cursor_round_trip(self):
+        """Test datetime sort key is restored as datetime"""
+        shortage_date = datetime(2025, 12, 1, 9, 0, tzinfo=timezone.utc)
+        row = {"predicted_shortage_date": shortage_date, "prediction_id": "pred_007"}
+
+        cursor = _encode_cursor("date_desc", row)
+
+        assert _decode_cursor(cursor, "date_desc") == (shortage_date, "pred_007")
+
+    def test_cursor_for_other_sort_rejected(self):
+        """Test cursor cannot be reused with a different sort"""
+        row = {"priority_score": 50.0, "prediction_id": "pred_001"}
+        cursor = _encode_cursor("priority_desc", row)
+
+        with pytest.raises(ValueError):
+            _decode_cursor(cursor, "confidence_desc")
+
+    def test_malformed_cursor_rejected(self):
+        """Test garbage cursor raises ValueError"""
+        with pytest.raises(ValueError):
+            _decode_cursor("not-a-cursor", "priority_desc")
+
+
+class TestKeysetClause:
+    """Test keyset predicate per sort order"""
+
+    def test_descending_sort_uses_less_than(self):
+        """Test row comparison direction for descending sorts"""
+        assert _keyset_clause("priority_desc", 50.0) == (
+            "(priority_score, prediction_id) < (:cursor_value, :cursor_id)"
+        )
+
+    def test_ascending_sort_uses_greater_than(self):
+        """Test row comparison direction for ascending sorts"""
+        assert _keyset_clause("priority_asc", 50.0) == (
+            "(priority_score, prediction_id) > (:cursor_value, :cursor_id)"
+        )
+
+    def test_null_date_cursor_stays_in_null_tail(self):
+        """Test NULLS LAST tail only pages through NULL dates"""
+        assert "IS NULL AND prediction_id < :cursor_id" in _keyset_clause("date_desc", None)
+
+
+class TestPageMeta:
+    """Test pagination meta block"""
+
+    def test_pages_round_up(self):
+        """Test partial last page counts as a page"""
+        meta = _page_meta(total=41, limit=20, offset=40, next_cursor=None)
+
+        assert meta["pages"] == 3
+        assert meta["page"] == 3
+
+    def test_empty_result_has_no_pages(self):
+        """Test zero rows yields zero pages"""
+        meta = _page_meta(total=0, limit=20, offset=0, next_cursor=None)
+
+        assert meta["pages"] == 0
+        assert meta["page"] == 1
+
+    def test_cursor_page_has_no_position(self):
+        """Test cursor pages report null offset and page"""
+        meta = _page_meta(total=41, limit=20, offset=None, next_cursor="abc")
+
+        assert (meta["offset"], meta["page"], meta["pages"]) == (None, None, 3)
+
+
+class TestListQueries:
+    """Test list statement shapes"""
+
+    def test_cursor_page_seeks_without_window(self):
+        """Test keyset predicate sits beside the filters with no window or offset"""
+        from app.api.routes.predictions import _predictions_list_queries
+
+        keyset_sql = _keyset_clause("priority_desc", 50.0)
+        query, _ = _predictions_list_queries(True, False, False, None, "priority_desc", keyset_sql)
+        sql = " ".join(str(query).split())
+
+        assert f"WHERE status = :status AND subject = :subject AND {keyset_sql} ORDER BY" in sql
+        assert "OVER" not in sql
+        assert "OFFSET" not in sql
+
+    def test_offset_page_carries_total(self):
+        """Test offset pages count the filtered set with a window"""
+        from app.api.routes.predictions import _predictions_list_queries
+
+        query, _ = _predictions_list_queries(False, False, False, None, "priority_desc", "TRUE")
+        sql = " ".join(str(query).split())
+
+        assert "COUNT(*) OVER () as total FROM predictions WHERE status = :status ORDER BY" in sql
+        assert "LIMIT :limit OFFSET :offset" in sql
+
+
+class TestListValidation:
+    """Test list endpoint parameter validation"""
+
+    @pytest.mark.asyncio
+    async def test_unknown_status_rejected_before_query(self):
+        """Test statuses outside the enum are a 400, without touching the database"""
+        from fastapi import HTTPException
+
+        from app.api.routes.predictions import get_predictions
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_predictions(
+                subject=None, urgency=None, horizon=None, confidence_min=None, status="archived",
+                sort="priority_desc", limit=20, offset=0, cursor=None, session=None
+            )
+
+        assert exc_info.value.status_code == 400
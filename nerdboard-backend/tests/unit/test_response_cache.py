@@ -0,0 +1,188 @@
+"""
+Unit tests for ResponseCache
+
+Tests TTL expiry, namespace invalidation, the cached_response decorator,
+and content and row-version ETag revalidation.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.responses import ORJSONResponse
+
+from starlette.requests import Request
+
+from app.api.cache import (
+    ResponseCache,
+    cached_response,
+    conditional_response,
+    get_response_cache,
+    not_modified,
+    set_etag,
+    version_etag,
+)
+
+
+class TestResponseCache:
+    """Test TTL cache storage and invalidation"""
+
+    def test_get_returns_stored_value(self):
+        """Test value is returned within TTL"""
+        cache = ResponseCache()
+        cache.set(("ns", "key"), {"value": 1}, ttl=60)
+
+        assert cache.get(("ns", "key")) == {"value": 1}
+
+    def test_expired_entry_returns_none(self):
+        """Test value expires after TTL"""
+        cache = ResponseCache()
+        cache.set(("ns", "key"), {"value": 1}, ttl=-1)
+
+        assert cache.get(("ns", "key")) is None
+
+    def test_invalidate_only_drops_namespace(self):
+        """Test invalidation is scoped to a namespace"""
+        cache = ResponseCache()
+        cache.set(("dashboard", "a"), 1, ttl=60)
+        cache.set(("dashboard", "b"), 2, ttl=60)
+        cache.set(("health", "a"), 3, ttl=60)
+
+        removed = cache.invalidate("dashboard")
+
+        assert removed == 2
+        assert cache.get(("dashboard", "a")) is None
+        assert cache.get(("health", "a")) == 3
+
+
+class TestCachedResponseDecorator:
+    """Test endpoint decorator behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self):
+        """Test wrapped coroutine only runs once within TTL"""
+        get_response_cache().clear()
+        calls = []
+
+        @cached_response("test", ttl=60)
+        async def endpoint(subject: str):
+            calls.append(subject)
+            return {"subject": subject}
+
+        assert await endpoint(subject="Physics") == {"subject": "Physics"}
+        assert await endpoint(subject="Physics") == {"subject": "Physics"}
+        assert await endpoint(subject="Math") == {"subject": "Math"}
+
+        assert calls == ["Physics", "Math"]
+
+    @pytest.mark.asyncio
+    async def test_exceptions_are_not_cached(self):
+        """Test failures are retried on next call"""
+        get_response_cache().clear()
+        calls = []
+
+        @cached_response("test", ttl=60)
+        async def endpoint():
+            calls.append(1)
+            raise RuntimeError("db down")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await endpoint()
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_response_object_is_reissued(self):
+        """Test cache hits return a fresh Response with the same body"""
+        get_response_cache().clear()
+
+        @cached_response("test", ttl=60)
+        async def endpoint():
+            return ORJSONResponse({"value": 1})
+
+        first = await endpoint()
+        first.raw_headers.append((b"vary", b"Origin"))
+        second = await endpoint()
+
+        assert second is not first
+        assert second.body == first.body
+        assert second.media_type == "application/json"
+        assert (b"vary", b"Origin") not in second.raw_headers
+
+    @pytest.mark.asyncio
+    async def test_cached_response_keeps_headers(self):
+        """Test cache hits keep headers set by the endpoint"""
+        get_response_cache().clear()
+
+        @cached_response("test", ttl=60)
+        async def endpoint():
+            return set_etag(ORJSONResponse({"value": 1}), max_age=60)
+
+        first = await endpoint()
+        second = await endpoint()
+
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["cache-control"] == "public, max-age=60"
+
+
+def _request(headers=None) -> Request:
+    """Build a bare GET request with the given headers"""
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class TestConditionalResponse:
+    """Test ETag / If-None-Match handling"""
+
+    def test_etag_depends_on_body(self):
+        """Test different bodies produce different ETags"""
+        a = set_etag(ORJSONResponse({"value": 1}), max_age=60)
+        b = set_etag(ORJSONResponse({"value": 2}), max_age=60)
+
+        assert a.headers["etag"] != b.headers["etag"]
+
+    def test_matching_if_none_match_returns_304(self):
+        """Test revalidation with current ETag short-circuits"""
+        response = set_etag(ORJSONResponse({"value": 1}), max_age=60)
+        request = _request({"If-None-Match": response.headers["etag"]})
+
+        result = conditional_response(request, response)
+
+        assert result.status_code == 304
+        assert result.body == b""
+        assert result.headers["etag"] == response.headers["etag"]
+
+    def test_stale_if_none_match_returns_full_response(self):
+        """Test mismatched ETag returns the full response"""
+        response = set_etag(ORJSONResponse({"value": 1}), max_age=60)
+
+        assert conditional_response(_request({"If-None-Match": '"stale"'}), response) is response
+        assert conditional_response(_request(), response) is response
+
+
+class TestVersionEtag:
+    """Test row-version ETag revalidation"""
+
+    def test_etag_changes_with_version(self):
+        """Test sub-second updates produce distinct weak ETags"""
+        first = version_etag(datetime(2025, 11, 8, 14, 35, 0, 1, tzinfo=timezone.utc))
+        second = version_etag(datetime(2025, 11, 8, 14, 35, 0, 2, tzinfo=timezone.utc))
+
+        assert first.startswith('W/"')
+        assert first != second
+
+    def test_not_modified_on_match(self):
+        """Test matching If-None-Match yields an empty 304"""
+        etag = version_etag(datetime(2025, 11, 8, tzinfo=timezone.utc))
+
+        result = not_modified(_request({"If-None-Match": etag}), etag)
+
+        assert result.status_code == 304
+        assert result.headers["etag"] == etag
+
+    def test_no_short_circuit_without_match(self):
+        """Test missing or unknown ETags fall through"""
+        etag = version_etag(datetime(2025, 11, 8, tzinfo=timezone.utc))
+
+        assert not_modified(_request({"If-None-Match": '"stale"'}), etag) is None
+        assert not_modified(_request(), etag) is None
+        assert not_modified(_request({"If-None-Match": etag}), None) is None
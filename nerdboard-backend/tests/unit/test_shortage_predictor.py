@@ -0,0 +1,419 @@
+"""
+Unit tests for ShortagePredictor
+
+Tests training data preparation against a stubbed database session.
+"""
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.ml import shortage_predictor as predictor_module
+from app.ml.shortage_predictor import ShortagePredictor
+
+
+class FakeSession:
+    """Async session stand-in returning canned results in order and recording queries"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+        rows = self.results.pop(0)
+        return SimpleNamespace(fetchall=lambda: rows)
+
+    async def stream(self, statement, params=None, execution_options=None):
+        self.executed.append((statement, params))
+        rows = self.results.pop(0)
+        size = execution_options["yield_per"]
+
+        async def partitions():
+            for start in range(0, len(rows), size):
+                yield rows[start:start + size]
+
+        return SimpleNamespace(partitions=partitions)
+
+
+def _keys(*names):
+    """Rows as returned by the feature key query"""
+    return [SimpleNamespace(key=name) for name in names]
+
+
+class TestPrepareTrainingData:
+    """Test training data preparation"""
+
+    @pytest.mark.asyncio
+    async def test_typed_rows_labelled_in_one_training_query(self, monkeypatch):
+        """Test feature keys shape one jsonb_to_record query yielding features and labels"""
+        session = FakeSession(
+            _keys("tutor_count", "utilization_trend"),
+            [(0.97, 4.0, 2.0), (0.5, 6.0, None), (Decimal("0.95"), 5.0, 0.5)],
+        )
+        monkeypatch.setattr(predictor_module, "AsyncSessionLocal", lambda: session)
+        predictor = ShortagePredictor(model_path="unused.pkl")
+
+        X, y = await predictor.prepare_training_data(horizon_days=28)
+
+        assert len(session.executed) == 2
+        training_query, params = session.executed[1]
+        assert 'AS f("tutor_count" float8, "utilization_trend" float8)' in str(training_query)
+        assert params == {"horizon_days": 28}
+        assert y.tolist() == [1, 0, 1]
+        assert y.name == "target"
+        assert X.columns.tolist() == ["tutor_count", "utilization_trend"]
+        assert X["tutor_count"].tolist() == [4.0, 6.0, 5.0]
+        assert X["utilization_trend"].isna().tolist() == [False, True, False]
+        assert predictor.feature_columns == ["tutor_count", "utilization_trend"]
+
+    @pytest.mark.asyncio
+    async def test_streamed_partitions_grow_buffers(self, monkeypatch):
+        """Test rows spanning several partitions are all kept in order"""
+        monkeypatch.setattr(predictor_module, "TRAINING_FETCH_SIZE", 2)
+        rows = [(0.99 if i % 3 == 0 else 0.1, float(i)) for i in range(7)]
+        monkeypatch.setattr(
+            predictor_module, "AsyncSessionLocal", lambda: FakeSession(_keys("tutor_count"), rows)
+        )
+
+        X, y = await ShortagePredictor(model_path="unused.pkl").prepare_training_data()
+
+        assert X["tutor_count"].tolist() == [float(i) for i in range(7)]
+        assert y.tolist() == [1, 0, 0, 1, 0, 0, 1]
+        assert y.dtype == "int8"
+
+    def test_feature_names_are_quoted(self):
+        """Test keys are emitted as quoted identifiers"""
+        query = predictor_module._training_rows_query(('say "hi"',))
+
+        assert 'AS f("say ""hi""" float8)' in str(query)
+
+    @pytest.mark.asyncio
+    async def test_no_rows_returns_empty(self, monkeypatch):
+        """Test empty feature table yields empty frames without a training query"""
+        session = FakeSession(_keys())
+        monkeypatch.setattr(predictor_module, "AsyncSessionLocal", lambda: session)
+
+        X, y = await ShortagePredictor(model_path="unused.pkl").prepare_training_data()
+
+        assert X.empty and y.empty
+        assert len(session.executed) == 1
+
+
+class TestPredictShortage:
+    """Test inference row construction"""
+
+    @pytest.fixture
+    def trained(self):
+        """Predictor trained on a small synthetic frame"""
+        import numpy as np
+        import pandas as pd
+
+        rng = np.random.default_rng(1)
+        X = pd.DataFrame(rng.random((120, 3)), columns=["utilization_current_week", "utilization_trend", "tutor_count"])
+        y = pd.Series((X["utilization_current_week"] > 0.5).astype(int))
+        predictor = ShortagePredictor(model_path="unused.pkl")
+        predictor.train_model(X, y)
+        return predictor
+
+    def test_probability_matches_model_on_ordered_row(self, trained):
+        """Test dict features land in model column order with 0 defaults"""
+        import numpy as np
+
+        features = {"tutor_count": 0.3, "utilization_current_week": 0.9, "unknown": 5.0}
+
+        result = trained.predict_shortage(features)
+
+        expected = trained.model.predict_proba(np.array([[0.9, 0.0, 0.3]]))[0, 1]
+        assert result["shortage_probability"] == pytest.approx(expected)
+
+    def test_packed_forest_used_for_finite_rows(self, trained):
+        """Test the packed forest serves predictions and non-finite rows reach sklearn"""
+        import numpy as np
+
+        assert trained._compact_forest() is not None
+        assert trained._compact_forest() is trained._compact_forest()
+
+        with pytest.raises(ValueError):
+            trained._predict_proba(np.array([[np.nan, 0.0, 0.0]], dtype=np.float32))
+
+    def test_row_buffer_reset_between_calls(self, trained):
+        """Test values from a previous call do not leak into the next"""
+        trained.predict_shortage({"utilization_current_week": 0.9, "utilization_trend": 0.7})
+
+        row = trained._feature_row({"tutor_count": 0.2})
+
+        assert row[0].tolist() == pytest.approx([0.0, 0.0, 0.2])
+
+    def test_batch_matches_single_predictions(self, trained):
+        """Test batched predictions equal per-call predictions"""
+        feature_batch = [
+            {"utilization_current_week": 0.9, "utilization_trend": 0.4, "tutor_count": 0.1},
+            {"utilization_current_week": 0.2, "utilization_trend": -0.3},
+            {},
+        ]
+        horizons = ["2week", "8week", "unknown"]
+
+        batch = trained.predict_shortage_batch(feature_batch, horizons)
+
+        for result, features, horizon in zip(batch, feature_batch, horizons):
+            single = trained.predict_shortage(features, horizon)
+            result.pop("predicted_shortage_date")
+            single.pop("predicted_shortage_date")
+            assert result == single
+
+    def test_training_follows_preset_column_order(self):
+        """Test a frame in a different column order is fitted in feature_columns order"""
+        import numpy as np
+        import pandas as pd
+
+        rng = np.random.default_rng(4)
+        X = pd.DataFrame(rng.random((60, 2)), columns=["tutor_count", "utilization_current_week"])
+        predictor = ShortagePredictor(model_path="unused.pkl")
+        predictor.feature_columns = ["utilization_current_week", "tutor_count"]
+
+        predictor.train_model(X, pd.Series((X["utilization_current_week"] > 0.5).astype(int)))
+
+        assert predictor.model.feature_importances_[0] > predictor.model.feature_importances_[1]
+
+    def test_severity_and_timing_from_trend(self, trained):
+        """Test rising trends cap at the horizon and grade severity by overshoot"""
+        import numpy as np
+
+        feature_batch = [
+            {"utilization_current_week": 90.0, "utilization_trend": 1.0},
+            {"utilization_current_week": 100.0, "utilization_trend": 1.0},
+            {"utilization_current_week": 110.0, "utilization_trend": 0.5},
+            {"utilization_current_week": 50.0, "utilization_trend": -1.0},
+        ]
+
+        results = trained._build_predictions(np.array([0.5, 0.5, 0.5, 0.25]), feature_batch, ["2week"] * 4)
+
+        assert [r["days_until_shortage"] for r in results] == [5, 0, 0, 10]
+        assert [r["severity"] for r in results] == ["low", "low", "medium", "low"]
+        assert results[3]["predicted_peak_utilization"] == pytest.approx(39.5)
+
+    def test_batch_requires_one_horizon_per_row(self, trained):
+        """Test mismatched inputs are rejected"""
+        with pytest.raises(ValueError):
+            trained.predict_shortage_batch([{}, {}], ["2week"])
+
+        assert trained.predict_shortage_batch([], []) == []
+
+
+class TestModelPersistence:
+    """Test joblib persistence and the per-path model cache"""
+
+    @pytest.fixture
+    def model_path(self, tmp_path):
+        return str(tmp_path / "models" / "predictor.pkl")
+
+    def _trained(self, model_path):
+        import numpy as np
+        import pandas as pd
+
+        rng = np.random.default_rng(2)
+        X = pd.DataFrame(rng.random((80, 2)), columns=["utilization_current_week", "tutor_count"])
+        y = pd.Series((X["tutor_count"] > 0.5).astype(int))
+        predictor = ShortagePredictor(model_path=model_path)
+        predictor.train_model(X, y)
+        return predictor
+
+    def test_round_trip_reuses_cached_model(self, model_path):
+        """Test a saved model loads with the same predictions and is shared in-process"""
+        saved = self._trained(model_path)
+        saved.save_model()
+
+        first = ShortagePredictor(model_path=model_path)
+        first.load_model()
+        second = ShortagePredictor(model_path=model_path)
+        second.load_model()
+
+        assert first.model is second.model is saved.model
+        assert first.feature_columns == ["utilization_current_week", "tutor_count"]
+
+    def test_memory_mapped_load_predicts(self, model_path):
+        """Test a fresh load from disk matches the trained model"""
+        saved = self._trained(model_path)
+        saved.save_model()
+        predictor_module._MODEL_CACHE.clear()
+
+        loaded = ShortagePredictor(model_path=model_path)
+        loaded.load_model()
+        loaded.warmup()
+
+        features = {"utilization_current_week": 0.4, "tutor_count": 0.8}
+        assert loaded.model is not saved.model
+        assert loaded.predict_shortage(features)["shortage_probability"] == (
+            saved.predict_shortage(features)["shortage_probability"]
+        )
+
+    def test_legacy_pickle_still_loads(self, model_path):
+        """Test models written with plain pickle remain loadable"""
+        import os
+        import pickle
+
+        saved = self._trained(model_path)
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        with open(model_path, "wb") as f:
+            pickle.dump({"model": saved.model, "feature_columns": saved.feature_columns}, f)
+        predictor_module._MODEL_CACHE.clear()
+
+        loaded = ShortagePredictor(model_path=model_path)
+        loaded.load_model()
+
+        assert loaded.feature_columns == saved.feature_columns
+
+    def test_warmup_without_model_is_noop(self, tmp_path):
+        """Test warmup tolerates a missing model file"""
+        predictor = ShortagePredictor(model_path=str(tmp_path / "missing.pkl"))
+        predictor.load_model()
+
+        predictor.warmup()
+
+        assert predictor.model is None
+
+
+class TestInferenceThreads:
+    """Test n_jobs selection for sklearn inference"""
+
+    def test_large_batches_parallel_small_single_threaded(self, monkeypatch):
+        """Test n_jobs is -1 only while a large batch predicts"""
+        import numpy as np
+        import pandas as pd
+
+        rng = np.random.default_rng(3)
+        X = pd.DataFrame(rng.random((60, 2)), columns=["utilization_current_week", "tutor_count"])
+        predictor = ShortagePredictor(model_path="unused.pkl")
+        predictor.train_model(X, pd.Series((X["tutor_count"] > 0.5).astype(int)))
+        # sklearn path, as without numba
+        predictor._compact_cache = (predictor.model, None)
+        seen = []
+        predict_proba = predictor.model.predict_proba
+
+        def recording_predict_proba(rows):
+            seen.append((len(rows), predictor.model.n_jobs))
+            return predict_proba(rows)
+
+        monkeypatch.setattr(predictor.model, "predict_proba", recording_predict_proba)
+        big = predictor_module.PARALLEL_PREDICT_MIN_ROWS
+
+        predictor.predict_shortage({"tutor_count": 0.7})
+        predictor.predict_shortage_batch([{}] * big, ["2week"] * big)
+
+        assert seen == [(1, 1), (big, -1)]
+        assert predictor.model.n_jobs == 1
+
+
+class TestOnnxInference:
+    """Test the optional onnxruntime inference path"""
+
+    class FakeSession:
+        """InferenceSession stand-in returning (labels, probabilities)"""
+
+        def __init__(self, path, providers):
+            self.inputs = []
+
+        def run(self, output_names, feeds):
+            import numpy as np
+
+            rows = feeds["X"]
+            self.inputs.append(rows.dtype)
+            return [np.zeros(len(rows)), np.tile(np.array([0.25, 0.75], dtype=np.float32), (len(rows), 1))]
+
+    def _saved(self, tmp_path):
+        saved = TestModelPersistence()._trained(str(tmp_path / "predictor.pkl"))
+        saved.save_model()
+        return saved
+
+    def _loaded_with_export(self, tmp_path, monkeypatch):
+        import types
+
+        saved = self._saved(tmp_path)
+        with open(saved.onnx_path, "wb") as f:
+            f.write(b"onnx")
+        monkeypatch.setattr(predictor_module, "ONNXRUNTIME_AVAILABLE", True)
+        monkeypatch.setattr(
+            predictor_module, "ort", types.SimpleNamespace(InferenceSession=self.FakeSession), raising=False
+        )
+
+        loaded = ShortagePredictor(model_path=saved.model_path)
+        loaded.load_model()
+        return loaded
+
+    def test_packed_forest_preferred_over_export(self, tmp_path, monkeypatch):
+        """Test the bit-exact packed forest wins over a loaded ONNX session"""
+        loaded = self._loaded_with_export(tmp_path, monkeypatch)
+        if loaded._compact_forest() is None:
+            pytest.skip("numba not installed")
+
+        import numpy as np
+
+        rows = np.full((3, len(loaded.feature_columns)), 0.9, dtype=np.float32)
+
+        assert loaded._predict_proba(rows).tolist() == loaded.model.predict_proba(rows)[:, 1].tolist()
+        assert loaded._ort.inputs == []
+
+    def test_session_used_without_packed_forest(self, tmp_path, monkeypatch):
+        """Test a fresh ONNX export is used over sklearn when the packed forest is unavailable"""
+        loaded = self._loaded_with_export(tmp_path, monkeypatch)
+        loaded._compact_cache = (loaded.model, None)
+
+        assert loaded.predict_shortage({"tutor_count": 0.9})["shortage_probability"] == 0.75
+        assert [p["shortage_probability"] for p in loaded.predict_shortage_batch([{}, {}], ["2week"] * 2)] == [0.75, 0.75]
+        assert loaded._ort.inputs[-1] == "float32"
+
+    def test_stale_export_ignored_and_replaced(self, tmp_path, monkeypatch):
+        """Test an export older than the model is not used, and saving without skl2onnx removes it"""
+        import os
+
+        monkeypatch.setattr(predictor_module, "SKL2ONNX_AVAILABLE", False)
+        saved = self._saved(tmp_path)
+        with open(saved.onnx_path, "wb") as f:
+            f.write(b"onnx")
+        os.utime(saved.onnx_path, ns=(0, 0))
+        monkeypatch.setattr(predictor_module, "ONNXRUNTIME_AVAILABLE", True)
+
+        loaded = ShortagePredictor(model_path=saved.model_path)
+        loaded.load_model()
+        assert loaded._ort is None
+
+        saved.save_model()
+        assert not os.path.exists(saved.onnx_path)
+
+
+class TestFeatureImportance:
+    """Test cached feature importance accessors"""
+
+    def test_computed_once_per_model(self):
+        """Test repeated calls share one dict and a retrain refreshes it"""
+        import numpy as np
+        import pandas as pd
+
+        predictor = TestModelPersistence()._trained("unused.pkl")
+
+        importances = predictor.get_feature_importance()
+        array = predictor.get_feature_importance_array()
+
+        assert predictor.get_feature_importance() is importances
+        assert list(importances) == predictor.feature_columns
+        assert array.tolist() == list(importances.values())
+        assert not array.flags.writeable
+
+        X = pd.DataFrame(np.random.default_rng(9).random((60, 2)), columns=predictor.feature_columns)
+        predictor.train_model(X, pd.Series((X["utilization_current_week"] > 0.5).astype(int)))
+
+        assert predictor.get_feature_importance() is not importances
+
+    def test_empty_without_model(self):
+        """Test untrained predictors report no importances"""
+        predictor = ShortagePredictor(model_path="unused.pkl")
+
+        assert predictor.get_feature_importance() == {}
+        assert predictor.get_feature_importance_array().size == 0